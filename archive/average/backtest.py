@@ -0,0 +1,381 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+from archive.average import cost, dynamic, value
+from archive.average.factory import Broker
+from archive.average.models import (
+    AverageRecord,
+    CostAverageRecord,
+    DynamicAverageRecord,
+    ValueAverageRecord,
+)
+from archive.tools.io import iter_csv
+
+
+@dataclass(slots=True)
+class BacktestSummary:
+    """A dataclass summarizing the replay of a strategy over a price series.
+
+    Attributes:
+        strategy (str): The name of the strategy, e.g. "dynamic".
+        intervals (int): The number of orders placed.
+        holds (int): The number of steps skipped for being below the minimum
+            order size.
+        total_trade_amount (float): The quote amount bought less the quote
+            amount sold.
+        total_order_size (float): The base amount held at the end.
+        final_value (float): The value of the base amount held at the last
+            price of the series.
+        gain_or_loss (float): The final value less the total trade amount.
+        max_drawdown (float): The largest fall of the gain or loss from its
+            running peak, as a positive quote amount.
+    """
+
+    strategy: str
+    intervals: int
+    holds: int
+    total_trade_amount: float
+    total_order_size: float
+    final_value: float
+    gain_or_loss: float
+    max_drawdown: float
+
+
+class BacktestBroker(Broker):
+    """A broker filling orders at the closing prices of a historical series.
+
+    The broker stands at one step of the series at a time, set by `step`,
+    and fills every order at the price of that step, less the taker fee the
+    simulated Coinbase orders charge. Sells are filled with a negative order
+    size, so the running total of the records is the position held.
+    """
+
+    def __init__(
+        self,
+        prices: list[tuple[str, float]],
+        principal_amount: float,
+        product_id: str = "BTC-USD",
+        exchange: str = "backtest",
+        taker_fee: float = 0.006,
+        min_order_size: float = 0.0,
+    ):
+        self.prices = prices
+        self.principal_amount = principal_amount
+        self.product_id = product_id
+        self.exchange = exchange
+        self.taker_fee = taker_fee
+        self.min_order_size = min_order_size
+        self.step = 0
+
+    def get_price(self, product_id: str) -> float:
+        return self.prices[self.step][1]
+
+    def get_min_order_size(self, product_id: str) -> float:
+        return self.min_order_size
+
+    def get_simulated_order(
+        self,
+        quote_size: float,
+        product_id: str,
+        side: str = "BUY",
+        market_price: Optional[float] = None,
+    ) -> dict[str, Union[str, float]]:
+        """Fill an order at the price of the current step.
+
+        The principal amount of the order is the principal amount of the
+        strategy, as the records expect, while the order size is what
+        `quote_size` buys or sells.
+        """
+        datetime, step_price = self.prices[self.step]
+        market_price = step_price if market_price is None else market_price
+        order_fee = quote_size * self.taker_fee
+        order_size = (quote_size - order_fee) / market_price
+
+        return {
+            "order_id": f"backtest-{self.step}",
+            "exchange": self.exchange,
+            "product_id": self.product_id,
+            "principal_amount": self.principal_amount,
+            "side": side.upper(),
+            "datetime": datetime,
+            "market_price": market_price,
+            "order_size": (
+                -order_size if side.upper() == "SELL" else order_size
+            ),
+            "order_fee": order_fee,
+        }
+
+    def post_order(
+        self,
+        quote_size: float,
+        product_id: str,
+        side: str = "BUY",
+    ) -> dict[str, Union[str, float]]:
+        return self.get_simulated_order(quote_size, product_id, side)
+
+
+def read_price_series(file: Union[str, Path]) -> list[tuple[str, float]]:
+    """Read a CSV file of historical prices.
+
+    The first column holds the datetime of each price and the price is read
+    from the "Close" column, else from the last column. Currency symbols and
+    thousands separators are ignored, e.g. "$9,334.98".
+
+    Args:
+        file: The path to the CSV file, header included.
+
+    Returns:
+        The datetime and price of every row, in the order of the file.
+    """
+    rows = iter_csv(file)
+    header = [column.strip().lower() for column in next(rows, [])]
+    column = header.index("close") if "close" in header else -1
+
+    return [
+        (row[0], float(row[column].replace("$", "").replace(",", "")))
+        for row in rows
+        if row
+    ]
+
+
+def backtest_cost_average(
+    broker: BacktestBroker,
+) -> tuple[list[CostAverageRecord], int]:
+    """Replay cost averaging over every step of the broker's price series.
+
+    Returns:
+        The records and the number of steps held, which is always 0.
+    """
+    records: list[CostAverageRecord] = []
+    last_record = None
+
+    for step in range(len(broker.prices)):
+        broker.step = step
+
+        order = broker.get_simulated_order(
+            broker.principal_amount, broker.product_id
+        )
+        last_record = cost.create_cost_average_record(order, last_record)
+        records.append(last_record)
+
+    return records, 0
+
+
+def backtest_dynamic_cost_average(
+    broker: BacktestBroker,
+    max_multiplier: Optional[int] = None,
+) -> tuple[list[DynamicAverageRecord], int]:
+    """Replay dynamic cost averaging over every step of the price series.
+
+    Args:
+        broker: The broker holding the price series and principal amount.
+        max_multiplier: The largest multiple of the principal amount to
+            trade, else the one of the environment.
+
+    Returns:
+        The records and the number of steps held for trade amounts below the
+        minimum order size.
+    """
+    records: list[DynamicAverageRecord] = []
+    last_record = None
+    holds = 0
+
+    for step in range(len(broker.prices)):
+        broker.step = step
+
+        (
+            trade_amount,
+            multiplier,
+        ) = dynamic.calculate_trade_amount_and_multiplier(
+            broker.principal_amount,
+            broker.product_id,
+            broker,
+            last_record,
+            max_multiplier,
+        )
+
+        if abs(trade_amount) < broker.min_order_size:
+            holds += 1
+            continue
+
+        side = "SELL" if trade_amount < 0 else "BUY"
+        order = broker.get_simulated_order(
+            abs(trade_amount), broker.product_id, side
+        )
+        last_record = dynamic.create_dynamic_cost_average_record(
+            order, multiplier, last_record
+        )
+        records.append(last_record)
+
+    return records, holds
+
+
+def backtest_value_average(
+    broker: BacktestBroker,
+    growth_rate: Optional[float] = None,
+) -> tuple[list[ValueAverageRecord], int]:
+    """Replay value averaging over every step of the price series.
+
+    Args:
+        broker: The broker holding the price series and principal amount.
+        growth_rate: The growth rate of the target value per interval, else
+            the one of the environment.
+
+    Returns:
+        The records and the number of steps held for trade amounts below the
+        minimum order size.
+    """
+    growth_rate = growth_rate or value.get_growth_rate()
+    records: list[ValueAverageRecord] = []
+    last_record = None
+    holds = 0
+
+    for step in range(len(broker.prices)):
+        broker.step = step
+
+        trade_amount = value.calculate_trade_amount(
+            broker.principal_amount,
+            broker.product_id,
+            broker,
+            last_record,
+            growth_rate,
+        )
+
+        if abs(trade_amount) < broker.min_order_size:
+            holds += 1
+            continue
+
+        side = "SELL" if trade_amount < 0 else "BUY"
+        order = broker.get_simulated_order(
+            abs(trade_amount), broker.product_id, side
+        )
+        last_record = value.create_value_average_record(
+            order, last_record, growth_rate
+        )
+        records.append(last_record)
+
+    return records, holds
+
+
+# The conversion of the records of each strategy to a CSV table.
+strategies: dict[str, Callable[[list], list[list[str]]]] = {
+    "cost": cost.convert_records_to_csv,
+    "dynamic": dynamic.convert_records_to_csv,
+    "value": value.convert_records_to_csv,
+}
+
+
+def summarize_backtest(
+    strategy: str,
+    records: list[AverageRecord],
+    holds: int,
+    broker: BacktestBroker,
+) -> BacktestSummary:
+    """Summarize the records of a replay.
+
+    Args:
+        strategy: The name of the strategy.
+        records: The records of the replay.
+        holds: The number of steps held.
+        broker: The broker the records were replayed through.
+
+    Returns:
+        The summary of the replay, valued at the last price of the series.
+    """
+    total_trade_amount = 0.0
+    total_order_size = 0.0
+    peak: Optional[float] = None
+    max_drawdown = 0.0
+
+    for record in records:
+        trade_amount = getattr(record, "trade_amount", record.principal_amount)
+        total_trade_amount += trade_amount
+        total_order_size = record.total_order_size
+
+        gain_or_loss = (
+            record.market_price * total_order_size - total_trade_amount
+        )
+        peak = gain_or_loss if peak is None else max(peak, gain_or_loss)
+        max_drawdown = max(max_drawdown, peak - gain_or_loss)
+
+    final_price = broker.prices[-1][1] if broker.prices else 0.0
+    final_value = final_price * total_order_size
+
+    return BacktestSummary(
+        strategy=strategy,
+        intervals=len(records),
+        holds=holds,
+        total_trade_amount=total_trade_amount,
+        total_order_size=total_order_size,
+        final_value=final_value,
+        gain_or_loss=final_value - total_trade_amount,
+        max_drawdown=max_drawdown,
+    )
+
+
+def run_backtest(
+    strategy: str,
+    broker: BacktestBroker,
+    max_multiplier: Optional[int] = None,
+    growth_rate: Optional[float] = None,
+) -> tuple[list[AverageRecord], BacktestSummary]:
+    """Replay a strategy over the price series of a broker.
+
+    Args:
+        strategy: One of "cost", "dynamic" or "value".
+        broker: The broker holding the price series and principal amount.
+        max_multiplier: The largest multiplier of dynamic cost averaging.
+        growth_rate: The growth rate of value averaging.
+
+    Returns:
+        The records of the replay and their summary.
+
+    Raises:
+        ValueError: If the strategy is unknown.
+    """
+    if strategy not in strategies:
+        raise ValueError(f"Invalid averaging strategy: {strategy}")
+
+    if strategy == "dynamic":
+        records, holds = backtest_dynamic_cost_average(broker, max_multiplier)
+    elif strategy == "value":
+        records, holds = backtest_value_average(broker, growth_rate)
+    else:
+        records, holds = backtest_cost_average(broker)
+
+    return records, summarize_backtest(strategy, records, holds, broker)
+
+
+def convert_summaries_to_csv(
+    summaries: list[BacktestSummary],
+) -> list[list[str]]:
+    """Convert backtest summaries into a CSV table, header included."""
+    csv_table = [
+        [
+            "Strategy",
+            "Intervals",
+            "Holds",
+            "Total Trade Amount",
+            "Total Order Size",
+            "Final Value",
+            "Gain or (Loss)",
+            "Max Drawdown",
+        ]
+    ]
+
+    for summary in summaries:
+        csv_table.append(
+            [
+                summary.strategy,
+                str(summary.intervals),
+                str(summary.holds),
+                f"{summary.total_trade_amount:.2f}",
+                f"{summary.total_order_size:.8f}",
+                f"{summary.final_value:.2f}",
+                f"{summary.gain_or_loss:.2f}",
+                f"{summary.max_drawdown:.2f}",
+            ]
+        )
+
+    return csv_table
@@ -3,9 +3,9 @@ from typing import Optional, Union
 
 from dotenv import load_dotenv
 
-from archive.average.factory import broker_factory
+from archive.average.factory import Broker, broker_factory
 from archive.average.models import CostAverageColumn, CostAverageRecord
-from archive.tools.io import print_csv, read_write_csv, write_csv
+from archive.tools.io import append_csv, print_csv, read_last_csv_record
 
 load_dotenv()
 
@@ -157,24 +157,39 @@ def create_cost_average_record(
     )
 
 
-def execute_cost_average(file: str, execute: bool = False) -> None:
+def execute_cost_average(
+    file: str,
+    execute: bool = False,
+    broker: Optional[Broker] = None,
+    product_id: Optional[str] = None,
+    principal_amount: Optional[float] = None,
+    last_record: Optional[CostAverageRecord] = None,
+) -> Optional[CostAverageRecord]:
     """Execute a cost averaging order, update the records, and write the results to a CSV file.
 
     Args:
         file: The path to the CSV file to read and update with the new CostAverageRecord.
         execute: A boolean flag indicating whether to execute a real order (True) or simulate one (False).
+        broker: The broker to place the order with. Defaults to the broker of the EXCHANGE environment variable.
+        product_id: The product to trade. Defaults to the PRODUCT_ID environment variable.
+        principal_amount: The principal amount of each interval. Defaults to the PRINCIPAL_AMOUNT environment variable.
+        last_record: The last CostAverageRecord of the file, if it is already known. Defaults to reading it from the file.
+
+    Returns:
+        The new CostAverageRecord.
     """
 
     exchange = getenv("EXCHANGE") or ""
-    product_id = getenv("PRODUCT_ID") or ""
-    principal_amount = float(getenv("PRINCIPAL_AMOUNT") or 0)
-
-    broker = broker_factory(exchange)
+    product_id = product_id or getenv("PRODUCT_ID") or ""
+    principal_amount = principal_amount or float(
+        getenv("PRINCIPAL_AMOUNT") or 0
+    )
 
-    csv_table = read_write_csv(file, [])
-    records = convert_csv_to_records(csv_table)
+    broker = broker or broker_factory(exchange)
 
-    last_record = records[-1] if records else None
+    last_record = last_record or read_last_csv_record(
+        file, convert_records_to_csv, convert_csv_to_records
+    )
 
     if execute:
         order = broker.post_order(principal_amount, product_id)
@@ -183,10 +198,10 @@ def execute_cost_average(file: str, execute: bool = False) -> None:
 
     new_record = create_cost_average_record(order, last_record)
 
-    records.append(new_record)
+    new_csv_table = convert_records_to_csv([new_record])
 
-    updated_csv_table = convert_records_to_csv(records)
+    print_csv(new_csv_table)
 
-    print_csv(updated_csv_table)
+    append_csv(file, new_csv_table[1:], header=new_csv_table[0])
 
-    write_csv(file, updated_csv_table)
+    return new_record
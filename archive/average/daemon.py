@@ -0,0 +1,338 @@
+import calendar
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from os import getenv
+from pathlib import Path
+from threading import Event
+from typing import Any, Optional, Union
+
+from dotenv import load_dotenv
+
+from archive.average.cost import execute_cost_average
+from archive.average.dynamic import execute_dynamic_cost_average
+from archive.average.factory import Broker, broker_factory
+from archive.average.models import AverageSchedule
+from archive.average.value import execute_value_average, get_growth_rate
+from archive.tools.jobs import describe_failure
+from archive.tools.logger import setup_logger
+
+load_dotenv()
+
+logger = setup_logger(
+    "average_logger",
+    "data/log/average.log",
+    logging.DEBUG,
+)
+
+# Seconds between runs of each frequency. Monthly runs fall on the same day
+# of each month instead.
+__frequencies__: dict[str, int] = {
+    "hourly": 60 * 60,
+    "daily": 24 * 60 * 60,
+    "weekly": 7 * 24 * 60 * 60,
+}
+
+# Longest the daemon sleeps before refreshing its status file.
+__heartbeat__: float = float(getenv("AVERAGE_HEARTBEAT") or 60)
+
+
+def add_months(moment: datetime, months: int) -> datetime:
+    """Add months to a datetime, keeping to the last day of shorter months."""
+    month = moment.month - 1 + months
+    year = moment.year + month // 12
+    month = month % 12 + 1
+    day = min(moment.day, calendar.monthrange(year, month)[1])
+    return moment.replace(year=year, month=month, day=day)
+
+
+def get_next_run(schedule: AverageSchedule, after: datetime) -> datetime:
+    """Return when a schedule runs next after its run at `after`."""
+    if schedule.interval:
+        return after + timedelta(seconds=schedule.interval)
+
+    if schedule.frequency == "monthly":
+        return add_months(after, 1)
+
+    if schedule.frequency not in __frequencies__:
+        raise ValueError(f"Invalid frequency: {schedule.frequency}")
+
+    return after + timedelta(seconds=__frequencies__[schedule.frequency])
+
+
+def create_schedule(entry: dict[str, Any]) -> AverageSchedule:
+    """Create a schedule from an entry of a schedules file.
+
+    Missing settings default to the environment variables the bots read,
+    and the frequency defaults to "monthly", as it does for value averaging.
+
+    Args:
+        entry: The settings of the schedule.
+
+    Returns:
+        The schedule, not yet due.
+
+    Raises:
+        ValueError: If the strategy or frequency is invalid.
+    """
+    strategy = entry.get("strategy", "cost")
+    product_id = entry.get("product_id") or getenv("PRODUCT_ID") or ""
+    frequency = entry.get("frequency") or getenv("FREQUENCY") or "monthly"
+
+    if strategy not in ("cost", "dynamic", "value"):
+        raise ValueError(f"Invalid averaging strategy: {strategy}")
+
+    if frequency != "monthly" and frequency not in __frequencies__:
+        raise ValueError(f"Invalid frequency: {frequency}")
+
+    return AverageSchedule(
+        name=entry.get("name") or f"{strategy}-{product_id}",
+        strategy=strategy,
+        file=entry.get("file")
+        or f"data/average/{strategy}-{product_id.lower()}.csv",
+        exchange=entry.get("exchange") or getenv("EXCHANGE") or "",
+        product_id=product_id,
+        principal_amount=float(
+            entry.get("principal_amount") or getenv("PRINCIPAL_AMOUNT") or 0
+        ),
+        frequency=frequency,
+        interval=entry.get("interval"),
+        execute=bool(entry.get("execute", False)),
+        max_multiplier=entry.get("max_multiplier"),
+        interest_rate=entry.get("interest_rate"),
+    )
+
+
+def load_schedules(file: Union[str, Path]) -> list[AverageSchedule]:
+    """Load the schedules of a JSON file.
+
+    The file holds a list of schedules, or an object with a "schedules" list.
+    Each schedule sets any of the attributes of `AverageSchedule` up to
+    `interest_rate`.
+
+    Args:
+        file: The path to the schedules file.
+
+    Returns:
+        The schedules in the order of the file.
+
+    Raises:
+        ValueError: If two schedules share a name or a setting is invalid.
+    """
+    with open(file, mode="r") as handle:
+        data = json.load(handle)
+
+    entries = data.get("schedules", []) if isinstance(data, dict) else data
+    schedules = [create_schedule(entry) for entry in entries]
+    names = [schedule.name for schedule in schedules]
+
+    if len(set(names)) != len(names):
+        raise ValueError(f"Schedule names must be unique: {names}")
+
+    return schedules
+
+
+def get_journal_state(file: str) -> Optional[tuple[int, int]]:
+    """Return the size and modification time of a records file, if any."""
+    try:
+        stat = os.stat(file)
+    except FileNotFoundError:
+        return None
+
+    return stat.st_size, stat.st_mtime_ns
+
+
+def run_schedule(
+    schedule: AverageSchedule,
+    brokers: dict[str, Broker],
+) -> None:
+    """Run a schedule once and record the outcome in its state.
+
+    The broker of each exchange is kept across runs. The last record is kept
+    as well, and only read again when the records file changed since this
+    schedule appended to it. A failure is logged rather than raised, so the
+    other schedules keep running.
+
+    Args:
+        schedule: The schedule to run.
+        brokers: The brokers created so far, keyed by exchange.
+    """
+    last_record = (
+        schedule.last_record
+        if schedule.journal == get_journal_state(schedule.file)
+        else None
+    )
+
+    try:
+        if schedule.exchange not in brokers:
+            brokers[schedule.exchange] = broker_factory(schedule.exchange)
+
+        broker = brokers[schedule.exchange]
+
+        if schedule.strategy == "dynamic":
+            record = execute_dynamic_cost_average(
+                schedule.file,
+                schedule.execute,
+                broker,
+                schedule.product_id,
+                schedule.principal_amount,
+                last_record,
+                schedule.max_multiplier,
+            )
+        elif schedule.strategy == "value":
+            record = execute_value_average(
+                schedule.file,
+                schedule.execute,
+                broker,
+                schedule.product_id,
+                schedule.principal_amount,
+                last_record,
+                get_growth_rate(schedule.interest_rate, schedule.frequency),
+            )
+        else:
+            record = execute_cost_average(
+                schedule.file,
+                schedule.execute,
+                broker,
+                schedule.product_id,
+                schedule.principal_amount,
+                last_record,
+            )
+    except Exception as error:
+        logger.exception("Schedule %s failed", schedule.name)
+        schedule.failures += 1
+        schedule.last_result = describe_failure(error)
+        return
+
+    if record is not None:
+        schedule.last_record = record
+        schedule.journal = get_journal_state(schedule.file)
+        schedule.last_result = "ok"
+    else:
+        schedule.last_result = "hold"
+
+    schedule.runs += 1
+    logger.info("Schedule %s: %s", schedule.name, schedule.last_result)
+
+
+def write_status(
+    file: Union[str, Path],
+    schedules: list[AverageSchedule],
+    started_at: datetime,
+) -> None:
+    """Replace the status file of the daemon in a single rename.
+
+    Args:
+        file: The path to the status file.
+        schedules: The schedules of the daemon.
+        started_at: When the daemon started.
+    """
+    status = {
+        "pid": os.getpid(),
+        "started_at": started_at.isoformat(),
+        "updated_at": datetime.now().isoformat(),
+        "schedules": {
+            schedule.name: {
+                "strategy": schedule.strategy,
+                "product_id": schedule.product_id,
+                "file": schedule.file,
+                "last_run": (
+                    schedule.last_run.isoformat()
+                    if schedule.last_run
+                    else None
+                ),
+                "next_run": (
+                    schedule.next_run.isoformat()
+                    if schedule.next_run
+                    else None
+                ),
+                "runs": schedule.runs,
+                "failures": schedule.failures,
+                "last_result": schedule.last_result,
+            }
+            for schedule in schedules
+        },
+    }
+
+    path = Path(file)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(f".{path.name}.tmp")
+
+    with open(temporary, mode="w") as handle:
+        json.dump(status, handle, indent=2)
+
+    os.replace(temporary, path)
+
+
+def read_last_runs(file: Union[str, Path]) -> dict[str, datetime]:
+    """Read when each schedule last ran from a previous status file."""
+    try:
+        with open(file, mode="r") as handle:
+            schedules = json.load(handle).get("schedules", {})
+    except (FileNotFoundError, ValueError) as error:
+        logger.debug("No previous status: %s", error)
+        return {}
+
+    return {
+        name: datetime.fromisoformat(state["last_run"])
+        for name, state in schedules.items()
+        if state.get("last_run")
+    }
+
+
+def run_daemon(
+    schedules: list[AverageSchedule],
+    status_file: Union[str, Path],
+    stop: Optional[Event] = None,
+) -> None:
+    """Run the schedules in this process until stopped.
+
+    A schedule that last ran more than one interval ago, according to the
+    previous status file, runs once at start up, as a persistent systemd
+    timer would. The status file is refreshed after every run and at least
+    once every `__heartbeat__` seconds, so a supervisor can tell a stalled
+    daemon from an idle one.
+
+    Args:
+        schedules: The schedules to run.
+        status_file: The path to the status file.
+        stop: Set to stop the daemon, e.g. from a signal handler.
+    """
+    if not schedules:
+        raise ValueError("The daemon needs at least one schedule.")
+
+    stop = stop or Event()
+    started_at = datetime.now()
+    last_runs = read_last_runs(status_file)
+    brokers: dict[str, Broker] = {}
+
+    for schedule in schedules:
+        schedule.last_run = last_runs.get(schedule.name)
+        schedule.next_run = (
+            get_next_run(schedule, schedule.last_run)
+            if schedule.last_run
+            else started_at
+        )
+
+    logger.info("Started with %d schedules", len(schedules))
+
+    while not stop.is_set():
+        for schedule in schedules:
+            if stop.is_set() or schedule.next_run > datetime.now():
+                continue
+
+            schedule.last_run = datetime.now()
+            run_schedule(schedule, brokers)
+            schedule.next_run = max(
+                get_next_run(schedule, schedule.last_run), datetime.now()
+            )
+
+        write_status(status_file, schedules, started_at)
+
+        next_run = min(schedule.next_run for schedule in schedules)
+        delay = (next_run - datetime.now()).total_seconds()
+        stop.wait(min(max(delay, 0), __heartbeat__))
+
+    write_status(status_file, schedules, started_at)
+    logger.info("Stopped")
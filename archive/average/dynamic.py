@@ -5,7 +5,7 @@ from dotenv import load_dotenv
 
 from archive.average.factory import Broker, broker_factory
 from archive.average.models import DynamicAverageColumn, DynamicAverageRecord
-from archive.tools.io import print_csv, read_write_csv, write_csv
+from archive.tools.io import append_csv, print_csv, read_last_csv_record
 
 load_dotenv()
 
@@ -122,6 +122,7 @@ def calculate_trade_amount_and_multiplier(
     product_id: str,
     broker: Broker,
     last_record: Optional[DynamicAverageRecord],
+    max_multiplier: Optional[int] = None,
 ) -> tuple[float, int]:
     """Calculate the trade amount and multiplier for the current Dynamic Cost Averaging operation.
 
@@ -130,12 +131,13 @@ def calculate_trade_amount_and_multiplier(
         product_id (str): The identifier for the asset.
         broker (Broker): The broker instance to interact with the market.
         last_record (Optional[DynamicAverageRecord]): The last DynamicAverageRecord in the series, or None if there's no previous record.
+        max_multiplier (Optional[int], optional): The largest multiple of the principal amount to trade. Defaults to the MAX_MULTIPLIER environment variable, else 5.
 
     Returns:
         A tuple containing the calculated trade amount and multiplier.
     """
 
-    max_multiplier = int(getenv("MAX_MULTIPLIER") or 5)
+    max_multiplier = max_multiplier or int(getenv("MAX_MULTIPLIER") or 5)
     min_multiplier = 1
 
     # Get the current market price using the broker's get_price method
@@ -232,30 +234,47 @@ def create_dynamic_cost_average_record(
     )
 
 
-def execute_dynamic_cost_average(file: str, execute: bool = False) -> None:
+def execute_dynamic_cost_average(
+    file: str,
+    execute: bool = False,
+    broker: Optional[Broker] = None,
+    product_id: Optional[str] = None,
+    principal_amount: Optional[float] = None,
+    last_record: Optional[DynamicAverageRecord] = None,
+    max_multiplier: Optional[int] = None,
+) -> Optional[DynamicAverageRecord]:
     """Execute a dynamic cost averaging order, update the records, and write the results to a CSV file.
 
     Args:
         file: The path to the CSV file to read and update with the new DynamicAverageRecord.
         execute: A boolean flag indicating whether to execute a real order (True) or simulate one (False).
+        broker: The broker to place the order with. Defaults to the broker of the EXCHANGE environment variable.
+        product_id: The product to trade. Defaults to the PRODUCT_ID environment variable.
+        principal_amount: The principal amount of each interval. Defaults to the PRINCIPAL_AMOUNT environment variable.
+        last_record: The last DynamicAverageRecord of the file, if it is already known. Defaults to reading it from the file.
+        max_multiplier: The largest multiple of the principal amount to trade. Defaults to the MAX_MULTIPLIER environment variable.
+
+    Returns:
+        The new DynamicAverageRecord, or None if the order was held.
     """
 
     exchange = getenv("EXCHANGE") or ""
-    product_id = getenv("PRODUCT_ID") or ""
-    principal_amount = float(getenv("PRINCIPAL_AMOUNT") or 0)
+    product_id = product_id or getenv("PRODUCT_ID") or ""
+    principal_amount = principal_amount or float(
+        getenv("PRINCIPAL_AMOUNT") or 0
+    )
 
-    broker = broker_factory(exchange)
+    broker = broker or broker_factory(exchange)
 
     min_trade_amount = broker.get_min_order_size(product_id)
 
-    csv_table = read_write_csv(file, [])
-    records = convert_csv_to_records(csv_table)
-
-    last_record = records[-1] if records else None
+    last_record = last_record or read_last_csv_record(
+        file, convert_records_to_csv, convert_csv_to_records
+    )
 
     # Calculate the trade amount using the helper function
     trade_amount, multiplier = calculate_trade_amount_and_multiplier(
-        principal_amount, product_id, broker, last_record
+        principal_amount, product_id, broker, last_record, max_multiplier
     )
 
     # Check if the trade amount is below the minimum trade amount
@@ -276,14 +295,18 @@ def execute_dynamic_cost_average(file: str, execute: bool = False) -> None:
     else:
         order = broker.get_simulated_order(trade_amount, product_id, side)
 
+    # Records are kept in terms of the principal amount of the strategy,
+    # whatever amount this order traded
+    order["principal_amount"] = principal_amount
+
     new_record = create_dynamic_cost_average_record(
         order, multiplier, last_record
     )
 
-    records.append(new_record)
+    new_csv_table = convert_records_to_csv([new_record])
 
-    updated_csv_table = convert_records_to_csv(records)
+    print_csv(new_csv_table)
 
-    print_csv(updated_csv_table)
+    append_csv(file, new_csv_table[1:], header=new_csv_table[0])
 
-    write_csv(file, updated_csv_table)
+    return new_record
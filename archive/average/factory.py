@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import Any, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Optional, TypeVar, Union
 
 from archive.exchange.coinbase.api import (
     get_min_order_size as coinbase_min_order_size,
@@ -13,6 +14,48 @@ from archive.exchange.coinbase.api import (
 )
 from archive.exchange.kraken.api import get_spot_price as kraken_spot_price
 
+T = TypeVar("T")
+
+# Maximum number of concurrent requests of a batch.
+# Throughput is bounded by each exchange's rate limiter, not by this value.
+__workers__: int = 8
+
+# An order of a batch: the quote size, product and side.
+OrderRequest = tuple[float, str, str]
+
+
+def map_concurrently(
+    function: Callable[..., T],
+    arguments: Iterable[tuple],
+    max_workers: int = __workers__,
+) -> list[Union[T, Exception]]:
+    """Call a function once per set of arguments in worker threads.
+
+    Args:
+        function: The function to call, e.g. a method of a broker.
+        arguments: The positional arguments of each call.
+        max_workers: The maximum number of concurrent calls.
+
+    Returns:
+        The result of each call in the order of `arguments`, or the exception
+        it raised, so one failed request does not lose the others.
+    """
+    arguments = list(arguments)
+
+    def call(args: tuple) -> Union[T, Exception]:
+        try:
+            return function(*args)
+        except Exception as error:
+            return error
+
+    if len(arguments) <= 1:
+        return [call(args) for args in arguments]
+
+    with ThreadPoolExecutor(
+        max_workers=min(max_workers, len(arguments))
+    ) as executor:
+        return list(executor.map(call, arguments))
+
 
 class Broker(ABC):
     """Abstract base class representing a broker for buying and selling assets.
@@ -52,6 +95,7 @@ class Broker(ABC):
         quote_size: float,
         product_id: str,
         side: str = "BUY",
+        market_price: Optional[float] = None,
     ) -> dict[str, Union[str, float]]:
         """Simulate an order for an asset.
 
@@ -59,6 +103,7 @@ class Broker(ABC):
             quote_size (float): The size of the order.
             product_id (str): The identifier for the asset.
             side (str, optional): The side of the order (BUY or SELL). Defaults to "BUY".
+            market_price (float, optional): The price to fill the order at. Defaults to the current market price.
 
         Returns:
             dict[str, Union[str, float]]: A dictionary representing the simulated order.
@@ -86,6 +131,65 @@ class Broker(ABC):
 
         raise NotImplementedError()
 
+    def get_prices(
+        self,
+        product_ids: list[str],
+    ) -> dict[str, Union[float, Exception]]:
+        """Get the current market prices of several assets concurrently.
+
+        Args:
+            product_ids (list[str]): The identifiers for the assets.
+
+        Returns:
+            dict[str, Union[float, Exception]]: The price of each asset, or the exception raised while getting it.
+        """
+
+        products = list(dict.fromkeys(product_ids))
+        prices = map_concurrently(
+            self.get_price, [(product,) for product in products]
+        )
+        return dict(zip(products, prices))
+
+    def get_min_order_sizes(
+        self,
+        product_ids: list[str],
+    ) -> dict[str, Union[float, Exception]]:
+        """Get the minimum order sizes of several assets concurrently.
+
+        Args:
+            product_ids (list[str]): The identifiers for the assets.
+
+        Returns:
+            dict[str, Union[float, Exception]]: The minimum order size of each asset, or the exception raised while getting it.
+        """
+
+        products = list(dict.fromkeys(product_ids))
+        sizes = map_concurrently(
+            self.get_min_order_size, [(product,) for product in products]
+        )
+        return dict(zip(products, sizes))
+
+    def post_orders(
+        self,
+        orders: list[OrderRequest],
+        execute: bool = False,
+    ) -> list[Union[dict[str, Any], Exception]]:
+        """Post, or simulate, a batch of orders concurrently.
+
+        Brokers whose exchange accepts several orders in one request may
+        override this method. A failed order does not cancel the others.
+
+        Args:
+            orders (list[OrderRequest]): The quote size, product and side of each order.
+            execute (bool, optional): Post real orders instead of simulating them. Defaults to False.
+
+        Returns:
+            list[Union[dict[str, Any], Exception]]: Each order in the order of `orders`, or the exception raised while placing it.
+        """
+
+        place = self.post_order if execute else self.get_simulated_order
+        return map_concurrently(place, orders)
+
 
 class Coinbase(Broker):
     """A class representing the Coinbase exchange.
@@ -122,6 +226,7 @@ class Coinbase(Broker):
         quote_size: float,
         product_id: str,
         side: str = "BUY",
+        market_price: Optional[float] = None,
     ) -> dict[str, Union[str, float]]:
         """Simulate an order for an asset on Coinbase.
 
@@ -129,12 +234,15 @@ class Coinbase(Broker):
             quote_size (float): The size of the order.
             product_id (str): The identifier for the asset.
             side (str, optional): The side of the order (BUY or SELL). Defaults to "BUY".
+            market_price (float, optional): The price to fill the order at. Defaults to the current market price.
 
         Returns:
             dict[str, Union[str, float]]: A dictionary representing the simulated order.
         """
 
-        return coinbase_simulated_market_order(quote_size, product_id, side)
+        return coinbase_simulated_market_order(
+            quote_size, product_id, side, market_price
+        )
 
     def post_order(
         self,
@@ -191,6 +299,7 @@ class Kraken(Broker):
         quote_size: float,
         product_id: str,
         side: str = "BUY",
+        market_price: Optional[float] = None,
     ) -> dict[str, Union[str, float]]:
         """Simulate an order for an asset on Kraken.
 
@@ -200,6 +309,7 @@ class Kraken(Broker):
             quote_size (float): The size of the order.
             product_id (str): The identifier for the asset.
             side (str, optional): The side of the order (BUY or SELL). Defaults to "BUY".
+            market_price (float, optional): The price to fill the order at. Defaults to the current market price.
 
         Returns:
             dict[str, Union[str, float]]: A dictionary representing the simulated order.
@@ -1,5 +1,7 @@
 from dataclasses import dataclass
+from datetime import datetime
 from enum import Enum
+from typing import Optional
 
 
 class CostAverageColumn(Enum):
@@ -57,7 +59,7 @@ class ValueAverageColumn(Enum):
     TOTAL_TRADE_AMOUNT = 13
 
 
-@dataclass
+@dataclass(slots=True)
 class AverageRecord:
     """A dataclass representing a base record for averaging strategies."""
 
@@ -74,14 +76,14 @@ class AverageRecord:
     interval: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class CostAverageRecord(AverageRecord):
     """A dataclass representing a cost averaging record."""
 
     gain_or_loss: float = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class DynamicAverageRecord(AverageRecord):
     """A dataclass representing a dynamic averaging record."""
 
@@ -90,10 +92,53 @@ class DynamicAverageRecord(AverageRecord):
     total_trade_amount: float = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class ValueAverageRecord(AverageRecord):
     """A dataclass representing a value averaging record."""
 
     growth_rate: float = 0
     trade_amount: float = 0
     total_trade_amount: float = 0
+
+
+@dataclass(slots=True)
+class AverageSchedule:
+    """A strategy and product to average into, and the state of its runs.
+
+    Schedules are run by the daemon, or all at once by a portfolio pass.
+
+    Attributes:
+        name (str): A unique name for the schedule, e.g. "dynamic-BTC-USD".
+        strategy (str): One of "cost", "dynamic" or "value".
+        file (str): The records file of the strategy.
+        exchange (str): The exchange to place orders on.
+        product_id (str): The product to trade.
+        principal_amount (float): The principal amount of each interval.
+        frequency (str): One of "hourly", "daily", "weekly" or "monthly".
+            Value averaging grows its target at this frequency as well.
+        interval (Optional[float]): Seconds between runs, overriding the
+            frequency.
+        execute (bool): Place real orders instead of simulating them.
+        max_multiplier (Optional[int]): The max multiplier of dynamic cost
+            averaging.
+        interest_rate (Optional[float]): The interest rate of value averaging.
+    """
+
+    name: str
+    strategy: str
+    file: str
+    exchange: str
+    product_id: str
+    principal_amount: float
+    frequency: str = "monthly"
+    interval: Optional[float] = None
+    execute: bool = False
+    max_multiplier: Optional[int] = None
+    interest_rate: Optional[float] = None
+    last_run: Optional[datetime] = None
+    next_run: Optional[datetime] = None
+    runs: int = 0
+    failures: int = 0
+    last_result: str = ""
+    last_record: Optional[AverageRecord] = None
+    journal: Optional[tuple[int, int]] = None
@@ -0,0 +1,313 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Union
+
+from archive.average import cost, dynamic, value
+from archive.average.factory import Broker, OrderRequest, broker_factory
+from archive.average.models import AverageRecord, AverageSchedule
+from archive.tools.io import append_csv, print_csv, read_last_csv_record
+from archive.tools.jobs import describe_failure
+
+# The conversions between the records of each strategy and a CSV table.
+converters: dict[str, tuple[Callable, Callable]] = {
+    "cost": (cost.convert_records_to_csv, cost.convert_csv_to_records),
+    "dynamic": (
+        dynamic.convert_records_to_csv,
+        dynamic.convert_csv_to_records,
+    ),
+    "value": (value.convert_records_to_csv, value.convert_csv_to_records),
+}
+
+
+@dataclass(slots=True)
+class PortfolioOrder:
+    """The order of one product of a portfolio pass.
+
+    Attributes:
+        schedule (AverageSchedule): The strategy and product of the order.
+        last_record (Optional[AverageRecord]): The last record of its file.
+        trade_amount (float): The signed quote amount to trade.
+        multiplier (int): The multiplier of dynamic cost averaging.
+        result (str): "ok", "hold" or a description of the failure.
+        record (Optional[AverageRecord]): The record appended for the order.
+    """
+
+    schedule: AverageSchedule
+    last_record: Optional[AverageRecord] = None
+    trade_amount: float = 0
+    multiplier: int = 1
+    result: str = ""
+    record: Optional[AverageRecord] = None
+
+
+class SnapshotBroker(Broker):
+    """A broker answering prices and minimum order sizes from a snapshot.
+
+    The snapshot is fetched once per pass for every product, so planning the
+    orders of a portfolio does not make a request per product. Simulated
+    orders are filled at the snapshot price the orders were planned with,
+    while real orders are placed through the wrapped broker.
+    """
+
+    def __init__(
+        self,
+        broker: Broker,
+        prices: dict[str, Union[float, Exception]],
+        min_order_sizes: dict[str, Union[float, Exception]],
+    ):
+        self.broker = broker
+        self.prices = prices
+        self.min_order_sizes = min_order_sizes
+
+    def get_price(self, product_id: str) -> float:
+        price = self.prices[product_id]
+
+        if isinstance(price, Exception):
+            raise price
+
+        return price
+
+    def get_min_order_size(self, product_id: str) -> float:
+        size = self.min_order_sizes[product_id]
+
+        if isinstance(size, Exception):
+            raise size
+
+        return size
+
+    def get_simulated_order(
+        self,
+        quote_size: float,
+        product_id: str,
+        side: str = "BUY",
+        market_price: Optional[float] = None,
+    ) -> dict[str, Union[str, float]]:
+        if market_price is None:
+            market_price = self.get_price(product_id)
+
+        return self.broker.get_simulated_order(
+            quote_size, product_id, side, market_price
+        )
+
+    def post_order(
+        self,
+        quote_size: float,
+        product_id: str,
+        side: str = "BUY",
+    ) -> dict[str, Union[str, float]]:
+        return self.broker.post_order(quote_size, product_id, side)
+
+
+def plan_order(
+    order: PortfolioOrder,
+    broker: Broker,
+) -> Optional[OrderRequest]:
+    """Calculate the order of a product as its strategy would.
+
+    Args:
+        order: The order to plan, updated with its trade amount.
+        broker: The broker to get the price and minimum order size from.
+
+    Returns:
+        The quote size, product and side of the order, or None if the trade
+        amount is below the minimum order size.
+    """
+    schedule = order.schedule
+
+    if schedule.strategy == "dynamic":
+        (
+            order.trade_amount,
+            order.multiplier,
+        ) = dynamic.calculate_trade_amount_and_multiplier(
+            schedule.principal_amount,
+            schedule.product_id,
+            broker,
+            order.last_record,
+            schedule.max_multiplier,
+        )
+    elif schedule.strategy == "value":
+        order.trade_amount = value.calculate_trade_amount(
+            schedule.principal_amount,
+            schedule.product_id,
+            broker,
+            order.last_record,
+            value.get_growth_rate(schedule.interest_rate, schedule.frequency),
+        )
+    else:
+        # Cost averaging always buys the principal amount
+        order.trade_amount = schedule.principal_amount
+        return (order.trade_amount, schedule.product_id, "BUY")
+
+    min_trade_amount = broker.get_min_order_size(schedule.product_id)
+
+    if abs(order.trade_amount) < min_trade_amount:
+        order.result = "hold"
+        return None
+
+    side = "SELL" if order.trade_amount < 0 else "BUY"
+
+    return (abs(order.trade_amount), schedule.product_id, side)
+
+
+def record_order(
+    order: PortfolioOrder,
+    placed: dict[str, Any],
+) -> AverageRecord:
+    """Create the record of a placed order and append it to its file.
+
+    Args:
+        order: The planned order.
+        placed: The order returned by the broker.
+
+    Returns:
+        The new record.
+    """
+    schedule = order.schedule
+
+    # Records are kept in terms of the principal amount of the strategy,
+    # whatever amount this order traded
+    placed["principal_amount"] = schedule.principal_amount
+
+    if schedule.strategy == "dynamic":
+        record = dynamic.create_dynamic_cost_average_record(
+            placed, order.multiplier, order.last_record
+        )
+        csv_table = dynamic.convert_records_to_csv([record])
+    elif schedule.strategy == "value":
+        record = value.create_value_average_record(
+            placed,
+            order.last_record,
+            value.get_growth_rate(schedule.interest_rate, schedule.frequency),
+        )
+        csv_table = value.convert_records_to_csv([record])
+    else:
+        record = cost.create_cost_average_record(placed, order.last_record)
+        csv_table = cost.convert_records_to_csv([record])
+
+    print_csv(csv_table)
+    append_csv(schedule.file, csv_table[1:], header=csv_table[0])
+
+    return record
+
+
+def execute_portfolio(
+    schedules: list[AverageSchedule],
+    execute: bool = False,
+) -> list[PortfolioOrder]:
+    """Place the orders of every product of a portfolio in one pass.
+
+    For each exchange, the prices and minimum order sizes of its products
+    are fetched concurrently, every order is planned from that snapshot, and
+    the orders are placed as one batch through the broker. Simulated orders
+    are filled at the snapshot prices. A product that fails does not stop
+    the others.
+
+    Args:
+        schedules: The strategy and product of each order, e.g. the entries
+            of a schedules file. Only their frequency is read, as the
+            growth frequency of value averaging.
+        execute: Place real orders instead of simulating them.
+
+    Returns:
+        The order of every product with its result, in the order given.
+
+    Raises:
+        ValueError: If two products share a records file.
+    """
+    files = [schedule.file for schedule in schedules]
+
+    if len(set(files)) != len(files):
+        raise ValueError(f"Each product needs its own records file: {files}")
+
+    orders = [PortfolioOrder(schedule) for schedule in schedules]
+    exchanges: dict[str, list[PortfolioOrder]] = {}
+
+    for order in orders:
+        exchanges.setdefault(order.schedule.exchange, []).append(order)
+
+    for exchange, exchange_orders in exchanges.items():
+        try:
+            broker = broker_factory(exchange)
+        except ValueError as error:
+            for order in exchange_orders:
+                order.result = describe_failure(error)
+            continue
+
+        # Cost averaging buys its principal amount whatever the price, so
+        # its minimum order size is not needed
+        products = [order.schedule.product_id for order in exchange_orders]
+        snapshot = SnapshotBroker(
+            broker,
+            broker.get_prices(products),
+            broker.get_min_order_sizes(
+                [
+                    order.schedule.product_id
+                    for order in exchange_orders
+                    if order.schedule.strategy != "cost"
+                ]
+            ),
+        )
+
+        planned: list[tuple[PortfolioOrder, OrderRequest]] = []
+
+        for order in exchange_orders:
+            try:
+                order.last_record = read_last_csv_record(
+                    order.schedule.file, *converters[order.schedule.strategy]
+                )
+                request = plan_order(order, snapshot)
+            except Exception as error:
+                order.result = describe_failure(error)
+                continue
+
+            if request is not None:
+                planned.append((order, request))
+
+        placed = snapshot.post_orders(
+            [request for _, request in planned], execute
+        )
+
+        for (order, _), result in zip(planned, placed):
+            try:
+                if isinstance(result, Exception):
+                    raise result
+
+                order.record = record_order(order, result)
+                order.result = "ok"
+            except Exception as error:
+                order.result = describe_failure(error)
+
+    return orders
+
+
+def convert_portfolio_to_csv(orders: list[PortfolioOrder]) -> list[list[str]]:
+    """Convert the orders of a portfolio pass into a CSV table."""
+    csv_table = [
+        [
+            "Exchange",
+            "Product ID",
+            "Strategy",
+            "Principal Amount",
+            "Trade Amount",
+            "Market Price",
+            "Order Size",
+            "Result",
+        ]
+    ]
+
+    for order in orders:
+        schedule, record = order.schedule, order.record
+
+        csv_table.append(
+            [
+                schedule.exchange,
+                schedule.product_id,
+                schedule.strategy,
+                str(schedule.principal_amount),
+                str(order.trade_amount),
+                str(record.market_price) if record else "",
+                str(record.order_size) if record else "",
+                order.result,
+            ]
+        )
+
+    return csv_table
@@ -0,0 +1,210 @@
+from itertools import product
+from typing import Optional
+
+from archive.average.backtest import (
+    BacktestBroker,
+    BacktestSummary,
+    run_backtest,
+)
+from archive.average.value import get_growth_rate
+from archive.tools.jobs import run_jobs
+
+# Summary fields a sweep can be ranked by, and whether larger ranks higher.
+rankings: dict[str, bool] = {
+    "gain_or_loss": True,
+    "final_value": True,
+    "total_trade_amount": False,
+    "max_drawdown": False,
+}
+
+# Price series replayed by the sweep in this process.
+_prices: list[tuple[str, float]] = []
+
+
+def set_sweep_prices(prices: list[tuple[str, float]]) -> None:
+    """Set the price series replayed by each task of the sweep.
+
+    Runs at the start of every worker, so the series is sent to each worker
+    once rather than with every task.
+    """
+    global _prices
+    _prices = prices
+
+
+def build_sweep_tasks(
+    strategies: list[str],
+    principal_amounts: list[float],
+    max_multipliers: list[int],
+    interest_rates: list[float],
+    frequencies: list[str],
+) -> dict[str, tuple]:
+    """Build the grid of parameters to replay each strategy with.
+
+    Only the parameters a strategy uses are varied, so cost averaging is
+    replayed once per principal amount.
+
+    Args:
+        strategies: The strategies to replay.
+        principal_amounts: The principal amounts of every strategy.
+        max_multipliers: The largest multipliers of dynamic cost averaging.
+        interest_rates: The yearly interest rates of value averaging.
+        frequencies: The intervals of value averaging, e.g. "monthly".
+
+    Returns:
+        The arguments of `run_sweep_task`, keyed by task name.
+    """
+    tasks: dict[str, tuple] = {}
+
+    for strategy in strategies:
+        if strategy == "dynamic":
+            grid = product(principal_amounts, max_multipliers, [None], [None])
+        elif strategy == "value":
+            grid = product(
+                principal_amounts, [None], interest_rates, frequencies
+            )
+        else:
+            grid = product(principal_amounts, [None], [None], [None])
+
+        for principal_amount, multiplier, rate, frequency in grid:
+            name = "-".join(
+                str(parameter)
+                for parameter in (
+                    strategy,
+                    principal_amount,
+                    multiplier,
+                    rate,
+                    frequency,
+                )
+                if parameter is not None
+            )
+            tasks[name] = (
+                strategy,
+                principal_amount,
+                multiplier,
+                rate,
+                frequency,
+            )
+
+    return tasks
+
+
+def run_sweep_task(
+    strategy: str,
+    principal_amount: float,
+    max_multiplier: Optional[int],
+    interest_rate: Optional[float],
+    frequency: Optional[str],
+    product_id: str = "BTC-USD",
+    min_order_size: float = 0.0,
+) -> BacktestSummary:
+    """Replay a strategy over the sweep prices with one set of parameters."""
+    broker = BacktestBroker(
+        _prices,
+        principal_amount,
+        product_id=product_id,
+        min_order_size=min_order_size,
+    )
+    growth_rate = (
+        get_growth_rate(interest_rate, frequency)
+        if strategy == "value"
+        else None
+    )
+    _, summary = run_backtest(strategy, broker, max_multiplier, growth_rate)
+
+    return summary
+
+
+def run_sweep(
+    prices: list[tuple[str, float]],
+    tasks: dict[str, tuple],
+    jobs: int = 1,
+    product_id: str = "BTC-USD",
+    min_order_size: float = 0.0,
+) -> tuple[dict[str, BacktestSummary], dict[str, Exception]]:
+    """Replay every task of a sweep, in worker processes if asked to.
+
+    Args:
+        prices: The price series to replay.
+        tasks: The tasks of `build_sweep_tasks`.
+        jobs: The number of worker processes.
+        product_id: The product the prices belong to.
+        min_order_size: Steps with smaller trade amounts are held.
+
+    Returns:
+        The summary of every task that succeeded and the exception of every
+        task that failed, keyed by task name.
+    """
+    set_sweep_prices(prices)
+
+    return run_jobs(
+        run_sweep_task,
+        {
+            name: (*args, product_id, min_order_size)
+            for name, args in tasks.items()
+        },
+        jobs,
+        initializer=set_sweep_prices,
+        initargs=(prices,),
+    )
+
+
+def convert_sweep_to_csv(
+    tasks: dict[str, tuple],
+    summaries: dict[str, BacktestSummary],
+    rank_by: str = "gain_or_loss",
+) -> list[list[str]]:
+    """Convert the summaries of a sweep into a ranked CSV table.
+
+    Args:
+        tasks: The tasks of the sweep.
+        summaries: The summary of each task, keyed by task name.
+        rank_by: One of the fields of `rankings`.
+
+    Returns:
+        The table, header included, with the best ranked task first.
+    """
+    ranked = sorted(
+        summaries,
+        key=lambda name: getattr(summaries[name], rank_by),
+        reverse=rankings[rank_by],
+    )
+
+    csv_table = [
+        [
+            "Rank",
+            "Strategy",
+            "Principal Amount",
+            "Max Multiplier",
+            "Interest Rate",
+            "Frequency",
+            "Intervals",
+            "Holds",
+            "Total Trade Amount",
+            "Final Value",
+            "Gain or (Loss)",
+            "Max Drawdown",
+        ]
+    ]
+
+    for rank, name in enumerate(ranked, start=1):
+        strategy, principal_amount, multiplier, rate, frequency = tasks[name]
+        summary = summaries[name]
+
+        csv_table.append(
+            [
+                str(rank),
+                strategy,
+                str(principal_amount),
+                "" if multiplier is None else str(multiplier),
+                "" if rate is None else str(rate),
+                frequency or "",
+                str(summary.intervals),
+                str(summary.holds),
+                f"{summary.total_trade_amount:.2f}",
+                f"{summary.final_value:.2f}",
+                f"{summary.gain_or_loss:.2f}",
+                f"{summary.max_drawdown:.2f}",
+            ]
+        )
+
+    return csv_table
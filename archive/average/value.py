@@ -5,10 +5,18 @@ from dotenv import load_dotenv
 
 from archive.average.factory import Broker, broker_factory
 from archive.average.models import ValueAverageColumn, ValueAverageRecord
-from archive.tools.io import print_csv, read_write_csv, write_csv
+from archive.tools.io import append_csv, print_csv, read_last_csv_record
 
 load_dotenv()
 
+# Number of intervals of each frequency in a year.
+__periods__: dict[str, int] = {
+    "hourly": 365 * 24,
+    "daily": 365,
+    "weekly": 52,
+    "monthly": 12,
+}
+
 
 def convert_csv_to_records(
     records: list[list[str]],
@@ -113,21 +121,47 @@ def convert_records_to_csv(
     return entries
 
 
+def get_growth_rate(
+    interest_rate: Optional[float] = None,
+    frequency: Optional[str] = None,
+) -> float:
+    """Calculate the growth rate of the target value per interval.
+
+    Args:
+        interest_rate: The yearly interest rate. Defaults to the INTEREST_RATE environment variable, else 5%.
+        frequency: One of "hourly", "daily", "weekly" or "monthly". Defaults to the FREQUENCY environment variable, else "monthly".
+
+    Returns:
+        The growth rate, e.g. 1.0041667 for 5% compounded monthly.
+
+    Raises:
+        ValueError: If the frequency is not one of the above.
+    """
+
+    frequency = frequency or getenv("FREQUENCY") or "monthly"
+
+    if frequency not in __periods__:
+        raise ValueError(f"Invalid frequency: {frequency}")
+
+    periods = __periods__[frequency]
+
+    if interest_rate is None:
+        interest_rate = float(getenv("INTEREST_RATE") or 0.05)
+
+    return 1 + (interest_rate / periods)
+
+
 def calculate_trade_amount(
     principal_amount: float,
     product_id: str,
     broker: Broker,
     last_record: Optional[ValueAverageRecord],
+    growth_rate: Optional[float] = None,
 ) -> float:
-    frequency = {"daily": 365, "weekly": 52, "monthly": 12}.get(
-        getenv("FREQUENCY") or "monthly", 12
-    )
-    interest_rate = float(getenv("INTEREST_RATE") or 0.05)  # default is 5%
-    growth_rate = 1 + (interest_rate / frequency)
+    growth_rate = growth_rate or get_growth_rate()
 
-    # Simulate the order to get the current market price
-    simulated_order = broker.get_simulated_order(principal_amount, product_id)
-    market_price = float(simulated_order["market_price"])
+    # Get the current market price using the broker's get_price method
+    market_price = broker.get_price(product_id)
 
     # Set default values if no previous record exists
     last_total_order_size = last_record.total_order_size if last_record else 0
@@ -145,12 +179,14 @@ def calculate_trade_amount(
 def create_value_average_record(
     order: dict[str, Union[str, float]],
     last_record: Optional[ValueAverageRecord] = None,
+    growth_rate: Optional[float] = None,
 ) -> ValueAverageRecord:
     """Create a new ValueAverageRecord using the provided order and the last record.
 
     Args:
         order: A dictionary containing the order details, including exchange, product_id, principal_amount, side, datetime, market_price, and order_size.
         last_record: The last ValueAverageRecord in the series, or None if there's no previous record.
+        growth_rate: The growth rate of the target value. Defaults to the growth rate of the environment variables.
 
     Notes:
         The growth rate used in the Value Averaging algorithm is calculated based on the interest rate and frequency environment variables.
@@ -161,11 +197,7 @@ def create_value_average_record(
     """
 
     # Calculate the growth rate
-    frequency = {"daily": 365, "weekly": 52, "monthly": 12}.get(
-        getenv("FREQUENCY") or "monthly", 12
-    )
-    interest_rate = float(getenv("INTEREST_RATE") or 0.05)  # default is 5%
-    growth_rate = 1 + (interest_rate / frequency)
+    growth_rate = growth_rate or get_growth_rate()
 
     # Extract the order information to calculate the record
     principal_amount = float(order["principal_amount"])
@@ -212,30 +244,47 @@ def create_value_average_record(
     )
 
 
-def execute_value_average(file: str, execute: bool = False) -> None:
+def execute_value_average(
+    file: str,
+    execute: bool = False,
+    broker: Optional[Broker] = None,
+    product_id: Optional[str] = None,
+    principal_amount: Optional[float] = None,
+    last_record: Optional[ValueAverageRecord] = None,
+    growth_rate: Optional[float] = None,
+) -> Optional[ValueAverageRecord]:
     """Execute a cost averaging order, update the records, and write the results to a CSV file.
 
     Args:
         file: The path to the CSV file to read and update with the new ValueAverageRecord.
         execute: A boolean flag indicating whether to execute a real order (True) or simulate one (False).
+        broker: The broker to place the order with. Defaults to the broker of the EXCHANGE environment variable.
+        product_id: The product to trade. Defaults to the PRODUCT_ID environment variable.
+        principal_amount: The principal amount of each interval. Defaults to the PRINCIPAL_AMOUNT environment variable.
+        last_record: The last ValueAverageRecord of the file, if it is already known. Defaults to reading it from the file.
+        growth_rate: The growth rate of the target value. Defaults to the growth rate of the environment variables.
+
+    Returns:
+        The new ValueAverageRecord, or None if the order was held.
     """
 
     exchange = getenv("EXCHANGE") or ""
-    product_id = getenv("PRODUCT_ID") or ""
-    principal_amount = float(getenv("PRINCIPAL_AMOUNT") or 0)
+    product_id = product_id or getenv("PRODUCT_ID") or ""
+    principal_amount = principal_amount or float(
+        getenv("PRINCIPAL_AMOUNT") or 0
+    )
 
-    broker = broker_factory(exchange)
+    broker = broker or broker_factory(exchange)
 
     min_trade_amount = broker.get_min_order_size(product_id)
 
-    csv_table = read_write_csv(file, [])
-    records = convert_csv_to_records(csv_table)
-
-    last_record = records[-1] if records else None
+    last_record = last_record or read_last_csv_record(
+        file, convert_records_to_csv, convert_csv_to_records
+    )
 
     # Calculate the trade amount using the helper function
     trade_amount = calculate_trade_amount(
-        principal_amount, product_id, broker, last_record
+        principal_amount, product_id, broker, last_record, growth_rate
     )
 
     # Check if the trade amount is below the minimum trade amount
@@ -256,12 +305,16 @@ def execute_value_average(file: str, execute: bool = False) -> None:
     else:
         order = broker.get_simulated_order(trade_amount, product_id, side)
 
-    new_record = create_value_average_record(order, last_record)
+    # Records are kept in terms of the principal amount of the strategy,
+    # whatever amount this order traded
+    order["principal_amount"] = principal_amount
+
+    new_record = create_value_average_record(order, last_record, growth_rate)
 
-    records.append(new_record)
+    new_csv_table = convert_records_to_csv([new_record])
 
-    updated_csv_table = convert_records_to_csv(records)
+    print_csv(new_csv_table)
 
-    print_csv(updated_csv_table)
+    append_csv(file, new_csv_table[1:], header=new_csv_table[0])
 
-    write_csv(file, updated_csv_table)
+    return new_record
@@ -0,0 +1,167 @@
+from os import getenv
+from pathlib import Path
+from threading import Lock
+from typing import Callable, Optional
+
+from dotenv import load_dotenv
+from peewee import CharField, FloatField, SqliteDatabase
+from requests import RequestException
+
+from archive.tools.db import BaseModel, db_connect, get_database
+
+load_dotenv()
+
+# Path to the on-disk spot price cache.
+__cache__: str = getenv("PRICE_CACHE") or "data/cache/prices.db"
+
+# Serve historical spot prices from the cache only; never hit the network.
+__cache_only__: bool = (getenv("PRICE_CACHE_ONLY") or "").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+# Lazily connected cache database, shared by every exchange API module.
+_database: Optional[SqliteDatabase] = None
+_database_lock = Lock()
+
+
+class SpotPriceModel(BaseModel):
+    """A cached historical spot price for a product on a given exchange.
+
+    Attributes:
+        exchange (str): The exchange the price was fetched from.
+        product (str): The exchange specific product, e.g. "BTC-USD" or "XXBTZUSD".
+        date (str): The exchange specific lookup key, e.g. "2021-03-22" for Coinbase.
+        price (float): The spot price returned by the exchange.
+    """
+
+    exchange = CharField()
+    product = CharField()
+    date = CharField()
+    price = FloatField()
+
+    class Meta:
+        table_name = "spot_price"
+        indexes = ((("exchange", "product", "date"), True),)
+
+
+def set_cache_only(cache_only: bool = True) -> None:
+    """Enable or disable offline mode for historical spot prices.
+
+    Args:
+        cache_only: When True, a cache miss raises instead of fetching the price.
+    """
+    global __cache_only__
+    __cache_only__ = cache_only
+
+
+def is_cache_only() -> bool:
+    """Return True if offline mode is enabled, else False."""
+    return __cache_only__
+
+
+def get_price_cache() -> Optional[SqliteDatabase]:
+    """Return the connected spot price cache, connecting on first use.
+
+    Returns:
+        The connected database or None if the connection failed.
+    """
+    global _database
+
+    with _database_lock:
+        # Forked worker processes are handed a database of their own
+        if _database is None or _database is not get_database(__cache__):
+            cache_path = Path(__cache__)
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            _database = db_connect(SpotPriceModel, cache_path)
+
+    return _database
+
+
+def get_cached_price(
+    exchange: str,
+    product: str,
+    date: str,
+) -> Optional[float]:
+    """Look up a historical spot price in the cache.
+
+    Args:
+        exchange: The exchange the price belongs to.
+        product: The exchange specific product identifier.
+        date: The exchange specific lookup key.
+
+    Returns:
+        The cached price or None if it has not been cached yet.
+    """
+    if get_price_cache() is None:
+        return None
+
+    record = SpotPriceModel.get_or_none(
+        (SpotPriceModel.exchange == exchange)
+        & (SpotPriceModel.product == product)
+        & (SpotPriceModel.date == date)
+    )
+
+    return record.price if record else None
+
+
+def set_cached_price(
+    exchange: str,
+    product: str,
+    date: str,
+    price: float,
+) -> None:
+    """Store a historical spot price in the cache.
+
+    Args:
+        exchange: The exchange the price belongs to.
+        product: The exchange specific product identifier.
+        date: The exchange specific lookup key.
+        price: The spot price to store.
+    """
+    if get_price_cache() is None:
+        return
+
+    SpotPriceModel.insert(
+        exchange=exchange,
+        product=product,
+        date=date,
+        price=price,
+    ).on_conflict_replace().execute()
+
+
+def get_cached_spot_price(
+    exchange: str,
+    product: str,
+    date: str,
+    fetch: Callable[[], float],
+) -> float:
+    """Return a historical spot price from the cache, fetching it on a miss.
+
+    Args:
+        exchange: The exchange the price belongs to.
+        product: The exchange specific product identifier.
+        date: The exchange specific lookup key.
+        fetch: A callable that requests the price from the exchange.
+
+    Returns:
+        The historical spot price as a float.
+
+    Raises:
+        RequestException: If the price is not cached and offline mode is enabled.
+    """
+    price = get_cached_price(exchange, product, date)
+
+    if price is not None:
+        return price
+
+    if __cache_only__:
+        raise RequestException(
+            f"Spot price for {product} at {date} on {exchange} is not cached."
+        )
+
+    price = fetch()
+    set_cached_price(exchange, product, date, price)
+
+    return price
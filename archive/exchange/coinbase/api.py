@@ -9,13 +9,15 @@ from typing import Any, Optional, Union
 from uuid import uuid4
 
 import dateutil
-import requests
 from dotenv import load_dotenv
 from requests import RequestException
 from requests.auth import AuthBase
 from requests.models import PreparedRequest
 
 from archive.exchange import __agent__, __source__, __version__
+from archive.exchange.cache import get_cached_spot_price
+from archive.exchange.session import get_session
+from archive.tools.limit import TokenBucket
 
 load_dotenv()
 
@@ -24,6 +26,9 @@ load_dotenv()
 # Rate limit used to block request for at least 0.1 seconds.
 __limit__: float = 1 / (36000 / 3600)
 
+# Token bucket shared by every request to enforce the rate limit.
+__bucket__: TokenBucket = TokenBucket(rate=1 / __limit__)
+
 # Timeout value for HTTP requests.
 __timeout__: int = 30
 
@@ -105,10 +110,11 @@ def get(url: str, data: Optional[dict] = None) -> dict[str, Any]:
         The response of the GET request.
     """
 
-    time.sleep(__limit__)
+    session = get_session()
+    __bucket__.acquire()
 
     try:
-        response = requests.get(
+        response = session.get(
             url=url,
             params=data,
             auth=__auth__,
@@ -138,10 +144,11 @@ def post(url: str, data: Optional[dict] = None) -> dict[str, Any]:
     Returns: The response of the POST request.
     """
 
-    time.sleep(__limit__)
+    session = get_session()
+    __bucket__.acquire()
 
     try:
-        response = requests.post(
+        response = session.post(
             url=url,
             json=data,
             auth=__auth__,
@@ -200,24 +207,32 @@ def get_spot_price(
         RequestException: If there's an issue with the response or if the response is missing data
     """
 
-    try:
-        url = f"{__coinbase__}/prices/{currency_pair}/spot"
-
-        if datetime:
-            # Ensure the datetime string is converted to a datetime object
-            timestamp = dateutil.parser.parse(datetime)
-            # The API expects the format YYYY-MM-DD, but we have YYYY-MM-DDTHH:MM:SS
-            date = timestamp.date().isoformat()
-            # We need to convert the date object back into a API compatible string
-            response = get(url, data={"date": date})
-        else:
-            response = get(url)
+    url = f"{__coinbase__}/prices/{currency_pair}/spot"
+
+    def fetch(data: Optional[dict] = None) -> float:
+        response = get(url, data=data)
 
         if "data" in response and "amount" in response["data"]:
             return float(response["data"]["amount"])
         else:
             raise RequestException(response["error"])
 
+    try:
+        if not datetime:
+            return fetch()
+
+        # Ensure the datetime string is converted to a datetime object
+        timestamp = dateutil.parser.parse(datetime)
+        # The API expects the format YYYY-MM-DD, but we have YYYY-MM-DDTHH:MM:SS
+        date = timestamp.date().isoformat()
+        # Historical prices never change, so they are served from the cache
+        return get_cached_spot_price(
+            "coinbase",
+            currency_pair,
+            date,
+            lambda: fetch(data={"date": date}),
+        )
+
     except RequestException as error:
         raise RequestException(f"Error retrieving spot price: {error}")
 
@@ -226,6 +241,7 @@ def get_simulated_market_order(
     quote_size: float,
     product_id: str,
     side: str = "BUY",
+    market_price: Optional[float] = None,
 ) -> dict[str, Union[str, float]]:
     """Simulate a market order based on current spot price and input parameters.
 
@@ -233,6 +249,7 @@ def get_simulated_market_order(
         quote_size: The amount of quote currency to spend on the order (required for BUY orders).
         product_id: The product this order is created for, e.g., 'BTC-USD'.
         side: The side of the order, either 'BUY' or 'SELL'. Defaults to 'BUY'.
+        market_price: The price to fill the order at. Defaults to the current spot price.
 
     Returns:
         A dictionary containing details of the simulated order, including order_id, product_id, side, principal_amount,
@@ -240,10 +257,10 @@ def get_simulated_market_order(
     """
 
     exchange = getenv("EXCHANGE") or "coinbase"
-    product_id = getenv("PRODUCT_ID") or product_id
-    principal_amount = float(getenv("PRINCIPAL_AMOUNT") or quote_size)
+    principal_amount = float(quote_size)
 
-    market_price = get_spot_price(product_id)
+    if market_price is None:
+        market_price = get_spot_price(product_id)
 
     taker_fee = 0.006
     order_fee = principal_amount * taker_fee
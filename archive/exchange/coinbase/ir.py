@@ -3,6 +3,7 @@ from typing import Optional
 from archive.exchange.coinbase.models import CoinbaseTransaction
 from archive.exchange.coinbase.parser import parse_coinbase
 from archive.ir.models import IRTransaction
+from archive.tools.timestamp import parse_timestamp
 
 
 def build_coinbase_ir(
@@ -60,6 +61,7 @@ def build_coinbase_ir(
             market_price=float(transaction.spot_price),
             order_fee=float(transaction.fees),
             order_note=order_note,
+            timestamp=parse_timestamp(transaction.timestamp),
         )
 
         ir_transactions.append(ir_transaction)
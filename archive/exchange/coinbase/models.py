@@ -30,7 +30,7 @@ class CoinbaseColumn(Enum):
     NOTES = 9
 
 
-@dataclass
+@dataclass(slots=True)
 class CoinbaseNote:
     """Class representing a Coinbase transaction note.
 
@@ -67,7 +67,7 @@ class CoinbaseNote:
         return bool(has_product or has_quote or has_currency_pair)
 
 
-@dataclass
+@dataclass(slots=True)
 class CoinbaseTransaction:
     """A dataclass representing a Coinbase transaction."""
 
@@ -1,9 +1,9 @@
 from typing import Optional
 
-import dateutil
-
 from archive.exchange.coinbase.api import get_spot_price
 from archive.exchange.coinbase.models import CoinbaseTransaction
+from archive.exchange.resolver import resolve_spot_prices
+from archive.tools.timestamp import parse_timestamp
 
 
 def get_missing_transactions(
@@ -26,6 +26,16 @@ def get_missing_transactions(
         if transaction.transaction_type == "Convert":
             conversions.append(transaction)
 
+    # Resolve every missing spot price concurrently before back-filling
+    lookups = [
+        (
+            f"{transaction.notes.quote}-{transaction.currency}",
+            parse_timestamp(transaction.timestamp).date().isoformat(),
+        )
+        for transaction in conversions
+    ]
+    resolve_spot_prices(lookups, get_spot_price)
+
     # Extract missing transactions
     for transaction in conversions:
         asset = transaction.notes.quote  # base
@@ -155,11 +165,4 @@ def parse_coinbase(
         else:
             raise ValueError(f"Unknown transaction type: {original_type}")
 
-    # Convert timestamps to iso format
-    for transaction in processed_transactions:
-        # Ensure the datetime string is converted to a datetime object
-        converted_timestamp = dateutil.parser.parse(transaction.timestamp)
-        # This API expects iso8601 compatible format
-        transaction.timestamp = converted_timestamp.isoformat()
-
     return processed_transactions
@@ -6,7 +6,7 @@ from archive.exchange.coinbase.models import (
     CoinbaseNoteColumn,
     CoinbaseTransaction,
 )
-from archive.tools.io import read_csv
+from archive.tools.io import iter_csv
 
 
 def csv_row_to_coinbase_note(csv_row: list[str]) -> CoinbaseNote:
@@ -80,10 +80,12 @@ def scan_coinbase_transactions(
 ) -> list[CoinbaseTransaction]:
     """Scan the CSV file and extract Coinbase transaction data."""
     transactions = []
-    csv_table = read_csv(filepath)
+    csv_rows = iter_csv(filepath)
 
     # omit the header from the conversion process
-    for csv_row in csv_table[1:]:
+    next(csv_rows, None)
+
+    for csv_row in csv_rows:
         transaction = CoinbaseTransaction(
             timestamp=csv_row[CoinbaseColumn.TIMESTAMP.value],
             transaction_type=csv_row[CoinbaseColumn.TRANSACTION_TYPE.value],
@@ -3,6 +3,7 @@ from typing import Optional
 from archive.exchange.coinbase_pro.models import CoinbaseProTransaction
 from archive.exchange.coinbase_pro.parser import parse_coinbase_pro
 from archive.ir.models import IRTransaction
+from archive.tools.timestamp import parse_timestamp
 
 
 def build_coinbase_pro_ir(
@@ -26,6 +27,9 @@ def build_coinbase_pro_ir(
             market_price=float(transaction.price),
             order_fee=float(transaction.fee),
             order_note=transaction.notes,
+            # NOTE: Account statements do not have trade IDs
+            trade_id=str(transaction.trade_id) if transaction.trade_id else "",
+            timestamp=parse_timestamp(transaction.created_at),
         )
 
         ir_transactions.append(ir_transaction)
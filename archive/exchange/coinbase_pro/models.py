@@ -33,7 +33,7 @@ class CoinbaseProFillColumn(Enum):
     NOTES = 11
 
 
-@dataclass
+@dataclass(slots=True)
 class CoinbaseProTransaction:
     """A dataclass representing a Coinbase Pro transaction."""
 
@@ -2,6 +2,8 @@ from typing import Optional
 
 from archive.exchange.coinbase.api import get_spot_price
 from archive.exchange.coinbase_pro.models import CoinbaseProTransaction
+from archive.exchange.resolver import resolve_spot_prices
+from archive.tools.timestamp import parse_timestamp
 
 
 def get_missing_crypto_to_crypto(
@@ -186,6 +188,37 @@ def get_missing_crypto_to_stablecoin(
     return [base_transaction, quote_transaction]
 
 
+def get_missing_price_lookups(
+    crypto_to_crypto: list[CoinbaseProTransaction],
+    crypto_to_stablecoin: list[CoinbaseProTransaction],
+) -> list[tuple[str, str]]:
+    """Get the spot price lookups needed to back-fill missing transactions.
+
+    Coinbase only provides daily historical spot prices, so lookups are keyed
+    by date to avoid requesting the same price more than once.
+
+    Args:
+        crypto_to_crypto: A list of crypto-to-crypto CoinbaseProTransaction's.
+        crypto_to_stablecoin: A list of crypto-to-stablecoin CoinbaseProTransaction's.
+
+    Returns:
+        A list of (product, date) pairs.
+    """
+
+    lookups = []
+
+    for transaction in crypto_to_crypto:
+        date = parse_timestamp(transaction.created_at).date().isoformat()
+        lookups.append((f"{transaction.base}-USD", date))
+        lookups.append((f"{transaction.quote}-USD", date))
+
+    for transaction in crypto_to_stablecoin:
+        date = parse_timestamp(transaction.created_at).date().isoformat()
+        lookups.append((f"{transaction.quote}-USD", date))
+
+    return lookups
+
+
 def get_missing_transactions(
     transactions: list[CoinbaseProTransaction],
 ) -> list[CoinbaseProTransaction]:
@@ -210,6 +243,10 @@ def get_missing_transactions(
             else:
                 crypto_to_crypto.append(transaction)
 
+    # Resolve every missing spot price concurrently before back-filling
+    lookups = get_missing_price_lookups(crypto_to_crypto, crypto_to_stablecoin)
+    resolve_spot_prices(lookups, get_spot_price)
+
     # Process crypto-to-crypto transactions
     for convert in crypto_to_crypto:
         missing_transaction = get_missing_crypto_to_crypto(convert)
@@ -1,11 +1,12 @@
 from pathlib import Path
+from typing import Iterator
 
 from archive.exchange.coinbase_pro.models import (
     CoinbaseProAccountColumn,
     CoinbaseProFillColumn,
     CoinbaseProTransaction,
 )
-from archive.tools.io import read_csv
+from archive.tools.io import iter_csv, read_csv
 
 
 def scan_coinbase_pro_accounts(
@@ -65,10 +66,12 @@ def scan_coinbase_pro_fills(
     filepath: str | Path,
 ) -> list[CoinbaseProTransaction]:
     transactions: list[CoinbaseProTransaction] = []
-    csv_table: list[list[str]] = read_csv(filepath)
+    csv_rows: Iterator[list[str]] = iter_csv(filepath)
 
     # omit the header from the conversion process
-    for csv_row in csv_table[1:]:
+    next(csv_rows, None)
+
+    for csv_row in csv_rows:
         total = float(csv_row[CoinbaseProFillColumn.TOTAL.value])
 
         transaction = CoinbaseProTransaction(
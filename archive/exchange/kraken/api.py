@@ -1,11 +1,202 @@
+import json
+import logging
 import time
 from datetime import datetime as dt
-from typing import Optional, Union
+from os import getenv
+from pathlib import Path
+from typing import Any, Optional, Union
 
-import requests
 from dateutil.parser import parse
+from dotenv import load_dotenv
 from requests import RequestException
 
+from archive.exchange.cache import (
+    __cache__,
+    get_cached_spot_price,
+    is_cache_only,
+)
+from archive.exchange.session import __timeout__, get_session
+from archive.tools.limit import TokenBucket
+from archive.tools.logger import setup_logger
+
+load_dotenv()
+
+logger = setup_logger(
+    "kraken_logger",
+    "data/log/kraken.log",
+    logging.DEBUG,
+)
+
+# Rate limit of public API requests in seconds.
+# The rate limit is used to block a request for at least 1.00 second.
+__limit__: float = 1.0
+
+# Token bucket shared by every request to enforce the rate limit.
+__bucket__: TokenBucket = TokenBucket(rate=1 / __limit__)
+
+# Path to the on-disk copy of the AssetPairs table.
+__pairs__: Path = Path(__cache__).parent / "kraken-asset-pairs.json"
+
+# Number of seconds the on-disk AssetPairs table is considered fresh.
+__pairs_ttl__: int = int(getenv("ASSET_PAIRS_TTL") or 86400)
+
+# Kraken's legacy asset codes mapped to their common symbols.
+aliases = {"XBT": "BTC", "XDG": "DOGE"}
+
+# Define a mapping between exchange product names and a standard naming convention.
+# Pairs in the AssetPairs table override these, while delisted pairs that are
+# only found in historical exports, e.g. XMR, are still resolved from here.
+products = {
+    # Stable Coins
+    "USDCUSD": "USDC-USD",
+    "DAIUSD": "DAI-USD",
+    # USD Trade Pairs
+    "XXBTZUSD": "BTC-USD",
+    "XETHZUSD": "ETH-USD",
+    "XLTCZUSD": "LTC-USD",
+    "XXMRZUSD": "XMR-USD",
+    "XZECZUSD": "ZEC-USD",
+    "DOTUSD": "DOT-USD",
+    "LINKUSD": "LINK-USD",
+    "COMPUSD": "COMP-USD",
+    "UNIUSD": "UNI-USD",
+    "YFIUSD": "YFI-USD",
+    "XXRPZUSD": "XRP-USD",
+    # BTC Trade Pairs
+    "XETHXXBT": "ETH-BTC",
+    "XLTCXXBT": "LTC-BTC",
+    "XXMRXXBT": "XMR-BTC",
+    # Add more mappings as needed
+}
+
+# The AssetPairs table and its derived mappings, loaded once per process.
+_asset_pairs: Optional[dict[str, dict[str, Any]]] = None
+_products: Optional[dict[str, str]] = None
+_usd_pairs: Optional[dict[str, str]] = None
+
+
+def get_asset_pairs() -> dict[str, dict[str, Any]]:
+    """Retrieve the full AssetPairs table, fetching it at most once.
+
+    The table is kept on disk for `ASSET_PAIRS_TTL` seconds. A stale copy is
+    still used when offline mode is enabled.
+
+    Returns:
+        A dictionary mapping each Kraken pair name to its metadata.
+
+    Raises:
+        RequestException: If the table could not be retrieved.
+    """
+    global _asset_pairs
+
+    if _asset_pairs is not None:
+        return _asset_pairs
+
+    if __pairs__.exists():
+        age = time.time() - __pairs__.stat().st_mtime
+        if age < __pairs_ttl__ or is_cache_only():
+            with open(__pairs__, "r") as file:
+                _asset_pairs = json.load(file)
+            return _asset_pairs
+
+    if is_cache_only():
+        raise RequestException(
+            f"Kraken: AssetPairs is not cached at {__pairs__}."
+        )
+
+    url = "https://api.kraken.com/0/public/AssetPairs"
+    __bucket__.acquire()
+    response = get_session().get(url, timeout=__timeout__)
+
+    try:
+        result = response.json()["result"]
+    except KeyError as e:
+        raise RequestException(f"Error retrieving asset pairs: {e}")
+
+    __pairs__.parent.mkdir(parents=True, exist_ok=True)
+    with open(__pairs__, "w") as file:
+        json.dump(result, file)
+
+    _asset_pairs = result
+    return _asset_pairs
+
+
+def get_known_asset_pairs() -> dict[str, dict[str, Any]]:
+    """Retrieve the AssetPairs table, or an empty table if it is unavailable.
+
+    A failure is logged once and remembered for the rest of the process, so
+    lookups fall back to the static `products` mapping without retrying.
+
+    Returns:
+        A dictionary mapping each Kraken pair name to its metadata.
+    """
+    global _asset_pairs
+
+    try:
+        return get_asset_pairs()
+    except RequestException as error:
+        logger.warning("Using the static Kraken products: %s", error)
+        _asset_pairs = {}
+        return _asset_pairs
+
+
+def get_products() -> dict[str, str]:
+    """Map Kraken pair names to the standard "BASE-QUOTE" naming convention.
+
+    The static `products` mapping is extended and overridden by the pairs of
+    the AssetPairs table. If the table cannot be retrieved, e.g. offline
+    without a cached copy, the static mapping is used on its own.
+
+    Returns:
+        A dictionary mapping pair names, e.g. "XXBTZUSD", to products, e.g. "BTC-USD".
+    """
+    global _products
+
+    if _products is None:
+        merged = dict(products)
+
+        for pair, info in get_known_asset_pairs().items():
+            # Dark pool pairs have no websocket name and are never traded
+            if "wsname" not in info:
+                continue
+            base, quote = info["wsname"].split("/")
+            base, quote = aliases.get(base, base), aliases.get(quote, quote)
+            merged[pair] = f"{base}-{quote}"
+
+        _products = merged
+
+    return _products
+
+
+def get_usd_pair(asset: str) -> Optional[str]:
+    """Return the Kraken pair that quotes the given asset in USD.
+
+    Args:
+        asset: A Kraken asset code, e.g. "XXBT", or a symbol, e.g. "BTC".
+
+    Returns:
+        The pair name, e.g. "XXBTZUSD", or None if there is no such pair.
+    """
+    global _usd_pairs
+
+    if _usd_pairs is None:
+        usd_pairs = {}
+        products = get_products()
+
+        for pair, product in products.items():
+            base, _, quote = product.partition("-")
+            if quote == "USD":
+                usd_pairs[base] = pair
+
+        # Kraken's own asset codes, e.g. "XXBT", are only in the table
+        for pair, info in get_known_asset_pairs().items():
+            if products.get(pair, "").endswith("-USD"):
+                usd_pairs[info["base"]] = pair
+
+        _usd_pairs = usd_pairs
+
+    return _usd_pairs.get(asset) or _usd_pairs.get(aliases.get(asset, asset))
+
 
 def get_asset_info(currency_pair: str) -> tuple[str, str]:
     """Retrieve the base and quote products for a given currency pair.
@@ -15,6 +206,10 @@ def get_asset_info(currency_pair: str) -> tuple[str, str]:
 
     Returns:
         A tuple containing the base and quote products as strings.
+
+    Raises:
+        KeyError: If the pair is neither in the AssetPairs table nor in the
+            `products` dictionary.
     """
     # NOTE: This is specific to processing crypto-to-crypto
     # transactions and should be renamed. A stand alone function
@@ -22,17 +217,26 @@ def get_asset_info(currency_pair: str) -> tuple[str, str]:
     # with the REST API endpoint. Renaming this function will
     # affect other aspects of the code base and should be accounted
     # for before making any changes.
-    url = "https://api.kraken.com/0/public/AssetPairs"
-    params = {"pair": currency_pair}
-    response = requests.get(url, params=params)
-    result = response.json()["result"][currency_pair]
+    info = get_known_asset_pairs().get(currency_pair)
 
+    if info is not None:
+        base, quote = info["base"], info["quote"]
+    elif currency_pair in get_products():
+        # Delisted pairs, or any pair while the table is unavailable
+        base, _, quote = get_products()[currency_pair].partition("-")
+    else:
+        raise KeyError(
+            f"Kraken: '{currency_pair}' is an unknown product. Please add it to the 'products' dictionary in 'archive/exchange/kraken/api.py'."
+        )
+
+    # Fall back to guessing the quote suffix for pairs missing a USD market
     if len(currency_pair) == 6 or len(currency_pair) == 7:
-        base_product = f"{result['base']}USD"
-        quote_product = f"{result['quote']}USD"
+        suffix = "USD"
     else:
-        base_product = f"{result['base']}ZUSD"
-        quote_product = f"{result['quote']}ZUSD"
+        suffix = "ZUSD"
+
+    base_product = get_usd_pair(base) or f"{base}{suffix}"
+    quote_product = get_usd_pair(quote) or f"{quote}{suffix}"
 
     return base_product, quote_product
 
@@ -53,33 +257,41 @@ def get_spot_price(
     Raises:
         RequestException: If there's an issue with the response or if the response is missing data.
     """
-    # The rate limit of the API requests, in seconds.
-    # The rate limit is used to block a request for at least 1.00 second.
-    time.sleep(1)
 
-    if not datetime:
-        datetime = dt.now().isoformat()
+    def fetch(timestamp: int) -> float:
+        __bucket__.acquire()
 
-    # Calculate the timestamp of the datetime string
-    timestamp = int(parse(datetime).timestamp())
+        # Set the time range for the Trades endpoint query
+        time_range = f"{timestamp-300}:{timestamp+300}"
 
-    # Set the time range for the Trades endpoint query
-    time_range = f"{timestamp-300}:{timestamp+300}"
+        # Send a GET request to the Trades endpoint with the specified parameters
+        url = "https://api.kraken.com/0/public/Trades"
+        params = {"pair": currency_pair, "since": time_range}
+        response = get_session().get(url, params=params, timeout=__timeout__)
 
-    # Send a GET request to the Trades endpoint with the specified parameters
-    url = "https://api.kraken.com/0/public/Trades"
-    params = {"pair": currency_pair, "since": time_range}
-    response = requests.get(url, params=params)
+        try:
+            # Extract the trades data from the response and find the trade that
+            # occurred closest to the specified datetime
+            trades = response.json()["result"][currency_pair]
+            avg_price = sum(float(trade[0]) for trade in trades) / len(trades)
+            return avg_price
 
-    try:
-        # Extract the trades data from the response and find the trade that
-        # occurred closest to the specified datetime
-        trades = response.json()["result"][currency_pair]
-        avg_price = sum(float(trade[0]) for trade in trades) / len(trades)
-        return avg_price
+        except KeyError as e:
+            raise RequestException(f"Error retrieving spot price: {e}")
 
-    except KeyError as e:
-        raise RequestException(f"Error retrieving spot price: {e}")
+    if not datetime:
+        return fetch(int(dt.now().timestamp()))
+
+    # Calculate the timestamp of the datetime string
+    timestamp = int(parse(datetime).timestamp())
+
+    # Historical prices never change, so they are served from the cache
+    return get_cached_spot_price(
+        "kraken",
+        currency_pair,
+        str(timestamp),
+        lambda: fetch(timestamp),
+    )
 
 
 def post_market_order(
@@ -3,6 +3,7 @@ from typing import Optional
 from archive.exchange.kraken.models import KrakenTransaction
 from archive.exchange.kraken.parser import parse_kraken
 from archive.ir.models import IRTransaction
+from archive.tools.timestamp import parse_timestamp
 
 
 def build_kraken_ir(
@@ -36,6 +37,8 @@ def build_kraken_ir(
             market_price=transaction.price,
             order_fee=transaction.fee,
             order_note=transaction.notes,
+            trade_id=transaction.txid,
+            timestamp=parse_timestamp(transaction.time),
         )
 
         ir_transactions.append(ir_transaction)
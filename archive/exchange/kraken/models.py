@@ -1,29 +1,7 @@
 from dataclasses import dataclass
 from enum import Enum
 
-# Define a mapping between exchange product names and a standard naming convention
-products = {
-    # Stable Coins
-    "USDCUSD": "USDC-USD",
-    "DAIUSD": "DAI-USD",
-    # USD Trade Pairs
-    "XXBTZUSD": "BTC-USD",
-    "XETHZUSD": "ETH-USD",
-    "XLTCZUSD": "LTC-USD",
-    "XXMRZUSD": "XMR-USD",
-    "XZECZUSD": "ZEC-USD",
-    "DOTUSD": "DOT-USD",
-    "LINKUSD": "LINK-USD",
-    "COMPUSD": "COMP-USD",
-    "UNIUSD": "UNI-USD",
-    "YFIUSD": "YFI-USD",
-    "XXRPZUSD": "XRP-USD",
-    # BTC Trade Pairs
-    "XETHXXBT": "ETH-BTC",
-    "XLTCXXBT": "LTC-BTC",
-    "XXMRXXBT": "XMR-BTC",
-    # Add more mappings as needed
-}
+from archive.exchange.kraken.api import get_products
 
 
 class KrakenLedgerColumn(Enum):
@@ -60,7 +38,7 @@ class KrakenTradeColumn(Enum):
     NOTES = 13
 
 
-@dataclass
+@dataclass(slots=True)
 class KrakenTransaction:
     """A dataclass representing a Kraken transaction."""
 
@@ -83,13 +61,14 @@ class KrakenTransaction:
     def product(self) -> str:
         """
         Returns the standardized product name from Kraken's non-standardized product name.
-        If the product name is not found in the `products` dictionary, it raises a KeyError.
+        If the product name is neither in Kraken's AssetPairs table nor in the `products`
+        dictionary in 'archive/exchange/kraken/api.py', it raises a KeyError.
         """
         try:
-            return products[self.pair]
+            return get_products()[self.pair]
         except KeyError:
             raise KeyError(
-                f"Kraken: '{self.pair}' is an unknown product. Please add it to the 'products' dictionary in 'archive/exchange/kraken/models.py'."
+                f"Kraken: '{self.pair}' is an unknown product. Please add it to the 'products' dictionary in 'archive/exchange/kraken/api.py'."
             )
 
     @property
@@ -102,7 +81,7 @@ class KrakenTransaction:
             return self.product.split("-")[0]
         except IndexError:
             raise KeyError(
-                f"Kraken: '{self.product}' is an invalid format. Please check the 'products' dictionary in 'archive/exchange/kraken/models.py'."
+                f"Kraken: '{self.product}' is an invalid format. Please check Kraken's AssetPairs table."
             )
 
     @property
@@ -115,7 +94,7 @@ class KrakenTransaction:
             return self.product.split("-")[1]
         except IndexError:
             raise KeyError(
-                f"Kraken: '{self.product}' is an invalid format. Please check the 'products' dictionary in 'archive/exchange/kraken/models.py'."
+                f"Kraken: '{self.product}' is an invalid format. Please check Kraken's AssetPairs table."
             )
 
     @property
@@ -2,6 +2,7 @@ from typing import Optional
 
 from archive.exchange.kraken.api import get_asset_info, get_spot_price
 from archive.exchange.kraken.models import KrakenTransaction
+from archive.exchange.resolver import resolve_spot_prices
 
 
 def get_missing_crypto_to_crypto(
@@ -196,6 +197,34 @@ def get_missing_crypto_to_stablecoin(
     return [base_transaction, quote_transaction]
 
 
+def get_missing_price_lookups(
+    crypto_to_crypto: list[KrakenTransaction],
+    crypto_to_stablecoin: list[KrakenTransaction],
+) -> list[tuple[str, str]]:
+    """Get the spot price lookups needed to back-fill missing transactions.
+
+    Args:
+        crypto_to_crypto: A list of crypto-to-crypto KrakenTransaction's.
+        crypto_to_stablecoin: A list of crypto-to-stablecoin KrakenTransaction's.
+
+    Returns:
+        A list of (product, datetime) pairs.
+    """
+
+    lookups = []
+
+    for transaction in crypto_to_crypto:
+        base_product, quote_product = get_asset_info(transaction.pair)
+        lookups.append((base_product, transaction.time))
+        lookups.append((quote_product, transaction.time))
+
+    for transaction in crypto_to_stablecoin:
+        _, quote_product = get_asset_info(transaction.pair)
+        lookups.append((quote_product, transaction.time))
+
+    return lookups
+
+
 def get_missing_transactions(
     transactions: list[KrakenTransaction],
 ) -> list[KrakenTransaction]:
@@ -220,6 +249,10 @@ def get_missing_transactions(
             else:
                 crypto_to_crypto.append(transaction)
 
+    # resolve every missing spot price concurrently before back-filling
+    lookups = get_missing_price_lookups(crypto_to_crypto, crypto_to_stablecoin)
+    resolve_spot_prices(lookups, get_spot_price)
+
     # process crypto-to-crypto transactions
     for convert in crypto_to_crypto:
         missing_transaction = get_missing_crypto_to_crypto(convert)
@@ -1,13 +1,12 @@
 from pathlib import Path
 
-from archive.exchange.kraken.api import get_spot_price
+from archive.exchange.kraken.api import get_spot_price, get_usd_pair
 from archive.exchange.kraken.models import (
     KrakenLedgerColumn,
     KrakenTradeColumn,
     KrakenTransaction,
-    products,
 )
-from archive.tools.io import read_csv
+from archive.tools.io import iter_csv
 
 
 # NOTE: This is experimental and only extracts staking tx's
@@ -22,21 +21,19 @@ def scan_kraken_ledgers(filepath: str | Path) -> list[KrakenTransaction]:
         A list of KrakenTransaction objects representing the parsed staking transactions.
 
     Raises
-        KeyError: If the 'products' dictionary in 'archive/exchange/kraken/models.py' has an invalid format.
-
-        ValueError: If an unknown product is encountered and needs to be added to the 'products' dictionary in 'archive/exchange/kraken/models.py'.
+        ValueError: If an asset has no USD pair in Kraken's AssetPairs table or the 'products' dictionary.
     """
 
     transactions = []
-    csv_table = read_csv(filepath)
+    csv_rows = iter_csv(filepath)
 
     # omit the header from the conversion process
-    for csv_row in csv_table[1:]:
+    next(csv_rows, None)
+
+    for csv_row in csv_rows:
         transaction_type = csv_row[KrakenLedgerColumn.TYPE.value]
 
         if transaction_type == "staking":
-            transaction_pair = ""
-
             transaction_vol = csv_row[KrakenLedgerColumn.AMOUNT.value]
 
             transaction_time = csv_row[KrakenLedgerColumn.TIME.value]
@@ -45,24 +42,13 @@ def scan_kraken_ledgers(filepath: str | Path) -> list[KrakenTransaction]:
             transaction_asset = csv_row[KrakenLedgerColumn.ASSET.value]
             transaction_asset = transaction_asset.split(".")[0]
 
-            # Discover transaction pair
-            for pair, product in products.items():
-                try:
-                    if transaction_asset == product.split("-")[0]:
-                        transaction_pair = pair
-                except IndexError:
-                    raise KeyError(
-                        f"Kraken: '{product}' is an invalid format. Please check the 'products' dictionary in 'archive/exchange/kraken/models.py'."
-                    )
-
-            # Quote may either be USD or ZUSD depending on product pair.
-            #
-            # NOTE: There's no finite way to determine which quote asset
-            # to use due to poor implementation and a lack of a standard
-            # format.
+            # Quote may either be USD or ZUSD depending on product pair,
+            # so the pair is looked up in the product map instead.
+            transaction_pair = get_usd_pair(transaction_asset)
+
             if not transaction_pair:
                 raise ValueError(
-                    f"Kraken: '{transaction_asset}' is an unknown product. Please add it to the 'products' dictionary in 'archive/exchange/kraken/models.py'."
+                    f"Kraken: '{transaction_asset}' is an unknown product. Please add its USD pair to the 'products' dictionary in 'archive/exchange/kraken/api.py'."
                 )
 
             # NOTE: There is a potential issue with fetching spot prices
@@ -97,10 +83,12 @@ def scan_kraken_trades(
     filepath: str | Path,
 ) -> list[KrakenTransaction]:
     transactions = []
-    csv_table = read_csv(filepath)
+    csv_rows = iter_csv(filepath)
 
     # omit the header from the conversion process
-    for csv_row in csv_table[1:]:
+    next(csv_rows, None)
+
+    for csv_row in csv_rows:
         transaction = KrakenTransaction(
             txid=csv_row[KrakenTradeColumn.TXID.value],
             order_txid=csv_row[KrakenTradeColumn.ORDER_TXID.value],
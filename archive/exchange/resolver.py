@@ -0,0 +1,48 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Optional
+
+from archive.exchange.cache import get_price_cache
+
+# Maximum number of concurrent spot price requests.
+# Throughput is bounded by each exchange's rate limiter, not by this value.
+__workers__: int = 8
+
+
+def resolve_spot_prices(
+    lookups: Iterable[tuple[str, str]],
+    get_spot_price: Callable[[str, Optional[str]], float],
+    max_workers: int = __workers__,
+) -> dict[tuple[str, str], float]:
+    """Resolve a batch of historical spot prices concurrently.
+
+    Duplicate lookups are only requested once. Each request still passes
+    through the exchange's rate limiter, and every resolved price is stored in
+    the spot price cache, so later lookups for the same product and date are
+    served without touching the network.
+
+    Args:
+        lookups: (product, datetime) pairs to resolve.
+        get_spot_price: The exchange's `get_spot_price` function.
+        max_workers: The maximum number of concurrent requests.
+
+    Returns:
+        A dictionary mapping each unique (product, datetime) pair to its price.
+
+    Raises:
+        RequestException: If any of the prices could not be resolved.
+    """
+    unique_lookups = list(dict.fromkeys(lookups))
+
+    if not unique_lookups:
+        return {}
+
+    # Connect to the cache before fanning out to worker threads
+    get_price_cache()
+
+    workers = min(max_workers, len(unique_lookups))
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        prices = executor.map(
+            lambda lookup: get_spot_price(*lookup), unique_lookups
+        )
+        return dict(zip(unique_lookups, prices))
@@ -12,7 +12,7 @@ class RobinhoodColumns(Enum):
     PROCEEDS = 4
 
 
-@dataclass
+@dataclass(slots=True)
 class RobinhoodTransaction:
     """A dataclass representing a Robinhood 1099 transaction."""
 
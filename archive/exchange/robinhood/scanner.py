@@ -4,17 +4,19 @@ from archive.exchange.robinhood.models import (
     RobinhoodColumns,
     RobinhoodTransaction,
 )
-from archive.tools.io import read_csv
+from archive.tools.io import iter_csv
 
 
 def scan_robinhood(
     filepath: str | Path,
 ) -> list[RobinhoodTransaction]:
     transactions = []
-    csv_table = read_csv(filepath)
+    csv_rows = iter_csv(filepath)
 
     # Exclude header from conversion process
-    for csv_row in csv_table[1:]:
+    next(csv_rows, None)
+
+    for csv_row in csv_rows:
         transaction = RobinhoodTransaction(
             asset_name=csv_row[RobinhoodColumns.ASSET_NAME.value],
             received_date=csv_row[RobinhoodColumns.RECEIVED_DATE.value],
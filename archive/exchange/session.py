@@ -0,0 +1,87 @@
+from os import getenv
+from threading import Lock
+from typing import Optional
+
+from dotenv import load_dotenv
+from requests import Session
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from archive.exchange import __agent__, __source__, __version__
+
+load_dotenv()
+
+# Timeout value for HTTP requests in seconds.
+__timeout__: int = 30
+
+# Number of times a failed request is retried before giving up.
+__retries__: int = int(getenv("HTTP_RETRIES") or 3)
+
+# Exponential backoff factor between retries in seconds, e.g. 0.5, 1.0, 2.0.
+__backoff__: float = float(getenv("HTTP_BACKOFF") or 0.5)
+
+# Maximum number of pooled keep-alive connections per host.
+__pool__: int = int(getenv("HTTP_POOL_SIZE") or 8)
+
+# Status codes that are safe to retry: rate limited or server side errors.
+__status__: tuple[int, ...] = (429, 500, 502, 503, 504)
+
+# Lazily created session shared by every exchange API module.
+_session: Optional[Session] = None
+_session_lock = Lock()
+
+
+def create_session(
+    retries: int = __retries__,
+    backoff_factor: float = __backoff__,
+    pool_maxsize: int = __pool__,
+) -> Session:
+    """Create an HTTP session with connection pooling and retries.
+
+    Only idempotent requests are retried, so orders are never posted twice.
+    A `Retry-After` header sent with a 429 response is respected.
+
+    Args:
+        retries: The number of times a failed request is retried.
+        backoff_factor: The exponential backoff factor between retries.
+        pool_maxsize: The maximum number of connections kept open per host.
+
+    Returns:
+        A configured requests Session.
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=__status__,
+        allowed_methods=frozenset(["GET", "HEAD", "OPTIONS"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+
+    adapter = HTTPAdapter(
+        max_retries=retry,
+        pool_maxsize=pool_maxsize,
+        pool_block=True,
+    )
+
+    session = Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["User-Agent"] = f"{__agent__}/{__version__} {__source__}"
+
+    return session
+
+
+def get_session() -> Session:
+    """Return the shared HTTP session, creating it on first use.
+
+    Returns:
+        The requests Session shared by every exchange API module.
+    """
+    global _session
+
+    with _session_lock:
+        if _session is None:
+            _session = create_session()
+
+    return _session
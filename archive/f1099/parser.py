@@ -1,6 +1,7 @@
 from archive.exchange.robinhood.models import RobinhoodTransaction
 from archive.f8949.models import F8949Transaction
 from archive.f8949.parser import calculate_gain_or_loss
+from archive.tools.timestamp import parse_optional_timestamp
 
 
 def convert_robinhood_to_f8949_transactions(
@@ -17,6 +18,8 @@ def convert_robinhood_to_f8949_transactions(
             date_sold=transaction.date_sold,
             proceeds=transaction.proceeds,
             cost_or_other_basis=transaction.cost_basis,
+            acquired_at=parse_optional_timestamp(transaction.received_date),
+            sold_at=parse_optional_timestamp(transaction.date_sold),
         )
 
         f8949_transaction = calculate_gain_or_loss(f8949_transaction)
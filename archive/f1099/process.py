@@ -10,6 +10,10 @@ from archive.f8949.parser import filter_transactions_by_date, format_datetime
 from archive.f8949.scanner import get_f8949_csv_table
 from archive.tools.io import print_csv, write_csv
 from archive.tools.sort import sort_csv
+from archive.warehouse.store import (
+    is_warehouse_enabled,
+    query_f8949_transactions,
+)
 
 
 def process_f1099(
@@ -33,7 +37,14 @@ def process_f1099(
     )
 
     # Step 3: Scan the existing Form 8949 file
-    existing_f8949_transactions = scan_form_8949(form8949_filepath)
+    existing_f8949_transactions = (
+        query_f8949_transactions(form8949_filepath)
+        if is_warehouse_enabled()
+        else None
+    )
+
+    if existing_f8949_transactions is None:
+        existing_f8949_transactions = scan_form_8949(form8949_filepath)
 
     # Step 4: Merge the existing Form 8949 transactions with the new transactions from the Robinhood 1099
     merged_f8949_transactions = merge_f8949_transactions(
@@ -1,5 +1,7 @@
 from dataclasses import dataclass
+from datetime import datetime as dt
 from enum import Enum
+from typing import Optional
 
 
 class F8949Columns(Enum):
@@ -15,9 +17,13 @@ class F8949Columns(Enum):
     GAIN_OR_LOSS = 7
 
 
-@dataclass
+@dataclass(slots=True)
 class F8949Transaction:
-    """A dataclass representing a Form-8949 transaction."""
+    """A dataclass representing a Form-8949 transaction.
+
+    The parsed `acquired_at` and `sold_at` datetimes are set once when the
+    transaction is scanned, and are not written to the CSV files.
+    """
 
     description_of_property: str
     date_acquired: str
@@ -27,3 +33,19 @@ class F8949Transaction:
     codes: str = str()
     amount_of_adjustment: float = float()
     gain_or_loss: float = float()
+    acquired_at: Optional[dt] = None
+    sold_at: Optional[dt] = None
+
+    @property
+    def key(self) -> tuple:
+        """Identify the transaction by every value written to the CSV."""
+        return (
+            self.description_of_property,
+            self.date_acquired,
+            self.date_sold,
+            self.proceeds,
+            self.cost_or_other_basis,
+            self.codes,
+            self.amount_of_adjustment,
+            self.gain_or_loss,
+        )
@@ -1,11 +1,8 @@
-from datetime import datetime
+from datetime import datetime as dt
 from typing import Optional
 
-import iso8601
-from iso8601 import parse_date
-from iso8601.iso8601 import ParseError
-
 from archive.f8949.models import F8949Transaction
+from archive.tools.timestamp import format_timestamp, parse_timestamp
 
 
 def filter_transactions_by_date(
@@ -17,18 +14,16 @@ def filter_transactions_by_date(
     has_end = bool(end_date)
 
     if has_start:
-        start_date = parse_date(start_date)
+        start_date = parse_timestamp(start_date)
     if has_end:
-        end_date = parse_date(end_date)
+        end_date = parse_timestamp(end_date)
 
     filtered_transactions = []
 
     for transaction in transactions:
-        try:
-            date_sold = iso8601.parse_date(transaction.date_sold)
-        except (ParseError,):
-            dt = datetime.strptime(transaction.date_sold, "%m/%d/%y")
-            date_sold = dt.strftime("%Y-%m-%d")
+        date_sold = transaction.sold_at or parse_timestamp(
+            transaction.date_sold
+        )
 
         if has_start and has_end:
             if start_date <= date_sold <= end_date:
@@ -42,6 +37,58 @@ def filter_transactions_by_date(
     return filtered_transactions
 
 
+def is_long_term(acquired_at: dt, sold_at: dt) -> bool:
+    """Return True if an asset was held for more than one year.
+
+    The holding period starts the day after the asset was acquired, so an
+    asset sold on the anniversary of its acquisition is short-term. Assets
+    acquired on February 29th reach their anniversary on February 28th.
+    """
+    acquired = acquired_at.date()
+
+    try:
+        anniversary = acquired.replace(year=acquired.year + 1)
+    except ValueError:
+        anniversary = acquired.replace(year=acquired.year + 1, day=28)
+
+    return sold_at.date() > anniversary
+
+
+def filter_transactions_by_term(
+    transactions: list[F8949Transaction],
+    term: str,
+) -> list[F8949Transaction]:
+    """Keep the short-term or long-term transactions.
+
+    Transactions without a date acquired are reported as short-term.
+
+    Args:
+        transactions: The transactions to filter.
+        term: Either "short" or "long".
+
+    Returns:
+        The transactions reported in Part I or Part II of Form 8949.
+    """
+    long_term = term == "long"
+    filtered_transactions = []
+
+    for transaction in transactions:
+        acquired_at = transaction.acquired_at
+        sold_at = transaction.sold_at or parse_timestamp(transaction.date_sold)
+
+        if acquired_at is None and transaction.date_acquired:
+            acquired_at = parse_timestamp(transaction.date_acquired)
+
+        held_long = acquired_at is not None and is_long_term(
+            acquired_at, sold_at
+        )
+
+        if held_long == long_term:
+            filtered_transactions.append(transaction)
+
+    return filtered_transactions
+
+
 def format_datetime(
     transactions: list[F8949Transaction],
 ) -> list[F8949Transaction]:
@@ -50,26 +97,16 @@ def format_datetime(
         if not transaction.date_acquired:
             continue  # skip empty columns
 
-        try:
-            date_acquired = iso8601.parse_date(transaction.date_acquired)
-        except (ParseError,):
-            dt = datetime.strptime(transaction.date_acquired, "%m/%d/%y")
-            date_acquired_str = dt.strftime("%Y-%m-%d")
-            date_acquired = iso8601.parse_date(date_acquired_str)
-            transaction.date_acquired = date_acquired_str
-
-        try:
-            date_sold = iso8601.parse_date(transaction.date_sold)
-        except (ParseError,):
-            dt = datetime.strptime(transaction.date_sold, "%m/%d/%y")
-            date_sold_str = dt.strftime("%Y-%m-%d")
-            date_sold = iso8601.parse_date(date_sold_str)
-            transaction.date_sold = date_sold_str
-
-        transaction.date_sold = date_sold.strftime("%Y-%m-%d %H:%M:%S.%f")
-        transaction.date_acquired = date_acquired.strftime(
-            "%Y-%m-%d %H:%M:%S.%f"
-        )
+        # Parsed once when scanned, including Robinhood's "MM/DD/YY" dates
+        if transaction.acquired_at is None:
+            transaction.acquired_at = parse_timestamp(
+                transaction.date_acquired
+            )
+        if transaction.sold_at is None:
+            transaction.sold_at = parse_timestamp(transaction.date_sold)
+
+        transaction.date_acquired = format_timestamp(transaction.acquired_at)
+        transaction.date_sold = format_timestamp(transaction.sold_at)
 
     return transactions
 
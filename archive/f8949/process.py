@@ -3,11 +3,21 @@ from typing import Optional, Union
 
 from archive.f8949.parser import (
     filter_transactions_by_date,
+    filter_transactions_by_term,
     format_datetime,
     parse_f8949,
 )
-from archive.f8949.scanner import get_f8949_csv_table, scan_f8949_transactions
+from archive.f8949.scanner import (
+    build_f8949_transactions,
+    get_f8949_csv_table,
+    scan_f8949_transactions,
+)
 from archive.tools.io import print_csv, write_csv
+from archive.warehouse.store import (
+    is_warehouse_enabled,
+    query_gl_sells,
+    store_f8949_table,
+)
 
 
 def process_f8949(
@@ -16,14 +26,31 @@ def process_f8949(
     output_dir: Union[str, Path],
     start_date: Optional[str] = "",
     end_date: Optional[str] = "",
+    term: Optional[str] = None,
 ) -> Union[str, Path]:
     # Format user input
     label = label.lower()
 
-    scanned_transactions = scan_f8949_transactions(file_path)
+    # Only the sells are read back if the warehouse holds the GL file
+    gl_transactions = (
+        query_gl_sells(file_path) if is_warehouse_enabled() else None
+    )
+
+    if gl_transactions is not None:
+        scanned_transactions = build_f8949_transactions(gl_transactions)
+    else:
+        scanned_transactions = scan_f8949_transactions(file_path)
     filtered_transactions = filter_transactions_by_date(
         scanned_transactions, start_date, end_date
     )
+
+    # Part I and Part II of Form 8949 are filed separately
+    if term:
+        filtered_transactions = filter_transactions_by_term(
+            filtered_transactions, term
+        )
+        label = f"{label}-{term}"
+
     parsed_transactions = parse_f8949(filtered_transactions)
     formatted_transactions = format_datetime(parsed_transactions)
 
@@ -33,4 +60,7 @@ def process_f8949(
     output_file_path = Path(output_dir, f"f8949-{label}.csv")
     write_csv(output_file_path, csv_f8949_transactions)
 
+    if is_warehouse_enabled():
+        store_f8949_table(output_file_path, csv_f8949_transactions)
+
     return output_file_path
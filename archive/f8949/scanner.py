@@ -5,6 +5,7 @@ from archive.f8949.models import F8949Columns, F8949Transaction
 from archive.gl.models import GLTransaction
 from archive.gl.scanner import get_gl_transactions
 from archive.tools.io import read_csv
+from archive.tools.timestamp import parse_optional_timestamp
 
 
 def get_f8949_csv_table(
@@ -65,6 +66,12 @@ def get_f8949_transactions(
                 csv_row[F8949Columns.AMOUNT_OF_ADJUSTMENT.value]
             ),
             gain_or_loss=float(csv_row[F8949Columns.GAIN_OR_LOSS.value]),
+            acquired_at=parse_optional_timestamp(
+                csv_row[F8949Columns.DATE_ACQUIRED.value]
+            ),
+            sold_at=parse_optional_timestamp(
+                csv_row[F8949Columns.DATE_SOLD.value]
+            ),
         )
 
         transactions.append(transaction)
@@ -99,6 +106,8 @@ def build_f8949_transactions(
             date_sold=gl_transaction.date_sold,
             proceeds=gl_transaction.sales_proceeds,
             cost_or_other_basis=cost_or_other_basis,
+            acquired_at=parse_optional_timestamp(gl_transaction.date_acquired),
+            sold_at=parse_optional_timestamp(gl_transaction.date_sold),
         )
 
         transactions.append(f8949_transaction)
@@ -0,0 +1,147 @@
+import heapq
+from collections import deque
+from dataclasses import dataclass
+from itertools import count
+
+# Remaining sizes below this are rounding left over from matching, not lots.
+__epsilon__: float = 1e-12
+
+
+@dataclass(slots=True)
+class Lot:
+    """An open lot of an asset, acquired by a single buy.
+
+    Attributes:
+        date_acquired (str): The datetime the lot was bought.
+        order_size (float): The size of the lot that has not been sold yet.
+        acb_per_share (float): The cost of each share, fees included.
+    """
+
+    date_acquired: str
+    order_size: float
+    acb_per_share: float
+
+
+class LotInventory:
+    """The open lots of an asset, matched against sells in a fixed order.
+
+    Subclasses only decide which lot is sold next. The total size and cost
+    of the open lots are kept up to date as lots are added and sold.
+    """
+
+    def __init__(self):
+        self.order_size = 0.0
+        self.cost_or_other_basis = 0.0
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def push(self, lot: Lot) -> None:
+        raise NotImplementedError
+
+    def peek(self) -> Lot:
+        """Return the lot that is sold next."""
+        raise NotImplementedError
+
+    def pop(self) -> Lot:
+        """Remove the lot that is sold next."""
+        raise NotImplementedError
+
+    def add(self, lot: Lot) -> None:
+        self.push(lot)
+        self.order_size += lot.order_size
+        self.cost_or_other_basis += lot.order_size * lot.acb_per_share
+
+    def remove(
+        self, order_size: float
+    ) -> tuple[list[tuple[Lot, float]], float]:
+        """Sell a size of the asset from the open lots.
+
+        Args:
+            order_size: The size sold.
+
+        Returns:
+            Each lot the size was sold from, paired with the size sold from
+            it, and the size that could not be matched to an open lot.
+        """
+        matches = []
+
+        while order_size > __epsilon__ and len(self):
+            lot = self.peek()
+            size = min(lot.order_size, order_size)
+
+            matches.append((lot, size))
+            lot.order_size -= size
+            order_size -= size
+            self.order_size -= size
+            self.cost_or_other_basis -= size * lot.acb_per_share
+
+            if lot.order_size <= __epsilon__:
+                self.pop()
+
+        if not len(self):
+            # Clear the rounding left over from selling every lot
+            self.order_size = 0.0
+            self.cost_or_other_basis = 0.0
+
+        return matches, order_size if order_size > __epsilon__ else 0.0
+
+
+class FIFOInventory(LotInventory):
+    """Sells the lot that was acquired first."""
+
+    def __init__(self):
+        super().__init__()
+        self.lots: deque[Lot] = deque()
+
+    def __len__(self) -> int:
+        return len(self.lots)
+
+    def push(self, lot: Lot) -> None:
+        self.lots.append(lot)
+
+    def peek(self) -> Lot:
+        return self.lots[0]
+
+    def pop(self) -> Lot:
+        return self.lots.popleft()
+
+
+class LIFOInventory(FIFOInventory):
+    """Sells the lot that was acquired last."""
+
+    def peek(self) -> Lot:
+        return self.lots[-1]
+
+    def pop(self) -> Lot:
+        return self.lots.pop()
+
+
+class HIFOInventory(LotInventory):
+    """Sells the lot with the highest cost per share, the oldest on ties."""
+
+    def __init__(self):
+        super().__init__()
+        self.lots: list[tuple[float, int, Lot]] = []
+        self.sequence = count()
+
+    def __len__(self) -> int:
+        return len(self.lots)
+
+    def push(self, lot: Lot) -> None:
+        entry = (-lot.acb_per_share, next(self.sequence), lot)
+        heapq.heappush(self.lots, entry)
+
+    def peek(self) -> Lot:
+        return self.lots[0][2]
+
+    def pop(self) -> Lot:
+        return heapq.heappop(self.lots)[2]
+
+
+# Lot inventories by the accounting method they implement.
+inventories: dict[str, type[LotInventory]] = {
+    "fifo": FIFOInventory,
+    "lifo": LIFOInventory,
+    "hifo": HIFOInventory,
+}
@@ -27,7 +27,7 @@ class GLTotalColumns(Enum):
     TOTAL_GAIN_OR_LOSS = 3
 
 
-@dataclass
+@dataclass(slots=True)
 class GLTransaction:
     """A dataclass representing a Gain or Loss transaction."""
 
@@ -54,7 +54,7 @@ class GLTransaction:
         return self.transaction_type == "Buy"
 
 
-@dataclass
+@dataclass(slots=True)
 class GLTotalTransaction:
     order_size: float = float()
     cost_or_other_basis: float = float()
@@ -1,7 +1,12 @@
 import logging
+from array import array
+from itertools import groupby, repeat
+from operator import add, mul, sub, truediv
 
+from archive.gl.lots import Lot, LotInventory, inventories
 from archive.gl.models import GLTotalTransaction, GLTransaction
-from archive.tools.logger import setup_logger
+from archive.gl.table import GLTable
+from archive.tools.logger import is_tracing, setup_logger, trace
 
 logger = setup_logger(
     "parser_logger",
@@ -9,39 +14,8 @@ logger = setup_logger(
     logging.DEBUG,
 )
 
-
-def calculate_buy_cost_basis(transaction: GLTransaction) -> GLTransaction:
-    order_size = transaction.order_size
-    market_price = transaction.market_price
-    exchange_fee = transaction.exchange_fee
-    cost_basis = (order_size * market_price) + exchange_fee
-    transaction.cost_or_other_basis = cost_basis
-    return transaction
-
-
-def calculate_sell_cost_basis(transaction: GLTransaction) -> GLTransaction:
-    order_size = transaction.order_size
-    acb_per_share = transaction.acb_per_share
-    transaction.cost_or_other_basis = order_size * acb_per_share
-    return transaction
-
-
-def calculate_adjusted_cost_basis(transaction: GLTransaction) -> GLTransaction:
-    # NOTE: This is only used on the buy side of a transaction.
-    # The sell side always inherits the last calculated ACB
-    # from the last known `total_acb_per_share` which is out of
-    # the scope or capability of this function.
-    order_size = transaction.order_size
-    cost_basis = transaction.cost_or_other_basis
-    transaction.acb_per_share = cost_basis / order_size
-    return transaction
-
-
-def calculate_sales_proceeds(transaction: GLTransaction) -> GLTransaction:
-    order_size = transaction.order_size
-    market_price = transaction.market_price
-    transaction.sales_proceeds = order_size * market_price
-    return transaction
+# Cost basis methods, the average cost of every share or a lot inventory.
+methods: tuple[str, ...] = ("average", *inventories)
 
 
 def calculate_gain_or_loss(transaction: GLTransaction) -> GLTransaction:
@@ -52,35 +26,6 @@ def calculate_gain_or_loss(transaction: GLTransaction) -> GLTransaction:
     return transaction
 
 
-def calculate_total_transaction(
-    total: GLTotalTransaction,
-    block: list[GLTransaction],
-) -> GLTotalTransaction:
-    # NOTE: A block is a contiguous sequence of `GLTransactions` that
-    # have the same `transaction_type`.
-    # e.g. All transactions within a given sequence are either
-    # a "Buy" or "Sell" `transaction_type`, but not both.
-
-    if block[0].is_buy:
-        total.order_size += sum(tx.order_size for tx in block)
-        total.cost_or_other_basis += sum(
-            tx.cost_or_other_basis for tx in block
-        )
-    else:
-        total.order_size += sum(-tx.order_size for tx in block)
-        total.cost_or_other_basis += sum(
-            -tx.cost_or_other_basis for tx in block
-        )
-        total.gain_or_loss += sum(tx.gain_or_loss for tx in block)
-
-    if total.order_size != 0:
-        total.acb_per_share = total.cost_or_other_basis / total.order_size
-    else:
-        total.acb_per_share = 0
-
-    return total
-
-
 def build_total_transaction(
     total: GLTotalTransaction,
 ) -> GLTransaction:
@@ -98,70 +43,217 @@ def build_total_transaction(
     )
 
 
-def build_transaction_blocks(
-    transactions: list[GLTransaction],
-) -> list[list[GLTransaction]]:
-    transaction_blocks = []
-    current_block = []
+def build_table_blocks(table: GLTable) -> list[tuple[int, int]]:
+    """Return the (start, stop) row range of each contiguous block."""
+    blocks = []
+    start = 0
 
-    logger.debug(f"Transactions: {transactions}")
+    for _, rows in groupby(table.is_buy):
+        stop = start + sum(1 for _ in rows)
+        blocks.append((start, stop))
+        start = stop
 
-    current_transaction_type = transactions[0].is_buy
+    return blocks
 
-    logger.debug(f"Initial transaction type: {current_transaction_type}")
 
-    for transaction in transactions:
-        if transaction.is_buy != current_transaction_type:
-            transaction_blocks.append(current_block)
-            logger.debug(f"New transaction block added: {current_block}")
-            current_block = []
-            current_transaction_type = transaction.is_buy
-            logger.debug(
-                f"Transaction type switched to: {current_transaction_type}"
-            )
+def parse_gl_table(table: GLTable) -> GLTable:
+    """Calculate the cost basis, ACB and gains or losses of a GLTable.
 
-        current_block.append(transaction)
-        logger.debug(f"Transaction added to current block: {transaction}")
+    Each block of buys or sells is computed a whole column at a time. A buy
+    costs its size times its price plus its fee, and a sell inherits the
+    average cost basis per share of everything bought before it.
 
-    if current_block:
-        transaction_blocks.append(current_block)
-        logger.debug(f"Final transaction block added: {current_block}")
+    Args:
+        table: The GL rows to parse. Its columns are updated in place.
 
-    logger.debug(f"Built transaction blocks: {transaction_blocks}")
+    Returns:
+        A new GLTable with a total row following each block.
+    """
+    gl_table = GLTable()
+    total = GLTotalTransaction()
 
-    return transaction_blocks
+    # Rows are only dumped when tracing, sampled once per block
+    tracing = is_tracing(logger)
+
+    for start, stop in build_table_blocks(table):
+        size = table.order_size[start:stop]
+        price = table.market_price[start:stop]
+        fee = table.exchange_fee[start:stop]
+
+        if table.transaction_type[start] == "Buy":
+            cost = array("d", map(add, map(mul, size, price), fee))
+            acb = array("d", map(truediv, cost, size))
+        else:
+            acb = array("d", repeat(total.acb_per_share, stop - start))
+            cost = array("d", map(mul, size, acb))
+            proceeds = array("d", map(mul, size, price))
+            gain = array("d", map(sub, map(sub, proceeds, cost), fee))
+            table.sales_proceeds[start:stop] = proceeds
+            table.gain_or_loss[start:stop] = gain
+
+        table.cost_or_other_basis[start:stop] = cost
+        table.acb_per_share[start:stop] = acb
+
+        if table.transaction_type[start] == "Buy":
+            total.order_size += sum(size)
+            total.cost_or_other_basis += sum(cost)
+        else:
+            total.order_size += sum(-x for x in size)
+            total.cost_or_other_basis += sum(-x for x in cost)
+            total.gain_or_loss += sum(table.gain_or_loss[start:stop])
+
+        if total.order_size != 0:
+            total.acb_per_share = total.cost_or_other_basis / total.order_size
+        else:
+            total.acb_per_share = 0
+
+        gl_table.extend(table, start, stop)
+        gl_table.append(build_total_transaction(total))
+
+        if tracing:
+            trace(logger, "Parsed block", table.to_transactions(start, stop))
+
+    logger.debug("Parsed %d GL rows into %d rows", len(table), len(gl_table))
+
+    return gl_table
+
+
+def sell_from_lots(
+    gl_table: GLTable,
+    table: GLTable,
+    index: int,
+    inventory: LotInventory,
+) -> float:
+    """Append a row for every lot a sell is matched against.
+
+    The exchange fee is split between the rows by the size sold from each
+    lot. Any size left over once every lot is sold is appended without a
+    date acquired or a cost basis, as is a sell too small to match a lot,
+    e.g. of zero size, so that its fee is still recorded.
+
+    Returns:
+        The gain or loss of the sell.
+    """
+    order_size = table.order_size[index]
+    market_price = table.market_price[index]
+    exchange_fee = table.exchange_fee[index]
+    matches, unmatched = inventory.remove(order_size)
+
+    if unmatched:
+        logger.warning(
+            "Sold %.8f %s on %s without an open lot",
+            unmatched,
+            table.description[index],
+            table.date_sold[index],
+        )
+        matches.append((Lot("", unmatched, 0.0), unmatched))
+    elif not matches:
+        logger.warning(
+            "Sold %.8f %s on %s without a lot to match, at no cost basis",
+            order_size,
+            table.description[index],
+            table.date_sold[index],
+        )
+        matches.append((Lot("", order_size, 0.0), order_size))
+
+    gain_or_loss = 0.0
+
+    for lot, size in matches:
+        transaction = GLTransaction(
+            additional_description=table.additional_description[index],
+            description=table.description[index],
+            date_acquired=lot.date_acquired,
+            transaction_type=table.transaction_type[index],
+            order_size=size,
+            market_price=market_price,
+            exchange_fee=(
+                exchange_fee * size / order_size
+                if order_size
+                else exchange_fee
+            ),
+            cost_or_other_basis=size * lot.acb_per_share,
+            acb_per_share=lot.acb_per_share,
+            date_sold=table.date_sold[index],
+            sales_proceeds=size * market_price,
+        )
+        calculate_gain_or_loss(transaction)
+        gain_or_loss += transaction.gain_or_loss
+        gl_table.append(transaction)
 
+    return gain_or_loss
 
-def parse_gl(transactions: list[GLTransaction]) -> list[GLTransaction]:
-    gl_transactions = []
-    total = GLTotalTransaction()
-    blocks = build_transaction_blocks(transactions)
 
-    logger.debug(f"Transaction Blocks: {blocks}")
+def parse_gl_lots(table: GLTable, method: str) -> GLTable:
+    """Calculate the cost basis and gains or losses of a GLTable by lot.
 
-    for block in blocks:
-        processed_transactions = []
+    Every buy opens a lot and every sell is matched against the open lots in
+    the order of the method, so each sold share keeps the date and cost of
+    the lot it was acquired in. A sell is split into a row per lot it was
+    matched against.
 
-        for transaction in block:
-            if transaction.is_buy:
-                transaction = calculate_buy_cost_basis(transaction)
-                transaction = calculate_adjusted_cost_basis(transaction)
-            else:
-                transaction.acb_per_share = total.acb_per_share
-                transaction = calculate_sell_cost_basis(transaction)
-                transaction = calculate_sales_proceeds(transaction)
-                transaction = calculate_gain_or_loss(transaction)
+    Args:
+        table: The GL rows to parse. Its columns are updated in place.
+        method: One of "fifo", "lifo" or "hifo".
 
-            processed_transactions.append(transaction)
+    Returns:
+        A new GLTable with a total row following each block.
+    """
+    inventory = inventories[method]()
+    gl_table = GLTable()
+    total = GLTotalTransaction()
 
-        logger.debug(f"Processed Transactions: {processed_transactions}")
+    # Rows are only dumped when tracing, sampled once per block
+    tracing = is_tracing(logger)
+
+    for start, stop in build_table_blocks(table):
+        first = len(gl_table)
+
+        if table.transaction_type[start] == "Buy":
+            for index in range(start, stop):
+                size = table.order_size[index]
+                cost = size * table.market_price[index]
+                cost += table.exchange_fee[index]
+                acb = cost / size
+                table.cost_or_other_basis[index] = cost
+                table.acb_per_share[index] = acb
+                inventory.add(Lot(table.date_acquired[index], size, acb))
+
+            gl_table.extend(table, start, stop)
+        else:
+            for index in range(start, stop):
+                total.gain_or_loss += sell_from_lots(
+                    gl_table, table, index, inventory
+                )
+
+        total.order_size = inventory.order_size
+        total.cost_or_other_basis = inventory.cost_or_other_basis
+
+        if total.order_size != 0:
+            total.acb_per_share = total.cost_or_other_basis / total.order_size
+        else:
+            total.acb_per_share = 0
+
+        gl_table.append(build_total_transaction(total))
+
+        if tracing:
+            trace(logger, "Parsed block", gl_table.to_transactions(first))
+
+    logger.debug(
+        "Parsed %d GL rows into %d rows by %s",
+        len(table),
+        len(gl_table),
+        method,
+    )
 
-        total = calculate_total_transaction(total, block)
-        total_transaction = build_total_transaction(total)
+    return gl_table
+
+
+def parse_gl(transactions: list[GLTransaction]) -> list[GLTransaction]:
+    if not transactions:
+        return []
 
-        gl_transactions.extend(processed_transactions)
-        gl_transactions.append(total_transaction)
+    table = parse_gl_table(GLTable.from_transactions(transactions))
 
-    logger.debug(f"Final GL Transactions: {gl_transactions}")
+    logger.debug("Final GL Transactions: %d", len(table))
 
-    return gl_transactions
+    return table.to_transactions()
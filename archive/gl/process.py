@@ -1,41 +1,85 @@
 import logging
+from os import scandir
 from pathlib import Path
-from typing import Union
-
-import iso8601
+from typing import Any, Callable, Optional, Union
 
 from archive.gl.models import GLTransaction
-from archive.gl.parser import parse_gl
-from archive.gl.scanner import get_gl_csv_table, scan_gl_transactions
+from archive.gl.parser import parse_gl_lots, parse_gl_table
+from archive.gl.scanner import (
+    get_gl_csv_table,
+    query_gl_transactions_by_asset,
+    scan_gl_transactions,
+    scan_gl_transactions_by_asset,
+)
+from archive.gl.table import GLTable
 from archive.tools.io import print_csv, write_csv
+from archive.tools.jobs import run_jobs
 from archive.tools.logger import setup_logger
+from archive.tools.manifest import hash_file, read_manifest, write_manifest
+from archive.warehouse.store import is_warehouse_enabled, store_gl_table
 
 logger = setup_logger(
-    "parser_logger",
+    "process_gl_logger",
     "data/log/process_gl.log",
     logging.DEBUG,
 )
 
 
-def format_transactions(
-    transactions: list[GLTransaction],
-) -> list[GLTransaction]:
-    for transaction in transactions:
-        if bool(transaction.date_acquired):
-            date_acquired = iso8601.parse_date(transaction.date_acquired)
-            transaction.date_acquired = date_acquired.strftime(
-                "%Y-%m-%d %H:%M:%S.%f"
-            )
+def format_gl_table(table: GLTable) -> GLTable:
+    # NOTE: Dates were already normalised when the IR files were scanned
+    # Transaction types repeat, so each is only formatted once
+    transaction_types = {
+        value: value.capitalize() for value in set(table.transaction_type)
+    }
+    table.transaction_type = [
+        transaction_types[value] for value in table.transaction_type
+    ]
+
+    return table
+
+
+def get_gl_inputs(directory: Union[str, Path]) -> dict[str, str]:
+    """Hash every IR file in the directory that GL transactions are built from.
 
-        if bool(transaction.date_sold):
-            date_sold = iso8601.parse_date(transaction.date_sold)
-            transaction.date_sold = date_sold.strftime("%Y-%m-%d %H:%M:%S.%f")
+    Args:
+        directory: The directory containing the IR CSV files.
 
-        if bool(transaction.transaction_type):
-            transaction_type = transaction.transaction_type.capitalize()
-            transaction.transaction_type = transaction_type
+    Returns:
+        A mapping of IR file names to their content hashes.
+    """
+    return {
+        entry.name: hash_file(entry.path)
+        for entry in sorted(scandir(directory), key=lambda entry: entry.name)
+        if entry.is_file() and entry.name.endswith(".csv")
+    }
 
-    return transactions
+
+def is_gl_unchanged(
+    entry: Optional[dict[str, Any]],
+    asset: str,
+    inputs: dict[str, str],
+    output_file_path: Union[str, Path],
+    method: str = "average",
+) -> bool:
+    """Return True if a GL output was built from the current IR files.
+
+    Args:
+        entry: The manifest entry of the GL output.
+        asset: The base asset the output is built for.
+        inputs: The current IR file hashes.
+        output_file_path: The path to the GL output.
+        method: The cost basis method the output is built with.
+
+    Returns:
+        True if the output can be reused, else False.
+    """
+    return (
+        entry is not None
+        and entry.get("asset") == asset
+        and entry.get("inputs") == inputs
+        and entry.get("method", "average") == method
+        and Path(output_file_path).exists()
+    )
 
 
 def process_gl(
@@ -43,12 +87,30 @@ def process_gl(
     label: str,
     directory: Union[str, Path],
     output_dir: Union[str, Path],
+    rebuild: bool = False,
+    method: str = "average",
 ) -> Union[str, Path]:
     # Format user input
     asset = asset.upper()
     label = label.lower()
 
-    gl_transactions = scan_gl_transactions(asset, directory)
+    # Reuse the output if none of the IR files have changed
+    inputs = get_gl_inputs(directory)
+    manifest = read_manifest(output_dir)
+    output_file_path = Path(output_dir, f"gl-{label}.csv")
+    entry = manifest.get(output_file_path.name)
+
+    if not rebuild and is_gl_unchanged(
+        entry, asset, inputs, output_file_path, method
+    ):
+        logger.debug(f"GL: Skipping unchanged {asset} for {label}")
+        return output_file_path
+
+    if is_warehouse_enabled():
+        tables = query_gl_transactions_by_asset(directory, [asset])
+        gl_transactions = tables.get(asset)
+    else:
+        gl_transactions = scan_gl_transactions(asset, directory)
 
     if not gl_transactions:
         logger.debug(
@@ -56,13 +118,146 @@ def process_gl(
         )
         return ""
 
-    gl_transactions = format_transactions(gl_transactions)
-    gl_transactions = parse_gl(gl_transactions)
+    output_file_path = export_gl_transactions(
+        gl_transactions, label, output_dir, method
+    )
+
+    manifest[output_file_path.name] = {
+        "asset": asset,
+        "inputs": inputs,
+        "method": method,
+    }
+    write_manifest(output_dir, manifest)
+
+    return output_file_path
+
+
+def export_gl_transactions(
+    gl_transactions: Union[list[GLTransaction], GLTable],
+    label: str,
+    output_dir: Union[str, Path],
+    method: str = "average",
+) -> Union[str, Path]:
+    if not isinstance(gl_transactions, GLTable):
+        gl_transactions = GLTable.from_transactions(gl_transactions)
+
+    gl_table = format_gl_table(gl_transactions)
+
+    if method == "average":
+        gl_table = parse_gl_table(gl_table)
+    else:
+        gl_table = parse_gl_lots(gl_table, method)
 
-    csv_gl_transactions = get_gl_csv_table(gl_transactions)
+    csv_gl_transactions = get_gl_csv_table(gl_table)
     print_csv(csv_gl_transactions, width=320)
 
     output_file_path = Path(output_dir, f"gl-{label}.csv")
     write_csv(output_file_path, csv_gl_transactions)
 
+    if is_warehouse_enabled():
+        store_gl_table(output_file_path, csv_gl_transactions)
+
     return output_file_path
+
+
+def process_gl_assets(
+    assets: dict[str, str],
+    directory: Union[str, Path],
+    output_dir: Union[str, Path],
+    rebuild: bool = False,
+    method: str = "average",
+    jobs: int = 1,
+    failures: Optional[dict[str, Exception]] = None,
+    initializer: Optional[Callable[..., Any]] = None,
+    initargs: tuple = (),
+) -> dict[str, Union[str, Path]]:
+    """Scan the IR directory once and write a GL file for every asset.
+
+    GL files recorded in the manifest are reused while the IR files they were
+    built from are unchanged. The IR files are scanned in this process, and
+    only the manifest of this process is written, so assets can be parsed by
+    parallel workers.
+
+    Args:
+        assets: A mapping of base asset symbols to output labels.
+        directory: The directory containing the IR CSV files.
+        output_dir: The output directory path for the GL files.
+        rebuild: Ignore the manifest and rebuild every GL file.
+        method: The cost basis method, "average", "fifo", "lifo" or "hifo".
+        jobs: The number of worker processes the assets are parsed by.
+        failures: Collects the exception of every asset that failed. If it
+            is not given, the first failure is raised once the manifest of
+            the other assets has been written.
+        initializer: Called at the start of each worker process to restore
+            the settings of this process, as in `run_jobs`.
+        initargs: The arguments of the initializer.
+
+    Returns:
+        A mapping of base asset symbols to the GL files that were written.
+    """
+    # Format user input
+    assets = {asset.upper(): label.lower() for asset, label in assets.items()}
+
+    inputs = get_gl_inputs(directory)
+    manifest = read_manifest(output_dir)
+    output_file_paths: dict[str, Union[str, Path]] = {}
+    pending = {}
+
+    # Reuse the outputs whose IR files have not changed
+    for asset, label in assets.items():
+        output_file_path = Path(output_dir, f"gl-{label}.csv")
+        entry = manifest.get(output_file_path.name)
+
+        if not rebuild and is_gl_unchanged(
+            entry, asset, inputs, output_file_path, method
+        ):
+            logger.debug(f"GL: Skipping unchanged {asset} for {label}")
+            output_file_paths[asset] = output_file_path
+        else:
+            pending[asset] = label
+
+    if not pending:
+        return output_file_paths
+
+    if is_warehouse_enabled():
+        partitions = query_gl_transactions_by_asset(directory, list(pending))
+    else:
+        partitions = scan_gl_transactions_by_asset(directory, list(pending))
+    tasks = {}
+
+    for asset, label in pending.items():
+        gl_transactions = partitions.get(asset)
+
+        if not gl_transactions:
+            logger.debug(
+                f"GLTransaction Error: Failed to process {asset} for {label} using {directory}"
+            )
+            continue
+
+        tasks[asset] = (gl_transactions, label, output_dir, method)
+
+    results, errors = run_jobs(
+        export_gl_transactions, tasks, jobs, initializer, initargs
+    )
+
+    for asset, output_file_path in results.items():
+        output_file_paths[asset] = output_file_path
+        manifest[Path(output_file_path).name] = {
+            "asset": asset,
+            "inputs": inputs,
+            "method": method,
+        }
+
+    write_manifest(output_dir, manifest)
+
+    if failures is not None:
+        failures.update(errors)
+    elif errors:
+        raise next(iter(errors.values()))
+
+    # Keep the order the assets were requested in
+    return {
+        asset: output_file_paths[asset]
+        for asset in assets
+        if asset in output_file_paths
+    }
@@ -1,11 +1,19 @@
 import logging
+from operator import attrgetter
 from pathlib import Path
-from typing import Union
+from typing import Iterable, Optional, Union
 
 from archive.gl.models import GLColumns, GLTransaction
-from archive.ir.builder import build_ir_transactions, scan_ir_transactions
+from archive.gl.table import GLTable
+from archive.ir.builder import (
+    iter_ir_table,
+    iter_ir_transactions,
+    partition_ir_transactions,
+)
 from archive.ir.models import IRTransaction
-from archive.tools.logger import setup_logger
+from archive.tools.dedupe import iter_unique, report_duplicates
+from archive.tools.logger import setup_logger, trace
+from archive.warehouse.store import query_ir_transactions, sync_ir_directory
 
 logger = setup_logger(
     "scanner_logger",
@@ -15,9 +23,10 @@ logger = setup_logger(
 
 
 def get_gl_csv_table(
-    transactions: list[GLTransaction],
+    transactions: Union[list[GLTransaction], GLTable],
 ) -> list[list[str]]:
-    body = []
+    if not isinstance(transactions, GLTable):
+        transactions = GLTable.from_transactions(transactions)
 
     # include the header in the conversion process
     header = [
@@ -38,26 +47,24 @@ def get_gl_csv_table(
         ]
     ]
 
-    for row in transactions:
-        transaction = [
-            row.additional_description,
-            row.description,
-            row.date_acquired,
-            row.transaction_type,
-            f"{row.order_size:.8f}",
-            f"{row.market_price:.2f}",
-            f"{row.exchange_fee:.2f}",
-            f"{row.cost_or_other_basis:.2f}",
-            f"{row.acb_per_share:.2f}",
-            row.date_sold,
-            f"{row.sales_proceeds:.2f}",
-            f"{row.gain_or_loss:.2f}",
-            row.order_note,
-        ]
-
-        body.append(transaction)
-
-    return header + body
+    # Format each column at once and stitch the rows back together
+    body = zip(
+        transactions.additional_description,
+        transactions.description,
+        transactions.date_acquired,
+        transactions.transaction_type,
+        map("{:.8f}".format, transactions.order_size),
+        map("{:.2f}".format, transactions.market_price),
+        map("{:.2f}".format, transactions.exchange_fee),
+        map("{:.2f}".format, transactions.cost_or_other_basis),
+        map("{:.2f}".format, transactions.acb_per_share),
+        transactions.date_sold,
+        map("{:.2f}".format, transactions.sales_proceeds),
+        map("{:.2f}".format, transactions.gain_or_loss),
+        transactions.order_note,
+    )
+
+    return header + [list(row) for row in body]
 
 
 def get_gl_transactions(
@@ -132,48 +139,113 @@ def build_gl_transactions(
 
 
 def remove_duplicate_transactions(
-    transactions: list[IRTransaction],
+    transactions: Iterable[IRTransaction],
+    sorted_by_datetime: bool = False,
 ) -> list[IRTransaction]:
-    seen = set()
-    filtered_transactions = []
-
-    for transaction in transactions:
-        transaction_hash = hash(
-            (
-                transaction.datetime,
-                transaction.transaction_type,
-                transaction.product,
-                transaction.order_size,
-                transaction.market_price,
-                transaction.order_fee,
-                transaction.exchange,
-            )
+    """Drop transactions that appear in more than one IR file.
+
+    Args:
+        transactions: The IR transactions, possibly read lazily.
+        sorted_by_datetime: True if the transactions are in datetime order,
+            e.g. merged by `iter_ir_table`. Duplicates always share their
+            datetime, so only the keys of the current datetime are kept.
+
+    Returns:
+        The first occurrence of every transaction, in order.
+    """
+    duplicates: list[IRTransaction] = []
+    unique_transactions = list(
+        iter_unique(
+            transactions,
+            attrgetter("key"),
+            duplicates,
+            attrgetter("datetime") if sorted_by_datetime else None,
         )
+    )
 
-        if transaction_hash not in seen:
-            seen.add(transaction_hash)
-            filtered_transactions.append(transaction)
+    report_duplicates(logger, "IR transactions", duplicates)
 
-    return filtered_transactions
+    return unique_transactions
 
 
 def scan_gl_transactions(
     asset: str, directory: Union[str, Path]
 ) -> list[GLTransaction]:
-    logger.debug(f"Asset: {asset}")
-    logger.debug(f"Directory: {directory}")
-    csv_table = scan_ir_transactions(directory)
-    logger.debug(f"CSV Table: {csv_table}")
+    logger.debug("Asset: %s", asset)
+    logger.debug("Directory: %s", directory)
+    # Stream the sorted IR files instead of reading them into one table
+    transactions = remove_duplicate_transactions(
+        iter_ir_transactions(iter_ir_table(directory)),
+        sorted_by_datetime=True,
+    )
+    trace(logger, "Unique Transactions", transactions)
+
+    # Match the base asset exactly, as `scan_gl_transactions_by_asset` does,
+    # so "ETH" does not take in "ETHW-USD"
+    filtered_transactions = [tx for tx in transactions if tx.asset == asset]
+    trace(logger, "Filtered Transactions", filtered_transactions)
 
-    transactions = build_ir_transactions(csv_table)
-    logger.debug(f"IR Transactions: {transactions}")
+    return build_gl_transactions(filtered_transactions)
 
-    transactions = remove_duplicate_transactions(transactions)
-    logger.debug(f"Unique Transactions: {transactions}")
 
-    filtered_transactions = [
-        tx for tx in transactions if tx.product.startswith(asset)
-    ]
-    logger.debug(f"Filtered Transactions: {filtered_transactions}")
+def scan_gl_transactions_by_asset(
+    directory: Union[str, Path],
+    assets: Optional[list[str]] = None,
+) -> dict[str, GLTable]:
+    """Scan the IR directory once and build GL transactions for each asset.
+
+    Args:
+        directory: The directory containing the IR CSV files.
+        assets: The base assets to build, or None to build every asset.
+
+    Returns:
+        A dictionary mapping each base asset to a GLTable of its transactions.
+    """
+    logger.debug("Assets: %s", assets)
+    logger.debug("Directory: %s", directory)
+    transactions = remove_duplicate_transactions(
+        iter_ir_transactions(iter_ir_table(directory)),
+        sorted_by_datetime=True,
+    )
+    logger.debug("Unique Transactions: %d", len(transactions))
+    trace(logger, "Unique Transactions", transactions)
+
+    return {
+        asset: GLTable.from_ir_transactions(partition)
+        for asset, partition in partition_ir_transactions(transactions).items()
+        if assets is None or asset in assets
+    }
+
+
+def query_gl_transactions_by_asset(
+    directory: Union[str, Path],
+    assets: list[str],
+) -> dict[str, GLTable]:
+    """Build GL transactions for each asset from the rows in the warehouse.
+
+    IR files that changed since they were last stored are loaded first, then
+    only the rows of the requested assets are read back, in the same order
+    as `scan_gl_transactions_by_asset`.
+
+    Args:
+        directory: The directory containing the IR CSV files.
+        assets: The base assets to build.
+
+    Returns:
+        A dictionary mapping each base asset to a GLTable of its transactions.
+    """
+    logger.debug("Assets: %s", assets)
+    logger.debug("Directory: %s", directory)
+    sync_ir_directory(directory)
+    tables = {}
+
+    for asset in assets:
+        transactions = remove_duplicate_transactions(
+            query_ir_transactions(asset),
+            sorted_by_datetime=True,
+        )
 
-    return build_gl_transactions(filtered_transactions)
+        if transactions:
+            tables[asset] = GLTable.from_ir_transactions(transactions)
+
+    return tables
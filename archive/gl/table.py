@@ -0,0 +1,123 @@
+from array import array
+from dataclasses import dataclass, field, fields
+from sys import intern
+from typing import Optional
+
+from archive.gl.models import GLTransaction
+from archive.ir.models import IRTransaction
+
+
+def _floats() -> array:
+    return array("d")
+
+
+@dataclass(slots=True)
+class GLTable:
+    """A columnar store of Gain or Loss transactions.
+
+    Numeric columns are backed by typed arrays of doubles and repeated
+    strings, such as the exchange and product, are interned. Each row takes a
+    fraction of the memory of a `GLTransaction` and whole columns can be
+    computed at once.
+    """
+
+    additional_description: list[str] = field(default_factory=list)
+    description: list[str] = field(default_factory=list)
+    date_acquired: list[str] = field(default_factory=list)
+    transaction_type: list[str] = field(default_factory=list)
+    order_size: array = field(default_factory=_floats)
+    market_price: array = field(default_factory=_floats)
+    exchange_fee: array = field(default_factory=_floats)
+    cost_or_other_basis: array = field(default_factory=_floats)
+    acb_per_share: array = field(default_factory=_floats)
+    date_sold: list[str] = field(default_factory=list)
+    sales_proceeds: array = field(default_factory=_floats)
+    gain_or_loss: array = field(default_factory=_floats)
+    order_note: list[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.transaction_type)
+
+    @property
+    def is_buy(self) -> list[bool]:
+        return [tx_type == "Buy" for tx_type in self.transaction_type]
+
+    def append(self, transaction: GLTransaction) -> None:
+        """Append a single row to every column."""
+        for column in __columns__:
+            getattr(self, column).append(getattr(transaction, column))
+
+    def extend(self, table: "GLTable", start: int, stop: int) -> None:
+        """Append the rows `start` to `stop` of another table."""
+        for column in __columns__:
+            getattr(self, column).extend(getattr(table, column)[start:stop])
+
+    @classmethod
+    def from_transactions(
+        cls,
+        transactions: list[GLTransaction],
+    ) -> "GLTable":
+        table = cls()
+
+        for transaction in transactions:
+            table.append(transaction)
+
+        return table
+
+    @classmethod
+    def from_ir_transactions(
+        cls,
+        ir_transactions: list[IRTransaction],
+    ) -> "GLTable":
+        """Build GL rows from IR transactions.
+
+        Sells inherit the date the last buy was acquired on, in the same way
+        as `archive.gl.scanner.build_gl_transactions`.
+        """
+        table = cls()
+        last_acquired = ""
+
+        for ir_transaction in ir_transactions:
+            if ir_transaction.is_buy:
+                last_acquired = ir_transaction.datetime
+                date_acquired, date_sold = last_acquired, ""
+                order_note = ir_transaction.order_note
+            else:
+                date_acquired, date_sold = (
+                    last_acquired,
+                    ir_transaction.datetime,
+                )
+                order_note = ""
+
+            table.additional_description.append(
+                intern(ir_transaction.exchange)
+            )
+            table.description.append(intern(ir_transaction.product))
+            table.date_acquired.append(date_acquired)
+            table.transaction_type.append(
+                intern(ir_transaction.transaction_type)
+            )
+            table.order_size.append(ir_transaction.order_size)
+            table.market_price.append(ir_transaction.market_price)
+            table.exchange_fee.append(ir_transaction.order_fee)
+            table.cost_or_other_basis.append(0.0)
+            table.acb_per_share.append(0.0)
+            table.date_sold.append(date_sold)
+            table.sales_proceeds.append(0.0)
+            table.gain_or_loss.append(0.0)
+            table.order_note.append(order_note)
+
+        return table
+
+    def to_transactions(
+        self,
+        start: int = 0,
+        stop: Optional[int] = None,
+    ) -> list[GLTransaction]:
+        """Return the rows `start` to `stop` as GLTransaction's."""
+        columns = [getattr(self, column)[start:stop] for column in __columns__]
+        return [GLTransaction(*row) for row in zip(*columns)]
+
+
+# Column names, resolved once rather than on every row.
+__columns__: tuple[str, ...] = tuple(column.name for column in fields(GLTable))
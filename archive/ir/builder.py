@@ -1,8 +1,11 @@
+import heapq
 from os import scandir
 from pathlib import Path
+from typing import Iterable, Iterator
 
 from archive.ir.models import IRColumn, IRTransaction
-from archive.tools.io import read_csv
+from archive.tools.io import iter_csv
+from archive.tools.timestamp import format_timestamp, parse_timestamp
 
 
 def build_ir_csv_table(
@@ -20,6 +23,7 @@ def build_ir_csv_table(
             "Market Price",
             "Order Fee",
             "Order Note",
+            "Trade ID",
         ]
     ]
 
@@ -33,6 +37,7 @@ def build_ir_csv_table(
             f"{float(transaction.market_price):.8f}",
             f"{float(transaction.order_fee):.8f}",
             transaction.order_note,
+            transaction.trade_id,
         ]
 
         body.append(tx)
@@ -40,43 +45,145 @@ def build_ir_csv_table(
     return header + body
 
 
-def build_ir_transactions(csv_table: list[list[str]]) -> list[IRTransaction]:
-    transactions = []
+def iter_ir_transactions(
+    csv_table: Iterable[list[str]],
+) -> Iterator[IRTransaction]:
+    """Lazily convert the rows of an IR table to IRTransaction's.
 
-    for row in csv_table[1:]:  # Skip the header row
+    Args:
+        csv_table: The IR table, header included.
+
+    Yields:
+        An IRTransaction for every row.
+    """
+    rows = iter(csv_table)
+
+    next(rows, None)  # Skip the header row
+
+    for row in rows:
+        # Parse once, GL rows reuse the normalised datetime
+        timestamp = parse_timestamp(row[IRColumn.DATETIME.value])
         transaction = IRTransaction(
             exchange=row[IRColumn.EXCHANGE.value],
             product=row[IRColumn.PRODUCT.value],
-            datetime=row[IRColumn.DATETIME.value],
+            datetime=format_timestamp(timestamp),
             transaction_type=row[IRColumn.TRANSACTION_TYPE.value],
             order_size=float(row[IRColumn.ORDER_SIZE.value]),
             market_price=float(row[IRColumn.MARKET_PRICE.value]),
             order_fee=float(row[IRColumn.ORDER_FEE.value]),
             order_note=row[IRColumn.ORDER_NOTE.value],
+            # NOTE: IR files written before trade IDs were kept lack them
+            trade_id=(
+                row[IRColumn.TRADE_ID.value]
+                if len(row) > IRColumn.TRADE_ID.value
+                else ""
+            ),
+            timestamp=timestamp,
         )
 
-        transactions.append(transaction)
+        yield transaction
 
-    return transactions
 
+def build_ir_transactions(
+    csv_table: Iterable[list[str]],
+) -> list[IRTransaction]:
+    return list(iter_ir_transactions(csv_table))
 
-def scan_ir_transactions(directory: str | Path) -> list[list[str]]:
-    header: list[list[str]] = []
-    body: list[list[str]] = []
 
-    for entry in scandir(directory):
-        if entry.is_file:
-            csv_table = read_csv(entry.path)
+def partition_ir_transactions(
+    transactions: list[IRTransaction],
+) -> dict[str, list[IRTransaction]]:
+    """Partition IR transactions by their base asset, preserving order.
+
+    Args:
+        transactions: A list of IRTransaction's.
+
+    Returns:
+        A dictionary mapping each base asset to its IRTransaction's.
+    """
+    partitions: dict[str, list[IRTransaction]] = {}
+
+    for transaction in transactions:
+        partitions.setdefault(transaction.asset, []).append(transaction)
+
+    return partitions
+
+
+def iter_ir_rows(
+    file_path: str | Path,
+    rows: Iterator[list[str]],
+) -> Iterator[list[str]]:
+    """Yield the rows of an IR file, checking they are sorted by datetime.
+
+    Args:
+        file_path: The path to the IR file, used in the error message.
+        rows: The rows of the IR file, without its header.
+
+    Yields:
+        Every non-empty row.
+
+    Raises:
+        ValueError: If a row is older than the row before it.
+    """
+    previous = ""
+
+    for row in rows:
+        # NOTE: Trailing spaces and newlines at EOF can cause empty lists
+        if not row:
+            continue
+
+        datetime = row[IRColumn.DATETIME.value]
+
+        if datetime < previous:
+            raise ValueError(
+                f"IR: {file_path} is not sorted by datetime. "
+                "Rebuild it with --rebuild."
+            )
+
+        previous = datetime
+        yield row
+
+
+def iter_ir_table(directory: str | Path) -> Iterator[list[str]]:
+    """Lazily merge every IR file in a directory into a single sorted table.
+
+    `process_ir` writes every IR file sorted by datetime, so the files are
+    merged as streams rather than read into memory and sorted again. Rows
+    with the same datetime keep the order of their files and of the rows
+    within them, as they would with a stable sort.
+
+    Args:
+        directory: The directory containing the IR CSV files.
+
+    Yields:
+        The header of the first IR file, then every row in datetime order.
+    """
+    header: list[str] = []
+    streams: list[Iterator[list[str]]] = []
+
+    # Sorted by name, so rows with the same datetime merge in a stable order
+    for entry in sorted(scandir(directory), key=lambda entry: entry.name):
+        # Skip the manifest and anything else that isn't an IR file
+        if entry.is_file() and entry.name.endswith(".csv"):
+            rows = iter_csv(entry.path)
+            file_header = next(rows, None)
+
+            if file_header is None:
+                continue
 
             if not header:
-                header = [csv_table[0]]
+                header = file_header
 
-            # NOTE: Trailing spaces and newlines at EOF can cause empty lists
-            # to be added to the body. We check if the list is valid first to
-            # avoid this issue.
-            if csv_table[1:]:
-                body.extend(csv_table[1:])
+            streams.append(iter_ir_rows(entry.path, rows))
 
-    sorted_table = sorted(body, key=lambda row: row[IRColumn.DATETIME.value])
+    if not header:
+        return
 
-    return header + sorted_table
+    yield header
+    yield from heapq.merge(
+        *streams, key=lambda row: row[IRColumn.DATETIME.value]
+    )
+
+
+def scan_ir_transactions(directory: str | Path) -> list[list[str]]:
+    return list(iter_ir_table(directory))
@@ -18,70 +18,87 @@ from archive.ir.models import IRTransaction
 
 
 class BaseParser(ABC):
-    @abstractmethod
+    # Bump whenever a change to the parser alters its IR output, so the
+    # incremental build regenerates files written by older versions.
+    version: int = 2
+
+    # True if rows appended to an export can be parsed on their own.
+    appendable: bool = True
+
     def parse(
         self,
         filepath: Union[str, Path],
         asset: str,
+    ) -> list[IRTransaction]:
+        return self.parse_assets(filepath, [asset])
+
+    @abstractmethod
+    def parse_assets(
+        self,
+        filepath: Union[str, Path],
+        assets: list[str],
     ) -> list[IRTransaction]:
         raise NotImplementedError()
 
 
 class Coinbase(BaseParser):
-    def parse(
+    def parse_assets(
         self,
         filepath: Union[str, Path],
-        asset: str,
+        assets: list[str],
     ) -> list[IRTransaction]:
         transactions = scan_coinbase_transactions(filepath)
-        return build_coinbase_ir(transactions, [asset])
+        return build_coinbase_ir(transactions, assets)
 
 
 class CoinbaseProFill(BaseParser):
-    def parse(
+    def parse_assets(
         self,
         filepath: Union[str, Path],
-        asset: str,
+        assets: list[str],
     ) -> list[IRTransaction]:
         transactions = scan_coinbase_pro_fills(filepath)
-        return build_coinbase_pro_ir(transactions, [asset])
+        return build_coinbase_pro_ir(transactions, assets)
 
 
 class CoinbaseProAccount(BaseParser):
-    def parse(
+    # Conversions span two consecutive rows, so a tail may split a pair.
+    appendable = False
+
+    def parse_assets(
         self,
         filepath: Union[str, Path],
-        asset: str,
+        assets: list[str],
     ) -> list[IRTransaction]:
         transactions = scan_coinbase_pro_accounts(filepath)
-        return build_coinbase_pro_ir(transactions, [asset])
+        return build_coinbase_pro_ir(transactions, assets)
 
 
 class KrakenTrade(BaseParser):
-    def parse(
+    def parse_assets(
         self,
         filepath: Union[str, Path],
-        asset: str,
+        assets: list[str],
     ) -> list[IRTransaction]:
         transactions = scan_kraken_trades(filepath)
-        return build_kraken_ir(transactions, [asset])
+        return build_kraken_ir(transactions, assets)
 
 
 class KrakenLedger(BaseParser):
-    def parse(
+    def parse_assets(
         self,
         filepath: Union[str, Path],
-        asset: str,
+        assets: list[str],
     ) -> list[IRTransaction]:
         transactions = scan_kraken_ledgers(filepath)
-        return build_kraken_ir(transactions, [asset])
+        return build_kraken_ir(transactions, assets)
 
 
 class Robinhood1099(BaseParser):
-    def parse(
+    def parse_assets(
         self,
         filepath: Union[str, Path],
-        asset: str,
+        assets: list[str],
     ) -> list[IRTransaction]:
         raise NotImplementedError()
 
@@ -1,5 +1,7 @@
 from dataclasses import dataclass
+from datetime import datetime as dt
 from enum import Enum
+from typing import Optional
 
 
 class IRColumn(Enum):
@@ -13,9 +15,21 @@ class IRColumn(Enum):
     MARKET_PRICE = 5
     ORDER_FEE = 6
     ORDER_NOTE = 7
+    TRADE_ID = 8
 
 
-@dataclass
+class AnyAsset(list):
+    """An asset filter that includes every asset.
+
+    Passed in place of a list of included assets when every asset in a
+    dataset should be kept, e.g. `tx.should_keep(AnyAsset())` is always True.
+    """
+
+    def __contains__(self, item: object) -> bool:
+        return True
+
+
+@dataclass(slots=True)
 class IRTransaction:
     """A dataclass representing the datasets intermediary representation.
 
@@ -28,6 +42,8 @@ class IRTransaction:
         market_price (str): The spot price of the asset at the time of the transaction.
         order_fee (str): The fee charged for the transaction.
         order_note (str): The note associated with the transaction.
+        trade_id (str): The ID the exchange assigned the trade, if any.
+        timestamp (datetime): The parsed datetime, set once when scanned.
     """
 
     exchange: str
@@ -38,6 +54,12 @@ class IRTransaction:
     market_price: float
     order_fee: float = 0.0
     order_note: str = str()
+    trade_id: str = str()
+    timestamp: Optional[dt] = None
+
+    @property
+    def asset(self) -> str:
+        return self.product.split("-")[0]
 
     @property
     def is_buy(self) -> bool:
@@ -47,10 +69,38 @@ class IRTransaction:
     def is_sell(self) -> bool:
         return self.transaction_type == "Sell"
 
+    @property
+    def key(self) -> tuple:
+        """Identify the transaction when removing duplicates.
+
+        Trades are identified by the ID their exchange assigned them, which
+        tells apart fills that are otherwise identical. Transactions without
+        one, such as Coinbase rows and Kraken ledger entries, are identified
+        by all of their values.
+        """
+        if self.trade_id:
+            return (
+                self.exchange,
+                self.trade_id,
+                self.product,
+                self.transaction_type,
+                self.datetime,
+            )
+
+        return (
+            self.datetime,
+            self.transaction_type,
+            self.product,
+            self.order_size,
+            self.market_price,
+            self.order_fee,
+            self.exchange,
+        )
+
     def should_keep(self, included_assets: list[str]) -> bool:
         """
         Returns True if the transaction involves any of the specified assets.
 
         NOTE: This method only checks the base asset which is specified by the user.
         """
-        return self.product.split("-")[0] in included_assets
+        return self.asset in included_assets
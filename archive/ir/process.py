@@ -1,12 +1,220 @@
+import logging
+import shutil
 from pathlib import Path
-from typing import Union
+from tempfile import TemporaryDirectory
+from typing import Any, Optional, Union
 
-import iso8601
-
-from archive.ir.builder import build_ir_csv_table
-from archive.ir.factory import parser_factory
-from archive.tools.io import print_csv, write_csv
+from archive.ir.builder import build_ir_csv_table, partition_ir_transactions
+from archive.ir.factory import BaseParser, parser_factory
+from archive.ir.models import AnyAsset, IRTransaction
+from archive.tools.io import print_csv, read_csv, write_csv
+from archive.tools.logger import setup_logger
+from archive.tools.manifest import hash_file, read_manifest, write_manifest
 from archive.tools.sort import sort_csv
+from archive.tools.timestamp import format_timestamp, parse_timestamp
+
+logger = setup_logger(
+    "ir_logger",
+    "data/log/process_ir.log",
+    logging.DEBUG,
+)
+
+# Manifest fields that must match for an IR output to be reused.
+__source_keys__: tuple[str, ...] = ("exchange", "input", "version")
+
+
+def format_ir_transactions(
+    transactions: list[IRTransaction],
+) -> list[IRTransaction]:
+    for transaction in transactions:
+        # Format datetime, which was parsed when the exchange file was scanned
+        if transaction.timestamp is None:
+            transaction.timestamp = parse_timestamp(transaction.datetime)
+        transaction.datetime = format_timestamp(transaction.timestamp)
+        # Format transaction type
+        transaction_type = ""
+        # NOTE: Some transactions have more than a single word
+        elements = transaction.transaction_type.split()
+        # Cycle through the list of words
+        for element in elements:
+            # Format the words individual and append them
+            transaction_type += element.capitalize()
+        # Update the transaction type
+        transaction.transaction_type = transaction_type
+
+    return transactions
+
+
+def get_ir_file_name(exchange: str, label: str) -> str:
+    return f"ir-{exchange}-{label}.csv"
+
+
+def get_ir_source(
+    exchange: str,
+    file_path: Union[str, Path],
+    parser: BaseParser,
+) -> dict[str, Any]:
+    """Describe an exchange file as it is recorded in the IR manifest.
+
+    Args:
+        exchange: The dataset type of the exchange file.
+        file_path: The path to the exchange CSV file.
+        parser: The parser used to read the exchange file.
+
+    Returns:
+        The exchange, resolved input path, parser version, size and hash.
+    """
+    return {
+        "exchange": exchange,
+        "input": str(Path(file_path).resolve()),
+        "version": parser.version,
+        "size": Path(file_path).stat().st_size,
+        "hash": hash_file(file_path),
+    }
+
+
+def get_ir_entry(
+    manifest: dict[str, dict[str, Any]],
+    output_dir: Union[str, Path],
+    exchange: str,
+    label: str,
+    asset: Optional[str] = None,
+) -> Optional[dict[str, Any]]:
+    """Return the manifest entry for an IR output if its files are intact.
+
+    Args:
+        manifest: The IR manifest.
+        output_dir: The output directory path for the IR files.
+        exchange: The dataset type of the exchange file.
+        label: The output label, or "*" for a file parsed for every asset.
+        asset: The base asset the output was written for, or None for "*".
+
+    Returns:
+        The entry, or None if it is missing or an output file was removed.
+    """
+    entry = manifest.get(get_ir_file_name(exchange, label))
+
+    if entry is None:
+        return None
+
+    if asset is None:
+        labels = entry.get("assets", {})
+    elif entry.get("asset") != asset:
+        return None
+    else:
+        labels = {asset: label} if entry.get("written") else {}
+
+    for output_label in labels.values():
+        output_file_path = Path(
+            output_dir, f"ir-{exchange}-{output_label}.csv"
+        )
+        if not output_file_path.exists():
+            return None
+
+    return entry
+
+
+def get_ir_offset(
+    entries: list[Optional[dict[str, Any]]],
+    source: dict[str, Any],
+    file_path: Union[str, Path],
+    parser: BaseParser,
+) -> Optional[int]:
+    """Determine how much of an exchange file has already been processed.
+
+    Args:
+        entries: The manifest entries of every requested IR output.
+        source: The current description of the exchange file.
+        file_path: The path to the exchange CSV file.
+        parser: The parser used to read the exchange file.
+
+    Returns:
+        The current file size if every output is up to date, the previous file
+        size if rows were only appended since, or None to rebuild from scratch.
+    """
+    if not entries or None in entries:
+        return None
+
+    # Every output must have been written from the same copy of the file
+    for entry in entries:
+        if any(entry.get(key) != source[key] for key in __source_keys__):
+            return None
+        if any(entry.get(key) != entries[0][key] for key in ("size", "hash")):
+            return None
+
+    size = entries[0]["size"]
+
+    if size == source["size"] and entries[0]["hash"] == source["hash"]:
+        return size
+
+    if not parser.appendable or not 0 < size < source["size"]:
+        return None
+
+    # The previous export must end on a complete row
+    with open(file_path, mode="rb") as file:
+        file.seek(size - 1)
+        if file.read(1) != b"\n":
+            return None
+
+    if hash_file(file_path, size) != entries[0]["hash"]:
+        return None
+
+    return size
+
+
+def parse_ir_transactions(
+    parser: BaseParser,
+    file_path: Union[str, Path],
+    assets: list[str],
+    offset: Optional[int] = None,
+) -> list[IRTransaction]:
+    """Parse an exchange file, or only the rows appended after `offset`.
+
+    Args:
+        parser: The parser used to read the exchange file.
+        file_path: The path to the exchange CSV file.
+        assets: The assets to include.
+        offset: The byte offset of the first new row, if any.
+
+    Returns:
+        A list of IRTransaction's.
+    """
+    if not offset:
+        return parser.parse_assets(file_path, assets)
+
+    with TemporaryDirectory() as directory:
+        tail_path = Path(directory, Path(file_path).name)
+
+        # Keep the header, since every scanner skips the first row
+        with open(file_path, mode="rb") as file:
+            with open(tail_path, mode="wb") as tail:
+                tail.write(file.readline())
+                file.seek(offset)
+                shutil.copyfileobj(file, tail)
+
+        return parser.parse_assets(tail_path, assets)
+
+
+def export_ir_transactions(
+    transactions: list[IRTransaction],
+    label: str,
+    exchange: str,
+    output_dir: Union[str, Path],
+    append: bool = False,
+) -> Union[str, Path]:
+    output_file_path = Path(output_dir, get_ir_file_name(exchange, label))
+    csv_transactions = build_ir_csv_table(transactions)
+
+    # Merge new rows into the existing output
+    if append and output_file_path.exists():
+        csv_transactions = read_csv(output_file_path) + csv_transactions[1:]
+
+    csv_sorted = sort_csv(csv_transactions, column=2)
+    print_csv(csv_sorted)
+
+    write_csv(output_file_path, csv_sorted)
+
+    return output_file_path
 
 
 def process_ir(
@@ -15,42 +223,157 @@ def process_ir(
     exchange: str,
     file_path: Union[str, Path],
     output_dir: Union[str, Path],
+    rebuild: bool = False,
 ) -> None:
     # Format user input
     asset = asset.upper()
     label = label.lower()
     exchange = exchange.lower()
 
-    # Parse specified exchange transactions
+    # Check the manifest for an up to date output
     parser = parser_factory(exchange)
-    transactions = parser.parse(file_path, asset)
+    source = get_ir_source(exchange, file_path, parser)
+    manifest = read_manifest(output_dir)
+    entry = get_ir_entry(manifest, output_dir, exchange, label, asset)
+    offset = get_ir_offset([entry], source, file_path, parser)
 
-    # Do nothing if data set is empty
-    if not (len(transactions) > 0):
+    if rebuild:
+        offset = None
+
+    if offset == source["size"]:
+        logger.debug(f"IR: Skipping unchanged {file_path} for {asset}")
         return
 
+    # Parse specified exchange transactions
+    transactions = parse_ir_transactions(parser, file_path, [asset], offset)
+    written = bool(offset and entry["written"])
+
+    # Do nothing if data set is empty
+    if len(transactions) > 0:
+        # Format transactions
+        transactions = format_ir_transactions(transactions)
+
+        # Keep only the transactions specified by the user
+        transactions = [tx for tx in transactions if tx.should_keep([asset])]
+
+        export_ir_transactions(
+            transactions, label, exchange, output_dir, append=bool(offset)
+        )
+        written = True
+
+    manifest[get_ir_file_name(exchange, label)] = {
+        **source,
+        "asset": asset,
+        "written": written,
+    }
+    write_manifest(output_dir, manifest)
+
+
+def process_ir_assets(
+    assets: Optional[dict[str, str]],
+    exchange: str,
+    file_path: Union[str, Path],
+    output_dir: Union[str, Path],
+    rebuild: bool = False,
+) -> dict[str, str]:
+    """Scan an exchange file once and write an IR file for every asset in it.
+
+    Outputs recorded in the manifest are skipped while the exchange file is
+    unchanged, and only rows appended to the file are parsed when it grows.
+
+    Args:
+        assets: A mapping of base asset symbols to output labels, or None to
+            include every asset found in the file (labelled by its symbol).
+        exchange: The dataset type of the exchange file.
+        file_path: The path to the exchange CSV file.
+        output_dir: The output directory path for the IR files.
+        rebuild: Ignore the manifest and rebuild every output from scratch.
+
+    Returns:
+        A mapping of the base asset symbols that were written to their labels.
+    """
+    # Format user input
+    exchange = exchange.lower()
+
+    if assets is not None:
+        assets = {
+            asset.upper(): label.lower() for asset, label in assets.items()
+        }
+
+    # Check the manifest for up to date outputs
+    parser = parser_factory(exchange)
+    source = get_ir_source(exchange, file_path, parser)
+    manifest = read_manifest(output_dir)
+    labels: dict[str, str] = {}
+
+    if assets is not None:
+        entries = {
+            asset: get_ir_entry(manifest, output_dir, exchange, label, asset)
+            for asset, label in assets.items()
+        }
+        offset = get_ir_offset(
+            list(entries.values()), source, file_path, parser
+        )
+
+        if offset is not None:
+            for asset, entry in entries.items():
+                if entry["written"]:
+                    labels[asset] = assets[asset]
+    else:
+        entry = get_ir_entry(manifest, output_dir, exchange, "*")
+        offset = get_ir_offset([entry], source, file_path, parser)
+
+        if offset is not None:
+            labels.update(entry["assets"])
+
+    if rebuild:
+        offset = None
+        labels = {}
+
+    if offset == source["size"]:
+        logger.debug(f"IR: Skipping unchanged {file_path} for {list(labels)}")
+        return labels
+
+    # Parse specified exchange transactions for every asset at once
+    included_assets = list(assets) if assets is not None else AnyAsset()
+    transactions = parse_ir_transactions(
+        parser, file_path, included_assets, offset
+    )
+
     # Format transactions
-    for transaction in transactions:
-        # Format datetime
-        datetime = iso8601.parse_date(transaction.datetime)
-        transaction.datetime = datetime.strftime("%Y-%m-%d %H:%M:%S.%f")
-        # Format transaction type
-        transaction_type = ""
-        # NOTE: Some transactions have more than a single word
-        elements = transaction.transaction_type.split()
-        # Cycle through the list of words
-        for element in elements:
-            # Format the words individual and append them
-            transaction_type += element.capitalize()
-        # Update the transaction type
-        transaction.transaction_type = transaction_type
+    transactions = format_ir_transactions(transactions)
 
     # Keep only the transactions specified by the user
-    transactions = [tx for tx in transactions if tx.should_keep([asset])]
+    for asset, partition in partition_ir_transactions(transactions).items():
+        if asset not in included_assets:
+            continue
 
-    csv_transactions = build_ir_csv_table(transactions)
-    csv_sorted = sort_csv(csv_transactions, column=2)
-    print_csv(csv_sorted)
+        label = assets[asset] if assets is not None else asset.lower()
+        export_ir_transactions(
+            partition, label, exchange, output_dir, append=bool(offset)
+        )
+        labels[asset] = label
 
-    output_file_path = Path(output_dir, f"ir-{exchange}-{label}.csv")
-    write_csv(output_file_path, csv_sorted)
+    # Record every output, including assets without any transactions
+    if assets is not None:
+        for asset, label in assets.items():
+            manifest[get_ir_file_name(exchange, label)] = {
+                **source,
+                "asset": asset,
+                "written": asset in labels,
+            }
+    else:
+        for asset, label in labels.items():
+            manifest[get_ir_file_name(exchange, label)] = {
+                **source,
+                "asset": asset,
+                "written": True,
+            }
+        manifest[get_ir_file_name(exchange, "*")] = {
+            **source,
+            "assets": labels,
+        }
+
+    write_manifest(output_dir, manifest)
+
+    return labels
@@ -1,11 +1,16 @@
+import logging
+from operator import attrgetter
 from os import scandir
 from pathlib import Path
 
-from dateutil import parser
-
 from archive.f8949.models import F8949Columns, F8949Transaction
 from archive.f8949.parser import calculate_gain_or_loss
+from archive.tools.dedupe import iter_unique, report_duplicates
 from archive.tools.io import read_csv
+from archive.tools.logger import setup_logger
+from archive.tools.timestamp import parse_optional_timestamp, parse_timestamp
+
+logger = setup_logger("link_logger", "data/log/link.log", logging.DEBUG)
 
 
 def link_f8949_transactions(directory: str | Path) -> list[F8949Transaction]:
@@ -31,6 +36,12 @@ def link_f8949_transactions(directory: str | Path) -> list[F8949Transaction]:
                         row[F8949Columns.AMOUNT_OF_ADJUSTMENT.value]
                     ),
                     gain_or_loss=float(row[F8949Columns.GAIN_OR_LOSS.value]),
+                    acquired_at=parse_optional_timestamp(
+                        row[F8949Columns.DATE_ACQUIRED.value]
+                    ),
+                    sold_at=parse_optional_timestamp(
+                        row[F8949Columns.DATE_SOLD.value]
+                    ),
                 )
 
                 transaction = calculate_gain_or_loss(transaction)
@@ -43,26 +54,12 @@ def link_f8949_transactions(directory: str | Path) -> list[F8949Transaction]:
 def remove_duplicate_transactions(
     transactions: list[F8949Transaction],
 ) -> list[F8949Transaction]:
-    seen = set()
-    filtered_transactions = []
+    duplicates: list[F8949Transaction] = []
+    filtered_transactions = list(
+        iter_unique(transactions, attrgetter("key"), duplicates)
+    )
 
-    for transaction in transactions:
-        transaction_hash = hash(
-            (
-                transaction.description_of_property,
-                transaction.date_acquired,
-                transaction.date_sold,
-                transaction.proceeds,
-                transaction.cost_or_other_basis,
-                transaction.codes,
-                transaction.amount_of_adjustment,
-                transaction.gain_or_loss,
-            )
-        )
-
-        if transaction_hash not in seen:
-            seen.add(transaction_hash)
-            filtered_transactions.append(transaction)
+    report_duplicates(logger, "Form 8949 transactions", duplicates)
 
     return filtered_transactions
 
@@ -72,12 +69,12 @@ def filter_transactions_by_year(
 ) -> list[F8949Transaction]:
     filtered_transactions = []
 
-    dt_year = parser.parse(year)
+    tax_year = int(year)
 
     for transaction in transactions:
-        dt_sold = parser.parse(transaction.date_sold)
+        sold_at = transaction.sold_at or parse_timestamp(transaction.date_sold)
 
-        if dt_sold.year == dt_year.year:
+        if sold_at.year == tax_year:
             filtered_transactions.append(transaction)
 
     return filtered_transactions
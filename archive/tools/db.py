@@ -1,12 +1,39 @@
 # archive/tools/db.py
+import os
 from pathlib import Path
-from typing import Optional, Type, Union
+from threading import Lock
+from typing import Any, Iterable, Iterator, Optional, Sequence, Type, Union
 
-from peewee import Model, OperationalError, SqliteDatabase
+from peewee import (
+    AutoField,
+    Field,
+    Model,
+    OperationalError,
+    SqliteDatabase,
+)
 
 # Create a new SqliteDatabase instance
 db = SqliteDatabase("transactions.db")
 
+# Pragmas set on every connection. WAL lets readers carry on while a writer
+# commits, and a NORMAL sync is still durable in WAL mode, short of losing
+# the last commits on a power failure.
+__pragmas__: dict[str, Any] = {
+    "journal_mode": "wal",
+    "synchronous": "normal",
+    "cache_size": -64 * 1024,  # 64 MiB, negative sizes are in KiB
+    "mmap_size": 256 * 1024 * 1024,
+    "temp_store": "memory",
+}
+
+# Seconds a connection waits for another process to finish writing.
+__timeout__: float = 60.0
+
+# Databases opened by this process, keyed by their resolved path.
+_databases: dict[str, SqliteDatabase] = {}
+_databases_pid: int = 0
+_databases_lock = Lock()
+
 
 class BaseModel(Model):
     """Base model class for using the database instance."""
@@ -32,28 +59,113 @@ def create_model_class(
     return type(class_name, (model_cls,), {})
 
 
+def get_database(db_path: Union[str, Path]) -> SqliteDatabase:
+    """Return the database at the given path, opening it once per process.
+
+    Every caller in a process shares the same database, and so the same
+    connection. A forked process opens its own instead of reusing the
+    connection of its parent.
+
+    Args:
+        db_path (Union[str, Path]): Path to the database file.
+
+    Returns:
+        SqliteDatabase: The database, connected lazily on first use.
+    """
+    global _databases_pid
+
+    key = str(Path(db_path).resolve())
+
+    with _databases_lock:
+        if _databases_pid != os.getpid():
+            _databases.clear()
+            _databases_pid = os.getpid()
+
+        database = _databases.get(key)
+
+        if database is None:
+            database = SqliteDatabase(
+                db_path, pragmas=__pragmas__, timeout=__timeout__
+            )
+            _databases[key] = database
+
+    return database
+
+
 def db_connect(
-    model_cls: Type[Model],
+    model_cls: Union[Type[Model], Sequence[Type[Model]]],
     db_path: Optional[Union[str, Path]] = "",
 ) -> Optional[SqliteDatabase]:
-    """Connect to the database and create the table if it does not exist.
+    """Connect to the database and create the tables if they do not exist.
 
     Args:
-        model_cls (Type[Model]): The model class to use for creating the table. Defaults to BaseModel.
+        model_cls (Union[Type[Model], Sequence[Type[Model]]]): The model class, or classes, to bind and create tables for.
         db_path (Optional[Union[str, Path]], optional): Path to the database file. Defaults to "".
 
     Returns:
         Optional[SqliteDatabase]: A connected database object or None if connection fails.
     """
     db_path = db_path or Path("transactions.db")
-    db = SqliteDatabase(db_path)
-    model_cls._meta.database = db
+    models = [model_cls] if isinstance(model_cls, type) else list(model_cls)
+    db = get_database(db_path)
+    db.bind(models)
 
     try:
-        db.connect()
-        if not model_cls.table_exists():
-            db.create_tables([model_cls], safe=True)
+        db.connect(reuse_if_open=True)
+        db.create_tables(models, safe=True)
         return db
     except OperationalError:
         print(f"Error connecting to {db_path}. Exiting.")
         return None
+
+
+def get_insert_fields(model_cls: Type[Model]) -> list[Field]:
+    """Return the fields of a model in declaration order, without its id."""
+    return [
+        field
+        for field in model_cls._meta.sorted_fields
+        if not isinstance(field, AutoField)
+    ]
+
+
+def insert_many(
+    model_cls: Type[Model],
+    rows: Iterable[Sequence[Any]],
+    fields: Optional[Sequence[Field]] = None,
+) -> int:
+    """Insert rows with a single prepared statement within one transaction.
+
+    Building an INSERT with peewee's query builder costs far more than
+    SQLite takes to execute it, so the rows are bound to one prepared
+    statement instead. Values are bound as they are, without the
+    conversions of the model's fields, so they must already be SQLite types
+    such as str, int and float.
+
+    Args:
+        model_cls (Type[Model]): The model the rows belong to.
+        rows (Iterable[Sequence[Any]]): The rows, which may be a generator.
+        fields (Optional[Sequence[Field]], optional): The fields of each row. Defaults to every field but the id.
+
+    Returns:
+        int: The number of rows inserted.
+    """
+    fields = list(fields or get_insert_fields(model_cls))
+    columns = ", ".join(f'"{field.column_name}"' for field in fields)
+    values = ", ".join("?" * len(fields))
+    sql = (
+        f'INSERT INTO "{model_cls._meta.table_name}" ({columns}) '
+        f"VALUES ({values})"
+    )
+    database = model_cls._meta.database
+    count = 0
+
+    def counted() -> Iterator[Sequence[Any]]:
+        nonlocal count
+        for row in rows:
+            count += 1
+            yield row
+
+    with database.atomic():
+        database.cursor().executemany(sql, counted())
+
+    return count
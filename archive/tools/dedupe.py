@@ -0,0 +1,77 @@
+import logging
+from typing import (
+    Any,
+    Callable,
+    Hashable,
+    Iterable,
+    Iterator,
+    Optional,
+    TypeVar,
+)
+
+T = TypeVar("T")
+
+
+def iter_unique(
+    items: Iterable[T],
+    key: Callable[[T], Hashable],
+    duplicates: Optional[list[T]] = None,
+    window: Optional[Callable[[T], Any]] = None,
+) -> Iterator[T]:
+    """Lazily yield the first item for every key, dropping later duplicates.
+
+    Keys are compared by value, so distinct items are never dropped because
+    their hashes happen to collide.
+
+    Args:
+        items: The items to deduplicate.
+        key: Returns the key identifying an item.
+        duplicates: Collects every dropped item, if given.
+        window: Set for items sorted by this value, e.g. their datetime, when
+            duplicates always share it. Keys are only remembered until the
+            value changes, so memory is bounded by the largest group of items
+            sharing a value instead of by the whole history.
+
+    Yields:
+        Every item whose key has not been seen before.
+    """
+    seen: set[Hashable] = set()
+    current: Any = None
+
+    for item in items:
+        if window is not None:
+            value = window(item)
+            if value != current:
+                seen.clear()
+                current = value
+
+        item_key = key(item)
+
+        if item_key in seen:
+            if duplicates is not None:
+                duplicates.append(item)
+            continue
+
+        seen.add(item_key)
+        yield item
+
+
+def report_duplicates(
+    logger: logging.Logger,
+    description: str,
+    duplicates: list[Any],
+) -> None:
+    """Log how many duplicates were dropped, followed by each of them.
+
+    Args:
+        logger: The logger to write the report to.
+        description: What the duplicates are, e.g. "IR transactions".
+        duplicates: The dropped items.
+    """
+    if not duplicates:
+        return
+
+    logger.info("Dropped %d duplicate %s", len(duplicates), description)
+
+    for duplicate in duplicates:
+        logger.debug("Duplicate: %s", duplicate)
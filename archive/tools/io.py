@@ -1,42 +1,70 @@
 import csv
 import logging
+import os
+from argparse import ArgumentTypeError
+from io import StringIO
+from os import getenv
 from pathlib import Path
-from typing import Union
+from typing import Callable, Iterable, Iterator, Optional, TypeVar, Union
 
 import texttable
 
 from archive.tools.logger import setup_logger
 
+T = TypeVar("T")
+
 logger = setup_logger("io_logger", "data/log/io.log", logging.DEBUG)
 
+# Skip printing tables to the console, which is off by default.
+__quiet__: bool = (getenv("PRINT_QUIET") or "").lower() in ("1", "true", "yes")
 
-def read_csv(filepath: Union[str, Path]) -> list[list[str]]:
-    """Read data from a CSV file using the given filepath.
+# Number of rows printed from each end of a table, or None to print them all.
+__preview__: Optional[int] = (
+    int(getenv("PRINT_PREVIEW")) if getenv("PRINT_PREVIEW") else None
+)
+
+
+def iter_csv(filepath: Union[str, Path]) -> Iterator[list[str]]:
+    """Lazily read rows from a CSV file using the given filepath.
 
     Args:
         filepath: The path to the CSV file to read.
 
-    Returns:
-        A list of CSV rows, where each row is a list of column values.
+    Yields:
+        Each CSV row as a list of column values, header included.
     """
-    csv_table = []
+    count = 0
 
     with open(filepath, mode="r") as file:
-        for csv_row in csv.reader(file, delimiter=","):
-            csv_table.append(csv_row)
+        try:
+            for csv_row in csv.reader(file, delimiter=","):
+                count += 1
+                yield csv_row
+        finally:
+            # Also logged when the caller stops early and closes the reader
+            logger.debug(f"CSV_READ: {filepath} ({count} rows)")
+
+
+def read_csv(filepath: Union[str, Path]) -> list[list[str]]:
+    """Read data from a CSV file using the given filepath.
 
-    logger.debug(f"CSV_READ: {filepath}")
-    logger.debug(f"CSV_READ_TABLE: {csv_table}")
+    Args:
+        filepath: The path to the CSV file to read.
 
-    return csv_table
+    Returns:
+        A list of CSV rows, where each row is a list of column values.
+    """
+    return list(iter_csv(filepath))
 
 
 def write_csv(
     filepath: Union[str, Path],
-    csv_table: list[list[str]],
+    csv_table: Iterable[list[str]],
 ) -> None:
     """Write data to a CSV file.
 
+    Rows are written as they are consumed, so `csv_table` may be a generator.
+
     Args:
         filepath: The path to the CSV file to write to.
         csv_table: The data to write to the CSV file.
@@ -44,12 +72,15 @@ def write_csv(
     Returns:
         None.
     """
+    count = 0
+
     with open(filepath, mode="w") as file:
         writer = csv.writer(file, delimiter=",")
-        writer.writerows(csv_table)
+        for csv_row in csv_table:
+            writer.writerow(csv_row)
+            count += 1
 
-    logger.debug(f"CSV_WRITE: {filepath}")
-    logger.debug(f"CSV_WRITE_TABLE: {csv_table}")
+    logger.debug(f"CSV_WRITE: {filepath} ({count} rows)")
 
 
 def read_write_csv(
@@ -65,13 +96,200 @@ def read_write_csv(
         return read_csv(filepath)
 
 
+def read_last_csv_row(
+    filepath: Union[str, Path],
+    block_size: int = 4096,
+) -> Optional[list[str]]:
+    """Read the last row of a CSV file without reading the rows before it.
+
+    The file is read backwards from its end one block at a time until the
+    start of the last line is found, so the cost does not grow with the
+    number of rows. Rows must not contain quoted line breaks.
+
+    Args:
+        filepath: The path to the CSV file to read.
+        block_size (optional): The number of bytes read at a time.
+
+    Returns:
+        The last row, which is the header if there are no other rows, or None
+        if the file is missing or empty.
+    """
+    try:
+        file = open(filepath, mode="rb")
+    except FileNotFoundError:
+        return None
+
+    with file:
+        position = file.seek(0, os.SEEK_END)
+        tail = b""
+
+        while position > 0:
+            size = min(block_size, position)
+            position -= size
+            file.seek(position)
+            tail = file.read(size) + tail
+            line_start = tail.rstrip(b"\r\n").rfind(b"\n")
+
+            if line_start != -1:
+                tail = tail[line_start + 1 :]
+                break
+
+    line = tail.decode().strip("\r\n")
+
+    return next(csv.reader([line], delimiter=",")) if line else None
+
+
+def read_last_csv_record(
+    filepath: Union[str, Path],
+    convert_records_to_csv: Callable[[list[T]], list[list[str]]],
+    convert_csv_to_records: Callable[[list[list[str]]], list[T]],
+) -> Optional[T]:
+    """Read the last record of a records file without reading the others.
+
+    Args:
+        filepath: The path to the records CSV file.
+        convert_records_to_csv: Converts records to a CSV table, used for
+            the header of the file.
+        convert_csv_to_records: Converts a CSV table, header included, to
+            records.
+
+    Returns:
+        The last record, or None if the file is missing or has no records.
+    """
+    header = convert_records_to_csv([])[0]
+    last_row = read_last_csv_row(filepath)
+
+    if not last_row or last_row == header:
+        return None
+
+    return convert_csv_to_records([header, last_row])[0]
+
+
+def append_csv(
+    filepath: Union[str, Path],
+    csv_rows: Iterable[list[str]],
+    header: Optional[list[str]] = None,
+) -> None:
+    """Append rows to a CSV file in a single write.
+
+    The rows are encoded up front and written with one call to a file opened
+    for appending, then synced to disk, so a concurrent reader never sees
+    half a row and an interrupted run never leaves one behind.
+
+    Args:
+        filepath: The path to the CSV file to append to.
+        csv_rows: The rows to append.
+        header (optional): Written first if the file is missing or empty.
+    """
+    buffer = StringIO()
+    writer = csv.writer(buffer, delimiter=",")
+    count = 0
+
+    descriptor = os.open(
+        filepath, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644
+    )
+
+    try:
+        if header and os.fstat(descriptor).st_size == 0:
+            writer.writerow(header)
+
+        for csv_row in csv_rows:
+            writer.writerow(csv_row)
+            count += 1
+
+        data = buffer.getvalue().encode()
+
+        while data:
+            data = data[os.write(descriptor, data) :]
+
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+    logger.debug(f"CSV_APPEND: {filepath} ({count} rows)")
+
+
+def set_quiet(quiet: bool = True) -> None:
+    """Enable or disable printing tables to the console.
+
+    Args:
+        quiet: When True, `print_csv` does not print anything.
+    """
+    global __quiet__
+    __quiet__ = quiet
+
+
+def set_preview(rows: Optional[int]) -> None:
+    """Bound the number of rows `print_csv` prints.
+
+    Args:
+        rows: The number of rows printed from each end of a table, or None to
+            print every row.
+    """
+    global __preview__
+    __preview__ = rows
+
+
+def parse_preview(value: str) -> int:
+    """Parse the `--preview` option of the command line entry points.
+
+    Args:
+        value: The number of rows printed from each end of a table.
+
+    Returns:
+        The number of rows.
+
+    Raises:
+        ArgumentTypeError: If the number of rows is negative.
+    """
+    rows = int(value)
+
+    if rows < 0:
+        raise ArgumentTypeError(f"must not be negative: {value}")
+
+    return rows
+
+
+def preview_csv(csv_table: list[list[str]], rows: int) -> list[list[str]]:
+    """Return the header, head and tail of a table with a summary row.
+
+    Args:
+        csv_table: The table, header included.
+        rows: The number of rows kept from each end of the table.
+
+    Returns:
+        The table itself if it has no more than `2 * rows` rows, otherwise
+        the header, the first and last `rows` rows and a row counting the
+        rows that were left out between them.
+    """
+    header, body = csv_table[0], csv_table[1:]
+
+    if len(body) <= 2 * rows:
+        return csv_table
+
+    omitted = len(body) - 2 * rows
+    summary = [f"... {omitted} of {len(body)} rows"] + [""] * (len(header) - 1)
+    tail = body[len(body) - rows :] if rows else []
+
+    return [header, *body[:rows], summary, *tail]
+
+
 def print_csv(csv_table: list[list[str]], width: int = 240) -> None:
     """Prints a formatted table of the CSV contents to the console.
 
+    Nothing is printed when quiet, and only a preview of the table is printed
+    when `__preview__` is set, so large tables are not rendered in full.
+
     Args:
         csv_table: The table to print.
         width (optional): The width of the table. Defaults to 240.
     """
+    if __quiet__ or not csv_table:
+        return
+
+    if __preview__ is not None:
+        csv_table = preview_csv(csv_table, __preview__)
+
     tt = texttable.Texttable(width)
     tt.set_deco(texttable.Texttable.HEADER)
     tt.set_cols_dtype(["t"] * len(csv_table[0]))
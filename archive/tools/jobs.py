@@ -0,0 +1,86 @@
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from archive.tools.logger import configure_logging, setup_logger
+
+T = TypeVar("T")
+
+logger = setup_logger("jobs_logger", "data/log/jobs.log", logging.DEBUG)
+
+
+def describe_failure(error: BaseException) -> str:
+    """Return a one line description of an exception for a summary."""
+    message = str(error).strip().splitlines()
+    return f"{type(error).__name__}: {message[0]}" if message else repr(error)
+
+
+def initialize_worker(
+    initializer: Optional[Callable[..., Any]],
+    initargs: tuple,
+) -> None:
+    # Spawned workers do not inherit the logging of the parent
+    configure_logging()
+
+    if initializer is not None:
+        initializer(*initargs)
+
+
+def run_jobs(
+    function: Callable[..., T],
+    tasks: dict[str, tuple],
+    jobs: int = 1,
+    initializer: Optional[Callable[..., Any]] = None,
+    initargs: tuple = (),
+) -> tuple[dict[str, T], dict[str, Exception]]:
+    """Call a function once for every task, in worker processes if asked to.
+
+    A task that raises does not stop the others. Its exception is logged
+    with the traceback and returned among the failures instead.
+
+    Args:
+        function: A module level function, so it can be sent to a worker.
+        tasks: The positional arguments of each call, keyed by task name.
+        jobs: The number of worker processes. Tasks run in this process, one
+            after the other, when it is 1 or less.
+        initializer: Called at the start of each worker process, e.g. to
+            restore settings that spawned workers do not inherit. Logging
+            is always configured.
+        initargs: The arguments of the initializer.
+
+    Returns:
+        The result of every task that succeeded and the exception of every
+        task that failed, both in the order of `tasks` rather than in the
+        order the tasks finished.
+    """
+    results: dict[str, T] = {}
+    failures: dict[str, Exception] = {}
+
+    if jobs <= 1 or len(tasks) <= 1:
+        for name, args in tasks.items():
+            try:
+                results[name] = function(*args)
+            except Exception as error:
+                logger.exception("Job %s failed", name)
+                failures[name] = error
+
+        return results, failures
+
+    with ProcessPoolExecutor(
+        min(jobs, len(tasks)),
+        initializer=initialize_worker,
+        initargs=(initializer, initargs),
+    ) as executor:
+        futures = {
+            name: executor.submit(function, *args)
+            for name, args in tasks.items()
+        }
+
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as error:
+                logger.exception("Job %s failed", name)
+                failures[name] = error
+
+    return results, failures
@@ -0,0 +1,45 @@
+import time
+from threading import Lock
+
+
+class TokenBucket:
+    """A thread-safe token bucket for rate limiting API requests.
+
+    Tokens are replenished continuously at `rate` tokens per second, up to
+    `capacity` tokens. Each request consumes a token and blocks only for as
+    long as it takes for the next token to become available.
+
+    Args:
+        rate: The number of requests allowed per second.
+        capacity: The maximum number of requests allowed in a single burst.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.timestamp = time.monotonic()
+        self.lock = Lock()
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        """Block until the given number of tokens are available and consume them.
+
+        Args:
+            tokens: The number of tokens to consume. Defaults to 1.
+        """
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                elapsed = now - self.timestamp
+                self.tokens = min(
+                    self.capacity, self.tokens + elapsed * self.rate
+                )
+                self.timestamp = now
+
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+
+                delay = (tokens - self.tokens) / self.rate
+
+            time.sleep(delay)
@@ -1,4 +1,49 @@
 import logging
+from os import getenv
+from pathlib import Path
+from threading import Lock
+from typing import Any, Optional, Union
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Dump sampled rows and tables to the debug logs, which is off by default.
+__trace__: bool = (getenv("LOG_TRACE") or "").lower() in ("1", "true", "yes")
+
+# Number of rows sampled from each traced table.
+__trace_rows__: int = int(getenv("LOG_TRACE_ROWS") or 5)
+
+# Number of characters each traced value is truncated to.
+__trace_width__: int = int(getenv("LOG_TRACE_WIDTH") or 240)
+
+# Log file and level of every logger declared with `setup_logger`.
+_loggers: dict[str, tuple[str, int]] = {}
+_loggers_lock = Lock()
+
+# Directory the log files are written to once logging is configured.
+_log_dir: Optional[Path] = None
+_configured: bool = False
+
+
+def _add_file_handler(name: str, log_file: str, level: int) -> None:
+    log_path = Path(log_file)
+
+    if _log_dir is not None:
+        log_path = _log_dir / log_path.name
+
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+
+    formatter = logging.Formatter(
+        "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+    )
+
+    file_handler = logging.FileHandler(log_path, delay=True)
+    file_handler.setFormatter(formatter)
+
+    logger = logging.getLogger(name)
+    logger.setLevel(level)
+    logger.addHandler(file_handler)
 
 
 def setup_logger(
@@ -7,23 +52,112 @@ def setup_logger(
     level: int = logging.INFO,
 ) -> logging.Logger:
     """
-    Configure logging for the given name and log file with the specified level.
+    Declare a logger for the given name and log file with the specified level.
+
+    Nothing is written until `configure_logging` is called, so importing a
+    module that declares a logger does not open its log file. Declaring the
+    same logger twice does not add a second handler.
 
     :param name: The logger name.
     :param log_file: The log file path.
     :param level: The minimum logging level (INFO by default).
-    :return: The configured logger instance.
+    :return: The logger instance.
     """
 
-    formatter = logging.Formatter(
-        "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
-    )
+    logger = logging.getLogger(name)
 
-    file_handler = logging.FileHandler(log_file)
-    file_handler.setFormatter(formatter)
+    with _loggers_lock:
+        if name in _loggers:
+            return logger
 
-    logger = logging.getLogger(name)
-    logger.setLevel(level)
-    logger.addHandler(file_handler)
+        _loggers[name] = (log_file, level)
+
+        if _configured:
+            _add_file_handler(name, log_file, level)
+        else:
+            # Discard records instead of falling back to stderr
+            logger.addHandler(logging.NullHandler())
 
     return logger
+
+
+def configure_logging(directory: Union[str, Path, None] = None) -> None:
+    """
+    Start writing every declared logger to its log file.
+
+    Called once by the command line entry points. Loggers declared afterwards
+    are written to their log files as soon as they are declared, and calling
+    this again has no effect.
+
+    :param directory: Write the log files here instead of their declared
+        directory, which is created if it is missing.
+    """
+
+    global _configured, _log_dir
+
+    with _loggers_lock:
+        if _configured:
+            return
+
+        _configured = True
+        _log_dir = Path(directory) if directory is not None else None
+
+        for name, (log_file, level) in _loggers.items():
+            logger = logging.getLogger(name)
+
+            for handler in logger.handlers[:]:
+                if isinstance(handler, logging.NullHandler):
+                    logger.removeHandler(handler)
+
+            _add_file_handler(name, log_file, level)
+
+
+def set_tracing(tracing: bool = True) -> None:
+    """Enable or disable dumping sampled rows and tables to the debug logs.
+
+    Args:
+        tracing: When True, `trace` writes to loggers enabled for DEBUG.
+    """
+    global __trace__
+    __trace__ = tracing
+
+
+def is_tracing(logger: logging.Logger) -> bool:
+    """Return True if tracing is enabled and the logger records DEBUG."""
+    return __trace__ and logger.isEnabledFor(logging.DEBUG)
+
+
+def truncate(value: Any) -> str:
+    """Return the repr of a value, cut to `__trace_width__` characters."""
+    text = repr(value)
+
+    if len(text) > __trace_width__:
+        return f"{text[:__trace_width__]}... ({len(text)} chars)"
+
+    return text
+
+
+def trace(logger: logging.Logger, message: str, value: Any) -> None:
+    """Log a sampled and truncated dump of a value when tracing is enabled.
+
+    Sequences are summarised by their length and up to `__trace_rows__` rows
+    spread evenly across them, so tracing a table of any size costs the same.
+
+    Args:
+        logger: The logger to write to.
+        message: A description of the value.
+        value: The value to dump.
+    """
+    if not is_tracing(logger):
+        return
+
+    if not isinstance(value, (list, tuple)):
+        logger.debug("%s: %s", message, truncate(value))
+        return
+
+    logger.debug("%s: %d rows", message, len(value))
+
+    step = max(len(value) // max(__trace_rows__, 1), 1)
+
+    for index in range(0, len(value), step)[:__trace_rows__]:
+        logger.debug("%s[%d]: %s", message, index, truncate(value[index]))
@@ -0,0 +1,78 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Optional, Union
+
+# Name of the manifest file stored next to the files it describes.
+__manifest__: str = ".manifest.json"
+
+# Number of bytes read at a time while hashing a file.
+__chunk__: int = 1 << 16
+
+
+def hash_file(filepath: Union[str, Path], size: Optional[int] = None) -> str:
+    """Return the SHA-256 digest of a file's contents.
+
+    Args:
+        filepath: The path to the file to hash.
+        size: Only hash the first `size` bytes of the file, if given.
+
+    Returns:
+        The hexadecimal digest as a string.
+    """
+    digest = hashlib.sha256()
+    remaining = size
+
+    with open(filepath, mode="rb") as file:
+        while remaining is None or remaining > 0:
+            chunk_size = (
+                __chunk__ if remaining is None else min(__chunk__, remaining)
+            )
+            chunk = file.read(chunk_size)
+
+            if not chunk:
+                break
+
+            digest.update(chunk)
+
+            if remaining is not None:
+                remaining -= len(chunk)
+
+    return digest.hexdigest()
+
+
+def read_manifest(directory: Union[str, Path]) -> dict[str, dict[str, Any]]:
+    """Read the manifest stored in the given directory.
+
+    Args:
+        directory: The directory containing the manifest.
+
+    Returns:
+        A mapping of output file names to their entries, empty if there is no
+        manifest or it could not be decoded.
+    """
+    try:
+        with open(Path(directory, __manifest__), mode="r") as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def write_manifest(
+    directory: Union[str, Path],
+    manifest: dict[str, dict[str, Any]],
+) -> None:
+    """Atomically write the manifest to the given directory.
+
+    Args:
+        directory: The directory to write the manifest to.
+        manifest: A mapping of output file names to their entries.
+    """
+    manifest_path = Path(directory, __manifest__)
+    temp_path = manifest_path.with_suffix(".tmp")
+
+    with open(temp_path, mode="w") as file:
+        json.dump(manifest, file, indent=2, sort_keys=True)
+
+    os.replace(temp_path, manifest_path)
@@ -0,0 +1,133 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+import iso8601
+
+# Layout every timestamp is written in, e.g. "2021-03-22 12:31:45.384000".
+__format__: str = "%Y-%m-%d %H:%M:%S.%f"
+
+
+def _parse_fixed(value: str) -> Optional[datetime]:
+    """Parse the fixed width layouts found in the exports and outputs.
+
+    Handles "YYYY-MM-DD", "MM/DD/YY" and "YYYY-MM-DD[T ]HH:MM:SS" followed by
+    an optional fraction of up to six digits and an optional "Z" or " UTC",
+    which covers Coinbase, Coinbase Pro, Kraken, Robinhood and every IR, GL
+    and Form 8949 file.
+
+    Returns:
+        The datetime in UTC, or None if the value has any other layout.
+    """
+    length = len(value)
+
+    if length == 8 and value[2] == "/" and value[5] == "/":
+        year = int(value[6:8])
+        # Two digit years follow strptime's "%y": 69-99 are 1900s
+        year += 1900 if year >= 69 else 2000
+        return datetime(
+            year, int(value[0:2]), int(value[3:5]), tzinfo=timezone.utc
+        )
+
+    if length < 10 or value[4] != "-" or value[7] != "-":
+        return None
+
+    if length == 10:
+        return datetime(
+            int(value[0:4]),
+            int(value[5:7]),
+            int(value[8:10]),
+            tzinfo=timezone.utc,
+        )
+
+    if (
+        length < 19
+        or value[10] not in "T "
+        or value[13] != ":"
+        or value[16] != ":"
+    ):
+        return None
+
+    rest = value[19:]
+
+    if rest.endswith("Z"):
+        rest = rest[:-1]
+    elif rest.endswith(" UTC"):
+        rest = rest[:-4]
+
+    microsecond = 0
+
+    if rest:
+        fraction = rest[1:]
+        if rest[0] != "." or not 0 < len(fraction) <= 6:
+            return None
+        if not fraction.isdigit():
+            return None
+        microsecond = int(fraction.ljust(6, "0"))
+
+    return datetime(
+        int(value[0:4]),
+        int(value[5:7]),
+        int(value[8:10]),
+        int(value[11:13]),
+        int(value[14:16]),
+        int(value[17:19]),
+        microsecond,
+        tzinfo=timezone.utc,
+    )
+
+
+def parse_timestamp(value: str) -> datetime:
+    """Parse a timestamp from any of the supported exchanges or outputs.
+
+    The known fixed width layouts are sliced directly, anything else, such as
+    a timestamp with a UTC offset, falls back to iso8601. Timestamps without
+    a timezone are read as UTC.
+
+    Args:
+        value: The timestamp, e.g. "2020-12-07 11:41:07.0742".
+
+    Returns:
+        A timezone aware datetime.
+
+    Raises:
+        ValueError: If the value is not a valid timestamp.
+    """
+    try:
+        parsed = _parse_fixed(value)
+    except ValueError:
+        parsed = None
+
+    if parsed is None:
+        return iso8601.parse_date(value)
+
+    return parsed
+
+
+def parse_optional_timestamp(value: str) -> Optional[datetime]:
+    """Parse a timestamp, or return None for an empty column.
+
+    Args:
+        value: The timestamp or an empty string.
+
+    Returns:
+        A timezone aware datetime or None.
+    """
+    return parse_timestamp(value) if value else None
+
+
+def format_timestamp(value: datetime) -> str:
+    """Format a datetime in the layout of every output file.
+
+    Equivalent to `value.strftime(__format__)` for years 1000 and later.
+
+    Args:
+        value: The datetime to format.
+
+    Returns:
+        The formatted timestamp, e.g. "2020-12-07 11:41:07.074200".
+    """
+    return (
+        f"{value.year:04d}-{value.month:02d}-{value.day:02d} "
+        f"{value.hour:02d}:{value.minute:02d}:{value.second:02d}."
+        f"{value.microsecond:06d}"
+    )
@@ -0,0 +1,116 @@
+from peewee import CharField, FloatField, IntegerField
+
+from archive.tools.db import BaseModel
+
+
+class FileRecord(BaseModel):
+    """The content hash of a CSV file mirrored by the warehouse.
+
+    Attributes:
+        name (str): The file name, e.g. "ir-kraken_trade-bitcoin.csv".
+        hash (str): The SHA-256 digest of the file its rows were stored from.
+    """
+
+    name = CharField(primary_key=True)
+    hash = CharField()
+
+    class Meta:
+        table_name = "file"
+
+
+class IRRecord(BaseModel):
+    """A row of an IR file.
+
+    Attributes:
+        file (str): The name of the IR file the row belongs to.
+        row (int): The position of the row within the file.
+        asset (str): The base asset of the product, e.g. "BTC".
+    """
+
+    file = CharField()
+    row = IntegerField()
+    asset = CharField()
+    exchange = CharField()
+    product = CharField()
+    datetime = CharField()
+    transaction_type = CharField()
+    order_size = FloatField()
+    market_price = FloatField()
+    order_fee = FloatField()
+    order_note = CharField()
+    trade_id = CharField()
+
+    class Meta:
+        table_name = "ir"
+        # Rows of an asset are read in the order IR files are merged in
+        indexes = (
+            (("asset", "datetime", "file", "row"), False),
+            (("file", "row"), True),
+        )
+
+
+class GLRecord(BaseModel):
+    """A row of a GL file, total rows included.
+
+    Attributes:
+        file (str): The name of the GL file the row belongs to.
+        row (int): The position of the row within the file.
+        asset (str): The base asset of the GL file.
+        datetime (str): The date the row was sold on, else acquired on.
+    """
+
+    file = CharField()
+    row = IntegerField()
+    asset = CharField()
+    datetime = CharField()
+    additional_description = CharField()
+    description = CharField()
+    date_acquired = CharField()
+    transaction_type = CharField()
+    order_size = FloatField()
+    market_price = FloatField()
+    exchange_fee = FloatField()
+    cost_or_other_basis = FloatField()
+    acb_per_share = FloatField()
+    date_sold = CharField()
+    sales_proceeds = FloatField()
+    gain_or_loss = FloatField()
+    order_note = CharField()
+
+    class Meta:
+        table_name = "gl"
+        indexes = (
+            (("asset", "datetime"), False),
+            (("file", "row"), True),
+        )
+
+
+class F8949Record(BaseModel):
+    """A row of a Form 8949 file.
+
+    Attributes:
+        file (str): The name of the Form 8949 file the row belongs to.
+        row (int): The position of the row within the file.
+        asset (str): The base asset of the property.
+        datetime (str): The date the property was sold on.
+    """
+
+    file = CharField()
+    row = IntegerField()
+    asset = CharField()
+    datetime = CharField()
+    description_of_property = CharField()
+    date_acquired = CharField()
+    date_sold = CharField()
+    proceeds = FloatField()
+    cost_or_other_basis = FloatField()
+    codes = CharField()
+    amount_of_adjustment = FloatField()
+    gain_or_loss = FloatField()
+
+    class Meta:
+        table_name = "f8949"
+        indexes = (
+            (("asset", "datetime"), False),
+            (("file", "row"), True),
+        )
@@ -0,0 +1,404 @@
+import logging
+from os import getenv, scandir
+from pathlib import Path
+from threading import Lock
+from typing import Iterable, Iterator, Optional, Type, Union
+
+from dotenv import load_dotenv
+from peewee import Model, SqliteDatabase
+
+from archive.f8949.models import F8949Transaction
+from archive.gl.models import GLTransaction
+from archive.ir.builder import iter_ir_transactions
+from archive.ir.models import IRTransaction
+from archive.tools.db import db_connect, get_database, insert_many
+from archive.tools.io import iter_csv
+from archive.tools.logger import setup_logger
+from archive.tools.manifest import hash_file
+from archive.tools.timestamp import parse_optional_timestamp
+from archive.warehouse.models import (
+    F8949Record,
+    FileRecord,
+    GLRecord,
+    IRRecord,
+)
+
+load_dotenv()
+
+logger = setup_logger(
+    "warehouse_logger",
+    "data/log/warehouse.log",
+    logging.DEBUG,
+)
+
+# Path to the SQLite warehouse, or empty to only hand off through CSV files.
+__warehouse__: str = getenv("WAREHOUSE") or ""
+
+__models__: list[Type[Model]] = [FileRecord, IRRecord, GLRecord, F8949Record]
+
+# Warehouse the models were last bound to by this process.
+_database: Optional[SqliteDatabase] = None
+_database_lock = Lock()
+
+
+def set_warehouse(path: Union[str, Path, None]) -> None:
+    """Mirror the IR, GL and Form 8949 files in a SQLite warehouse.
+
+    Args:
+        path: The path to the warehouse, or None to stop using it.
+    """
+    global __warehouse__, _database
+
+    with _database_lock:
+        __warehouse__ = str(path) if path else ""
+        _database = None
+
+
+def is_warehouse_enabled() -> bool:
+    """Return True if the stages hand off through the warehouse."""
+    return bool(__warehouse__)
+
+
+def get_warehouse() -> SqliteDatabase:
+    """Return the connected warehouse, connecting on first use.
+
+    Forked worker processes are handed a database of their own by
+    `get_database`, so the models are bound to it on their first use.
+    """
+    global _database
+
+    with _database_lock:
+        database = get_database(__warehouse__)
+
+        if database is not _database:
+            Path(__warehouse__).parent.mkdir(parents=True, exist_ok=True)
+            db_connect(__models__, __warehouse__)
+            _database = database
+
+    return database
+
+
+def get_file_hash(name: str) -> Optional[str]:
+    """Return the hash of the file a table was stored from, if any."""
+    get_warehouse()
+    record = FileRecord.get_or_none(FileRecord.name == name)
+    return record.hash if record else None
+
+
+def store_rows(
+    model: Type[Model],
+    file_path: Union[str, Path],
+    rows: Iterable[tuple],
+    digest: Optional[str] = None,
+) -> int:
+    """Replace the rows stored from a file in a single transaction.
+
+    Args:
+        model: The table the rows belong to.
+        file_path: The CSV file the rows mirror.
+        rows: Every row, its fields in the order the model declares them.
+        digest: The hash of the file, if it was already calculated.
+
+    Returns:
+        The number of rows stored.
+    """
+    name = Path(file_path).name
+
+    with get_warehouse().atomic():
+        model.delete().where(model.file == name).execute()
+        count = insert_many(model, rows)
+        FileRecord.insert(
+            name=name, hash=digest or hash_file(file_path)
+        ).on_conflict_replace().execute()
+
+    logger.debug("Stored %d rows of %s", count, name)
+
+    return count
+
+
+def is_file_stored(file_path: Union[str, Path]) -> bool:
+    """Return True if the warehouse holds the current rows of a file."""
+    name = Path(file_path).name
+    return get_file_hash(name) == hash_file(file_path)
+
+
+def sync_ir_directory(directory: Union[str, Path]) -> int:
+    """Load the IR files that changed since they were last stored.
+
+    Rows of IR files that were removed from the directory are dropped.
+
+    Args:
+        directory: The directory containing the IR CSV files.
+
+    Returns:
+        The number of IR files that were loaded.
+    """
+    get_warehouse()
+    names = set()
+    loaded = 0
+
+    for entry in sorted(scandir(directory), key=lambda entry: entry.name):
+        if not entry.is_file() or not entry.name.endswith(".csv"):
+            continue
+
+        names.add(entry.name)
+        digest = hash_file(entry.path)
+
+        if get_file_hash(entry.name) == digest:
+            continue
+
+        transactions = iter_ir_transactions(iter_csv(entry.path))
+        rows = (
+            (
+                entry.name,
+                index,
+                transaction.asset,
+                transaction.exchange,
+                transaction.product,
+                transaction.datetime,
+                transaction.transaction_type,
+                transaction.order_size,
+                transaction.market_price,
+                transaction.order_fee,
+                transaction.order_note,
+                transaction.trade_id,
+            )
+            for index, transaction in enumerate(transactions)
+        )
+        store_rows(IRRecord, entry.path, rows, digest)
+        loaded += 1
+
+    query = IRRecord.select(IRRecord.file).distinct().tuples()
+    removed = [name for (name,) in query if name not in names]
+
+    if removed:
+        with get_warehouse().atomic():
+            IRRecord.delete().where(IRRecord.file.in_(removed)).execute()
+            FileRecord.delete().where(FileRecord.name.in_(removed)).execute()
+
+    logger.debug("Loaded %d and removed %d IR files", loaded, len(removed))
+
+    return loaded
+
+
+def query_ir_transactions(asset: str) -> Iterator[IRTransaction]:
+    """Lazily query the IR transactions of an asset in datetime order.
+
+    Rows with the same datetime keep the order of their files and of the rows
+    within them, in the same way as `archive.ir.builder.iter_ir_table`.
+
+    Args:
+        asset: The base asset, e.g. "BTC".
+
+    Yields:
+        Every IR transaction of the asset.
+    """
+    query = (
+        IRRecord.select(
+            IRRecord.exchange,
+            IRRecord.product,
+            IRRecord.datetime,
+            IRRecord.transaction_type,
+            IRRecord.order_size,
+            IRRecord.market_price,
+            IRRecord.order_fee,
+            IRRecord.order_note,
+            IRRecord.trade_id,
+        )
+        .where(IRRecord.asset == asset)
+        .order_by(IRRecord.datetime, IRRecord.file, IRRecord.row)
+        .tuples()
+    )
+
+    for row in query.iterator():
+        yield IRTransaction(*row)
+
+
+def store_gl_table(
+    file_path: Union[str, Path],
+    csv_table: list[list[str]],
+) -> int:
+    """Store the rows of a GL file as they were written to it.
+
+    Args:
+        file_path: The GL file the table was written to.
+        csv_table: The GL table, header included.
+
+    Returns:
+        The number of rows stored.
+    """
+    name = Path(file_path).name
+    # Every row of a GL file shares its base asset, totals have no product
+    asset = next((row[1].split("-")[0] for row in csv_table[1:] if row[1]), "")
+
+    rows = (
+        (
+            name,
+            index,
+            asset,
+            date_sold or date_acquired,
+            additional_description,
+            description,
+            date_acquired,
+            transaction_type,
+            float(order_size),
+            float(market_price),
+            float(exchange_fee),
+            float(cost_or_other_basis),
+            float(acb_per_share),
+            date_sold,
+            float(sales_proceeds),
+            float(gain_or_loss),
+            order_note,
+        )
+        for index, (
+            additional_description,
+            description,
+            date_acquired,
+            transaction_type,
+            order_size,
+            market_price,
+            exchange_fee,
+            cost_or_other_basis,
+            acb_per_share,
+            date_sold,
+            sales_proceeds,
+            gain_or_loss,
+            order_note,
+        ) in enumerate(csv_table[1:])
+    )
+
+    return store_rows(GLRecord, file_path, rows)
+
+
+def query_gl_sells(
+    file_path: Union[str, Path],
+) -> Optional[list[GLTransaction]]:
+    """Query the sells of a GL file, without its total rows.
+
+    Args:
+        file_path: The GL file.
+
+    Returns:
+        The sells in the order of the file, or None if the warehouse does not
+        hold the current rows of the file.
+    """
+    if not is_file_stored(file_path):
+        return None
+
+    query = (
+        GLRecord.select(
+            GLRecord.additional_description,
+            GLRecord.description,
+            GLRecord.date_acquired,
+            GLRecord.transaction_type,
+            GLRecord.order_size,
+            GLRecord.market_price,
+            GLRecord.exchange_fee,
+            GLRecord.cost_or_other_basis,
+            GLRecord.acb_per_share,
+            GLRecord.date_sold,
+            GLRecord.sales_proceeds,
+            GLRecord.gain_or_loss,
+            GLRecord.order_note,
+        )
+        .where(
+            (GLRecord.file == Path(file_path).name)
+            & (GLRecord.transaction_type == "Sell")
+            & (GLRecord.additional_description != "total")
+        )
+        .order_by(GLRecord.row)
+        .tuples()
+    )
+
+    return [GLTransaction(*row) for row in query.iterator()]
+
+
+def store_f8949_table(
+    file_path: Union[str, Path],
+    csv_table: list[list[str]],
+) -> int:
+    """Store the rows of a Form 8949 file as they were written to it.
+
+    Args:
+        file_path: The Form 8949 file the table was written to.
+        csv_table: The Form 8949 table, header included.
+
+    Returns:
+        The number of rows stored.
+    """
+    name = Path(file_path).name
+
+    rows = (
+        (
+            name,
+            index,
+            # e.g. "BTC-USD - kraken"
+            description_of_property.split("-")[0].strip(),
+            date_sold,
+            description_of_property,
+            date_acquired,
+            date_sold,
+            float(proceeds),
+            float(cost_or_other_basis),
+            codes,
+            float(amount_of_adjustment),
+            float(gain_or_loss),
+        )
+        for index, (
+            description_of_property,
+            date_acquired,
+            date_sold,
+            proceeds,
+            cost_or_other_basis,
+            codes,
+            amount_of_adjustment,
+            gain_or_loss,
+        ) in enumerate(csv_table[1:])
+    )
+
+    return store_rows(F8949Record, file_path, rows)
+
+
+def query_f8949_transactions(
+    file_path: Union[str, Path],
+) -> Optional[list[F8949Transaction]]:
+    """Query the rows of a Form 8949 file.
+
+    Args:
+        file_path: The Form 8949 file.
+
+    Returns:
+        The transactions in the order of the file, or None if the warehouse
+        does not hold the current rows of the file.
+    """
+    if not is_file_stored(file_path):
+        return None
+
+    query = (
+        F8949Record.select(
+            F8949Record.description_of_property,
+            F8949Record.date_acquired,
+            F8949Record.date_sold,
+            F8949Record.proceeds,
+            F8949Record.cost_or_other_basis,
+            F8949Record.codes,
+            F8949Record.amount_of_adjustment,
+            F8949Record.gain_or_loss,
+        )
+        .where(F8949Record.file == Path(file_path).name)
+        .order_by(F8949Record.row)
+        .tuples()
+    )
+
+    transactions = []
+
+    for row in query.iterator():
+        transaction = F8949Transaction(*row)
+        transaction.acquired_at = parse_optional_timestamp(
+            transaction.date_acquired
+        )
+        transaction.sold_at = parse_optional_timestamp(transaction.date_sold)
+        transactions.append(transaction)
+
+    return transactions
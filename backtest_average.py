@@ -0,0 +1,134 @@
+import sys
+from argparse import ArgumentParser, Namespace
+from os import getenv
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from archive.average.backtest import (
+    BacktestBroker,
+    convert_summaries_to_csv,
+    read_price_series,
+    run_backtest,
+    strategies,
+)
+from archive.tools.io import (
+    parse_preview,
+    print_csv,
+    set_preview,
+    set_quiet,
+    write_csv,
+)
+from archive.tools.logger import configure_logging
+
+load_dotenv()
+
+
+def get_arguments() -> Namespace:
+    parser = ArgumentParser(
+        description="Backtest averaging strategies over historical prices."
+    )
+
+    parser.add_argument(
+        "-p",
+        "--prices",
+        type=str,
+        default="docs/samples/prices/btc-usd-2020.csv",
+        help="CSV file of dates and closing prices (default: btc-usd-2020.csv)",
+    )
+
+    parser.add_argument(
+        "-s",
+        "--strategy",
+        action="append",
+        choices=list(strategies),
+        help="The strategy to replay. Repeat to replay several. "
+        "(default: every strategy)",
+    )
+
+    parser.add_argument(
+        "--principal-amount",
+        type=float,
+        default=float(getenv("PRINCIPAL_AMOUNT") or 10),
+        help="The principal amount of each interval (default: PRINCIPAL_AMOUNT or 10)",
+    )
+
+    parser.add_argument(
+        "--product-id",
+        type=str,
+        default=getenv("PRODUCT_ID") or "BTC-USD",
+        help="The product the prices belong to (default: PRODUCT_ID or BTC-USD)",
+    )
+
+    parser.add_argument(
+        "--min-order-size",
+        type=float,
+        default=0.0,
+        help="Hold when a trade amount is below this amount (default: 0)",
+    )
+
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        type=str,
+        default=None,
+        help="Write the records of each strategy to this directory (optional)",
+    )
+
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Only print the summary of each strategy.",
+    )
+
+    parser.add_argument(
+        "--preview",
+        type=parse_preview,
+        default=None,
+        metavar="N",
+        help="Only print the first and last N rows of each table.",
+    )
+
+    return parser.parse_args(sys.argv[1:])
+
+
+def main():
+    args = get_arguments()
+    configure_logging()
+
+    if args.quiet:
+        set_quiet()
+
+    if args.preview is not None:
+        set_preview(args.preview)
+
+    prices = read_price_series(args.prices)
+    summaries = []
+
+    for strategy in args.strategy or list(strategies):
+        broker = BacktestBroker(
+            prices,
+            args.principal_amount,
+            product_id=args.product_id,
+            min_order_size=args.min_order_size,
+        )
+        records, summary = run_backtest(strategy, broker)
+        csv_table = strategies[strategy](records)
+
+        print_csv(csv_table)
+
+        if args.output_dir:
+            Path(args.output_dir).mkdir(parents=True, exist_ok=True)
+            write_csv(
+                Path(args.output_dir, f"backtest-{strategy}.csv"), csv_table
+            )
+
+        summaries.append(summary)
+
+    # The summary is always printed, even when the records are quiet
+    set_quiet(False)
+    print_csv(convert_summaries_to_csv(summaries))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Time bulk inserts of IR rows into SQLite under different settings.
+
+Synthetic IR rows are inserted into the `ir` table of the warehouse in a
+single transaction, once with SQLite's default journal and batches of rows
+built by peewee's query builder, and once with the pragmas and the prepared
+statement of `archive.tools.db`. Reading the rows of a single asset back in
+datetime order is timed as well.
+
+Usage:
+    python -m benchmarks.db --rows 1000000
+"""
+
+import random
+import sys
+import time
+from argparse import ArgumentParser, Namespace
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any, Callable, Iterable, Iterator
+
+from peewee import SqliteDatabase, chunked
+
+from archive.tools import db
+from archive.warehouse.models import IRRecord
+
+# Assets the synthetic rows are spread across.
+assets: list[str] = ["BTC", "ETH", "LTC", "XMR", "DOT"]
+
+
+def insert_batches(rows: Iterable[tuple]) -> None:
+    """Insert rows with one query built by peewee per batch of rows."""
+    fields = db.get_insert_fields(IRRecord)
+    # Bound variables allowed in a single statement by older SQLite releases
+    batch = max(999 // len(fields), 1)
+
+    with IRRecord._meta.database.atomic():
+        for records in chunked(rows, batch):
+            IRRecord.insert_many(records, fields=fields).execute()
+
+
+def insert_prepared(rows: Iterable[tuple]) -> None:
+    """Insert rows with the prepared statement of `archive.tools.db`."""
+    db.insert_many(IRRecord, rows)
+
+
+# Pragmas and insert of each configuration.
+configurations: dict[str, tuple[dict[str, Any], Callable]] = {
+    "default": ({}, insert_batches),
+    "tuned": (db.__pragmas__, insert_prepared),
+}
+
+
+def generate_rows(rows: int, seed: int) -> Iterator[tuple]:
+    """Yield IR rows in the field order of `IRRecord`."""
+    rng = random.Random(seed)
+
+    for index in range(rows):
+        asset = rng.choice(assets)
+        yield (
+            f"ir-exchange-{asset.lower()}.csv",
+            index,
+            asset,
+            "exchange",
+            f"{asset}-USD",
+            f"2021-{index % 12 + 1:02d}-{index % 28 + 1:02d} "
+            f"{index % 24:02d}:{index % 60:02d}:00.000000",
+            rng.choice(("Buy", "Sell")),
+            rng.random(),
+            rng.uniform(1, 60_000),
+            rng.random(),
+            "",
+            f"T{index:012d}",
+        )
+
+
+def time_configuration(
+    path: Path,
+    pragmas: dict[str, Any],
+    insert: Callable[[Iterable[tuple]], None],
+    args: Namespace,
+) -> tuple[float, float]:
+    """Return the seconds taken to insert the rows and to query an asset."""
+    database = SqliteDatabase(path, pragmas=pragmas)
+    database.bind([IRRecord])
+    database.connect()
+    database.create_tables([IRRecord])
+
+    start = time.perf_counter()
+    insert(generate_rows(args.rows, args.seed))
+    inserted = time.perf_counter() - start
+
+    start = time.perf_counter()
+    query = (
+        IRRecord.select()
+        .where(IRRecord.asset == assets[0])
+        .order_by(IRRecord.datetime, IRRecord.file, IRRecord.row)
+        .tuples()
+    )
+    sum(1 for _ in query.iterator())
+    queried = time.perf_counter() - start
+
+    database.close()
+
+    return inserted, queried
+
+
+def get_arguments() -> Namespace:
+    parser = ArgumentParser(
+        description="Time bulk inserts of IR rows into SQLite."
+    )
+
+    parser.add_argument(
+        "--rows",
+        type=int,
+        default=1_000_000,
+        help="The number of IR rows to insert.",
+    )
+
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="The seed for the synthetic rows.",
+    )
+
+    return parser.parse_args(sys.argv[1:])
+
+
+def main() -> None:
+    args = get_arguments()
+
+    print(
+        f"{'Settings':<10}{'Rows':>10}{'Insert':>10}{'Rows/s':>12}{'Query':>10}"
+    )
+
+    with TemporaryDirectory(prefix="archive-db-") as directory:
+        for name, (pragmas, insert) in configurations.items():
+            path = Path(directory, f"{name}.db")
+            inserted, queried = time_configuration(path, pragmas, insert, args)
+
+            print(
+                f"{name:<10}{args.rows:>10}{inserted:>9.2f}s"
+                f"{args.rows / inserted:>12.0f}{queried:>9.2f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+"""Generate synthetic exchange exports for benchmarking the pipeline.
+
+The rows of the sample exports in `docs/samples/in` are used as templates.
+Each generated row copies a random template row, moves it forward in time
+and scales its amounts, so the output keeps the exact layout the scanners
+expect while growing to any size. The same seed always produces the same
+files.
+
+Usage:
+    python -m benchmarks.generator --rows 100000 --output-dir data/in
+"""
+
+import csv
+import re
+import string
+import sys
+from argparse import ArgumentParser, Namespace
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from random import Random
+from typing import Callable, Iterator, Union
+
+# Sample exports used as templates for the generated rows.
+__samples__: Path = Path(__file__).parent.parent / "docs" / "samples" / "in"
+
+# Generated transactions are spread over this period of time.
+__start__: datetime = datetime(2020, 1, 1, tzinfo=timezone.utc)
+__span__: timedelta = timedelta(days=3 * 365)
+
+# Amounts written inside Coinbase notes, e.g. "0.00094589" or "$10.00".
+__amount__ = re.compile(r"\d+\.\d+")
+
+# Assets included in the generated Robinhood 1099.
+robinhood_assets: list[str] = ["BTC", "ETH", "LTC", "DOGE"]
+
+Row = list[str]
+
+
+def read_template(filename: str) -> tuple[Row, list[Row]]:
+    """Return the header and rows of a sample export."""
+    with open(__samples__ / filename, mode="r", newline="") as file:
+        rows = list(csv.reader(file))
+
+    return rows[0], rows[1:]
+
+
+def scale(value: str, factor: float) -> str:
+    """Scale a numeric string, keeping its number of decimal places."""
+    if not value:
+        return value
+
+    if "e" in value.lower():
+        return repr(float(value) * factor)
+
+    decimals = len(value.split(".")[1]) if "." in value else 0
+
+    return f"{float(value) * factor:.{decimals}f}"
+
+
+def get_timestamps(rows: int, rng: Random) -> Iterator[datetime]:
+    """Yield `rows` increasing timestamps spread over the benchmark period."""
+    interval = __span__.total_seconds() / max(rows, 1)
+    timestamp = __start__
+
+    for _ in range(rows):
+        timestamp += timedelta(seconds=rng.expovariate(1 / interval))
+        yield timestamp
+
+
+def get_id(rng: Random, *lengths: int) -> str:
+    """Return a random Kraken style identifier, e.g. "T67GEA-JUY4E-IWYJ4Q"."""
+    alphabet = string.ascii_uppercase + string.digits
+
+    return "-".join(
+        "".join(rng.choices(alphabet, k=length)) for length in lengths
+    )
+
+
+def generate_coinbase(rows: int, rng: Random) -> Iterator[Row]:
+    header, templates = read_template("in-coinbase.csv")
+    yield header
+
+    for timestamp in get_timestamps(rows, rng):
+        row = list(rng.choice(templates))
+        factor = rng.uniform(0.5, 1.5)
+
+        row[0] = timestamp.strftime("%Y-%m-%dT%H:%M:%SZ")
+        # Quantity, subtotal, total and fees
+        for column in (3, 6, 7, 8):
+            row[column] = scale(row[column], factor)
+        row[9] = __amount__.sub(
+            lambda match: scale(match.group(), factor), row[9]
+        )
+
+        yield row
+
+
+def generate_coinbase_pro(rows: int, rng: Random) -> Iterator[Row]:
+    header, templates = read_template("in-coinbase-pro.csv")
+    yield header
+
+    trade_id = int(templates[0][1])
+
+    for timestamp in get_timestamps(rows, rng):
+        row = list(rng.choice(templates))
+        factor = rng.uniform(0.5, 1.5)
+        trade_id += rng.randint(1, 1000)
+
+        row[1] = str(trade_id)
+        row[4] = timestamp.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+        # Size, fee and total
+        for column in (5, 8, 9):
+            row[column] = scale(row[column], factor)
+
+        yield row
+
+
+def generate_kraken(rows: int, rng: Random) -> Iterator[Row]:
+    header, templates = read_template("in-kraken.csv")
+    yield header
+
+    for timestamp in get_timestamps(rows, rng):
+        row = list(rng.choice(templates))
+        factor = rng.uniform(0.5, 1.5)
+
+        row[0] = get_id(rng, 6, 5, 6)
+        row[1] = get_id(rng, 6, 5, 6)
+        row[3] = timestamp.strftime("%Y-%m-%d %H:%M:%S.%f")[:-2]
+        # Cost, fee and volume
+        for column in (7, 8, 9):
+            row[column] = scale(row[column], factor)
+
+        yield row
+
+
+def generate_robinhood(rows: int, rng: Random) -> Iterator[Row]:
+    yield [
+        "Asset Name",
+        "Received Date",
+        "Cost Basis",
+        "Date Sold",
+        "Proceeds",
+    ]
+
+    for timestamp in get_timestamps(rows, rng):
+        received = timestamp - timedelta(days=rng.randint(1, 720))
+        cost_basis = rng.uniform(1, 1000)
+        proceeds = cost_basis * rng.uniform(0.5, 2)
+
+        yield [
+            rng.choice(robinhood_assets),
+            received.strftime("%m/%d/%y"),
+            f"{cost_basis:.2f}",
+            timestamp.strftime("%m/%d/%y"),
+            f"{proceeds:.2f}",
+        ]
+
+
+# Generated exports keyed by dataset type, with the name of the output file.
+exports: dict[str, tuple[str, Callable[[int, Random], Iterator[Row]]]] = {
+    "coinbase_transaction": ("in-coinbase.csv", generate_coinbase),
+    "coinbase_pro_fill": ("in-coinbase-pro.csv", generate_coinbase_pro),
+    "kraken_trade": ("in-kraken.csv", generate_kraken),
+    "robinhood_1099": ("in-robinhood-1099.csv", generate_robinhood),
+}
+
+
+def generate_exports(
+    output_dir: Union[str, Path],
+    rows: int,
+    seed: int = 0,
+) -> dict[str, Path]:
+    """Write a synthetic export of every supported dataset.
+
+    Args:
+        output_dir: The directory to write the exports to.
+        rows: The number of rows in each export, excluding the header.
+        seed: The seed for the random number generator.
+
+    Returns:
+        A mapping of dataset types to the paths of the generated exports.
+    """
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    file_paths = {}
+
+    for offset, (dataset, (filename, generate)) in enumerate(exports.items()):
+        file_path = Path(output_dir, filename)
+        # Every export has its own stream, so adding one does not shift another
+        rng = Random(seed * len(exports) + offset)
+        # Kraken quotes every field of its exports
+        quoting = (
+            csv.QUOTE_ALL if dataset == "kraken_trade" else csv.QUOTE_MINIMAL
+        )
+
+        with open(file_path, mode="w", newline="") as file:
+            writer = csv.writer(file, quoting=quoting)
+            writer.writerows(generate(rows, rng))
+
+        file_paths[dataset] = file_path
+
+    return file_paths
+
+
+def get_arguments() -> Namespace:
+    parser = ArgumentParser(
+        description="Generate synthetic exchange exports for benchmarking."
+    )
+
+    parser.add_argument(
+        "--rows",
+        type=int,
+        default=100_000,
+        help="The number of rows in each export.",
+    )
+
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="The seed for the random number generator.",
+    )
+
+    parser.add_argument(
+        "--output-dir",
+        type=str,
+        default="data/in",
+        help="The directory to write the exports to.",
+    )
+
+    return parser.parse_args(sys.argv[1:])
+
+
+def main() -> None:
+    args = get_arguments()
+
+    for dataset, file_path in generate_exports(
+        args.output_dir, args.rows, args.seed
+    ).items():
+        print(f"{dataset}: {file_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Compare the per-record memory footprint of dict-backed and slotted models.
+
+Every model is instantiated once per row of a synthetic export, first as a
+dict-backed twin of the dataclass and then as the slotted dataclass shipped
+in `archive`. The memory allocated per record is measured with tracemalloc.
+
+Field values are shared between rows, so only the memory taken by the records
+themselves is measured, not the strings and floats they point to.
+
+Usage:
+    python -m benchmarks.memory --rows 1000000
+"""
+
+import gc
+import sys
+import tracemalloc
+from argparse import ArgumentParser, Namespace
+from dataclasses import MISSING, field, fields, make_dataclass
+from typing import Any
+
+from archive.exchange.coinbase.models import CoinbaseNote, CoinbaseTransaction
+from archive.exchange.coinbase_pro.models import CoinbaseProTransaction
+from archive.exchange.kraken.models import KrakenTransaction
+from archive.exchange.robinhood.models import RobinhoodTransaction
+from archive.f8949.models import F8949Transaction
+from archive.gl.models import GLTransaction
+from archive.ir.models import IRTransaction
+
+models = [
+    CoinbaseNote,
+    CoinbaseTransaction,
+    KrakenTransaction,
+    CoinbaseProTransaction,
+    RobinhoodTransaction,
+    IRTransaction,
+    GLTransaction,
+    F8949Transaction,
+]
+
+
+def get_arguments() -> Namespace:
+    parser = ArgumentParser(
+        description="Measure the memory used per record by each model."
+    )
+
+    parser.add_argument(
+        "--rows",
+        type=int,
+        default=1_000_000,
+        help="The number of synthetic records to create per model.",
+    )
+
+    return parser.parse_args(sys.argv[1:])
+
+
+def get_dict_model(model: type) -> type:
+    """Build a dict-backed dataclass with the same fields as `model`."""
+    dict_fields = []
+
+    for model_field in fields(model):
+        if model_field.default is not MISSING:
+            default = field(default=model_field.default)
+        elif model_field.default_factory is not MISSING:
+            default = field(default_factory=model_field.default_factory)
+        else:
+            default = field()
+
+        dict_fields.append((model_field.name, model_field.type, default))
+
+    return make_dataclass(model.__name__, dict_fields)
+
+
+def get_values(model: type, note: type) -> list[Any]:
+    """Return synthetic values for every field of a model."""
+    values = []
+
+    for model_field in fields(model):
+        if model_field.type is float:
+            values.append(0.00000001)
+        elif model_field.type is int:
+            values.append(1)
+        elif model_field.type is CoinbaseNote:
+            values.append(note(*get_values(CoinbaseNote, note)))
+        else:
+            values.append(model_field.name)
+
+    return values
+
+
+def measure(model: type, note: type, rows: int) -> int:
+    """Return the number of bytes allocated per record."""
+    values = get_values(model, note)
+    records = [None] * rows
+
+    gc.collect()
+    tracemalloc.start()
+
+    for row in range(rows):
+        records[row] = model(*values)
+
+    current, _ = tracemalloc.get_traced_memory()
+
+    tracemalloc.stop()
+    del records
+
+    return current // rows
+
+
+def main() -> None:
+    args = get_arguments()
+    dict_note = get_dict_model(CoinbaseNote)
+
+    print(f"{'Model':<24}{'dict':>10}{'slots':>10}{'saved':>10}")
+
+    for model in models:
+        dict_model = get_dict_model(model)
+        dict_size = measure(dict_model, dict_note, args.rows)
+        slot_size = measure(model, CoinbaseNote, args.rows)
+        saved = 1 - slot_size / dict_size
+
+        print(
+            f"{model.__name__:<24}{dict_size:>9}B{slot_size:>9}B{saved:>10.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
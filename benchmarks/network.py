@@ -0,0 +1,118 @@
+"""Serve deterministic exchange API responses so benchmarks run offline.
+
+The shared session in `archive.exchange.session` is replaced by a stub that
+answers the public endpoints the pipeline reads from, and the rate limits of
+the exchange APIs are lifted. Spot prices are derived from a hash of the
+request, so every run sees the same prices.
+"""
+
+import zlib
+from pathlib import Path
+from typing import Any, Optional, Union
+
+# Kraken pairs that appear in the sample exports, along with their USD legs.
+kraken_pairs: dict[str, tuple[str, str, str]] = {
+    "XXBTZUSD": ("XBT/USD", "XXBT", "ZUSD"),
+    "XETHZUSD": ("ETH/USD", "XETH", "ZUSD"),
+    "XLTCZUSD": ("LTC/USD", "XLTC", "ZUSD"),
+    "XXMRZUSD": ("XMR/USD", "XXMR", "ZUSD"),
+    "XXRPZUSD": ("XRP/USD", "XXRP", "ZUSD"),
+    "XZECZUSD": ("ZEC/USD", "XZEC", "ZUSD"),
+    "XXMRXXBT": ("XMR/XBT", "XXMR", "XXBT"),
+    "DOTUSD": ("DOT/USD", "DOT", "ZUSD"),
+    "LINKUSD": ("LINK/USD", "LINK", "ZUSD"),
+    "USDCUSD": ("USDC/USD", "USDC", "ZUSD"),
+}
+
+
+def get_price(*key: Any) -> float:
+    """Return a deterministic price between 1 and 50,000 for a request."""
+    digest = zlib.crc32(repr(key).encode())
+    return round(1 + (digest % 5_000_000) / 100, 2)
+
+
+def get_asset_pairs() -> dict[str, dict[str, str]]:
+    return {
+        pair: {
+            "altname": pair,
+            "wsname": wsname,
+            "base": base,
+            "quote": quote,
+        }
+        for pair, (wsname, base, quote) in kraken_pairs.items()
+    }
+
+
+class StubResponse:
+    status_code: int = 200
+
+    def __init__(self, payload: dict[str, Any]):
+        self.payload = payload
+
+    def json(self) -> dict[str, Any]:
+        return self.payload
+
+    def raise_for_status(self) -> None:
+        pass
+
+
+class StubSession:
+    """Stands in for the shared `requests.Session` of the exchange APIs."""
+
+    def __init__(self):
+        self.requests = 0
+
+    def get(
+        self,
+        url: str,
+        params: Optional[dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> StubResponse:
+        self.requests += 1
+        params = params or {}
+
+        if url.endswith("/AssetPairs"):
+            return StubResponse({"error": [], "result": get_asset_pairs()})
+
+        if url.endswith("/Trades"):
+            pair = params["pair"]
+            price = get_price(pair, params.get("since"))
+            return StubResponse(
+                {"error": [], "result": {pair: [[str(price), "1"]]}}
+            )
+
+        # Coinbase spot prices
+        price = get_price(url, params.get("date"))
+        return StubResponse({"data": {"amount": str(price)}})
+
+    def post(self, url: str, **kwargs: Any) -> StubResponse:
+        raise RuntimeError(f"Benchmarks never place orders: {url}")
+
+
+def install(cache_dir: Union[str, Path]) -> StubSession:
+    """Route the exchange APIs through a stub session.
+
+    Args:
+        cache_dir: The directory for the spot price cache and Kraken's table
+            of asset pairs.
+
+    Returns:
+        The stub session, which counts the requests it served.
+    """
+    from archive.exchange import cache, session
+    from archive.exchange.coinbase import api as coinbase_api
+    from archive.exchange.kraken import api as kraken_api
+    from archive.tools.limit import TokenBucket
+
+    stub = StubSession()
+    session._session = stub
+
+    cache.__cache__ = str(Path(cache_dir, "prices.db"))
+    cache.set_cache_only(False)
+    kraken_api.__pairs__ = Path(cache_dir, "kraken-asset-pairs.json")
+
+    # Requests to the stub are free, so the rate limits are lifted
+    coinbase_api.__bucket__ = TokenBucket(rate=1e9, capacity=1e9)
+    kraken_api.__bucket__ = TokenBucket(rate=1e9, capacity=1e9)
+
+    return stub
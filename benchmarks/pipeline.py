@@ -0,0 +1,263 @@
+"""Time each stage of the IR -> GL -> 8949 pipeline on synthetic exports.
+
+Exports of every supported dataset are generated into a scratch workspace,
+then each stage runs in a fresh interpreter against the output of the
+stage before it. Requests to the exchange APIs are served by a stub, so the
+benchmark runs offline and is not slowed down by rate limits.
+
+For every stage the number of rows it read, the wall time, the throughput
+and the peak resident set size of its process are reported.
+
+Usage:
+    python -m benchmarks.pipeline --rows 100000 --asset BTC --label bitcoin
+"""
+
+import os
+import resource
+import shutil
+import sys
+import time
+from argparse import ArgumentParser, Namespace
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from multiprocessing import get_context
+from pathlib import Path
+from tempfile import mkdtemp
+from typing import Callable
+
+from benchmarks import network
+from benchmarks.generator import generate_exports
+
+# Directories the pipeline reads from and writes to, relative to the workspace.
+directories: list[str] = [
+    "data/in",
+    "data/ir",
+    "data/gl",
+    "data/f8949",
+    "data/f1099",
+    "data/out",
+    "data/cache",
+]
+
+# Exchange datasets processed into IR files.
+exchanges: list[str] = [
+    "coinbase_transaction",
+    "coinbase_pro_fill",
+    "kraken_trade",
+]
+
+# Tax year of the linked Form 8949, within the generated period.
+__year__: str = "2021"
+
+
+def count_rows(*file_paths: Path) -> int:
+    """Return the number of rows in CSV files, excluding their headers."""
+    rows = 0
+
+    for file_path in file_paths:
+        with open(file_path, mode="rb") as file:
+            rows += max(sum(1 for _ in file) - 1, 0)
+
+    return rows
+
+
+def run_ir(args: Namespace) -> int:
+    from archive.ir.process import process_ir
+
+    file_paths = [Path("data/in", args.exports[name]) for name in exchanges]
+
+    for exchange, file_path in zip(exchanges, file_paths):
+        process_ir(
+            args.asset, args.label, exchange, file_path, "data/ir", True
+        )
+
+    return count_rows(*file_paths)
+
+
+def run_gl(args: Namespace) -> int:
+    from archive.gl.process import process_gl
+
+    process_gl(args.asset, args.label, "data/ir", "data/gl", True)
+
+    return count_rows(*Path("data/ir").glob(f"ir-*-{args.label}.csv"))
+
+
+def run_f8949(args: Namespace) -> int:
+    from archive.f8949.process import process_f8949
+
+    file_path = Path("data/gl", f"gl-{args.label}.csv")
+    process_f8949(file_path, args.label, "data/f8949")
+
+    return count_rows(file_path)
+
+
+def run_f1099(args: Namespace) -> int:
+    from archive.f1099.process import process_f1099
+
+    f8949_file_path = Path("data/f8949", f"f8949-{args.label}.csv")
+    robinhood_file_path = Path("data/in", args.exports["robinhood_1099"])
+    process_f1099(
+        f8949_file_path,
+        str(robinhood_file_path),
+        args.asset,
+        args.label,
+        "data/f1099",
+    )
+
+    return count_rows(f8949_file_path, robinhood_file_path)
+
+
+def run_link(args: Namespace) -> int:
+    from archive.link.process import process_form_link
+
+    process_form_link(
+        "data/out", "data/f8949", "data/f1099", __year__, args.label
+    )
+
+    return count_rows(
+        *Path("data/f8949").glob("*.csv"),
+        *Path("data/f1099").glob("*.csv"),
+    )
+
+
+# Stages in the order they feed into each other.
+scenarios: dict[str, Callable[[Namespace], int]] = {
+    "ir": run_ir,
+    "gl": run_gl,
+    "f8949": run_f8949,
+    "f1099": run_f1099,
+    "link": run_link,
+}
+
+
+def get_peak_rss() -> float:
+    """Return the peak resident set size of this process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kibibytes, macOS reports bytes
+    if sys.platform == "darwin":
+        peak //= 1024
+    return peak / 1024
+
+
+def run_scenario(
+    name: str,
+    workspace: str,
+    args: Namespace,
+) -> tuple[int, float, float]:
+    """Run a single stage inside the workspace.
+
+    Returns:
+        The number of rows read, the elapsed seconds and the peak RSS in MiB.
+    """
+    from archive.tools.logger import configure_logging
+
+    os.chdir(workspace)
+    configure_logging()
+    network.install("data/cache")
+
+    # The stages print every table they write
+    with open(os.devnull, mode="w") as devnull, redirect_stdout(devnull):
+        start = time.perf_counter()
+        rows = scenarios[name](args)
+        elapsed = time.perf_counter() - start
+
+    return rows, elapsed, get_peak_rss()
+
+
+def get_arguments() -> Namespace:
+    parser = ArgumentParser(
+        description="Time each stage of the pipeline on synthetic exports."
+    )
+
+    parser.add_argument(
+        "--rows",
+        type=int,
+        default=100_000,
+        help="The number of rows in each generated export.",
+    )
+
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="The seed for the synthetic exports.",
+    )
+
+    parser.add_argument(
+        "--asset",
+        type=str,
+        default="BTC",
+        help="The asset to run the pipeline for.",
+    )
+
+    parser.add_argument(
+        "--label",
+        type=str,
+        default="bitcoin",
+        help="The label of the output files.",
+    )
+
+    parser.add_argument(
+        "--scenario",
+        type=str,
+        nargs="+",
+        choices=list(scenarios),
+        default=list(scenarios),
+        help="The stages to time. Each stage reads the output of the last.",
+    )
+
+    parser.add_argument(
+        "--workspace",
+        type=str,
+        default="",
+        help="The scratch directory to run in. Defaults to a temporary one.",
+    )
+
+    parser.add_argument(
+        "--keep",
+        action="store_true",
+        help="Keep the workspace after the benchmark finishes.",
+    )
+
+    return parser.parse_args(sys.argv[1:])
+
+
+def main() -> None:
+    args = get_arguments()
+    workspace = Path(args.workspace or mkdtemp(prefix="archive-bench-"))
+    workspace = workspace.resolve()
+
+    for directory in directories:
+        Path(workspace, directory).mkdir(parents=True, exist_ok=True)
+
+    file_paths = generate_exports(workspace / "data/in", args.rows, args.seed)
+    args.exports = {name: path.name for name, path in file_paths.items()}
+
+    print(f"{'Stage':<10}{'Rows':>12}{'Seconds':>10}{'Rows/s':>12}{'RSS':>10}")
+
+    # A fresh interpreter per stage keeps the peak RSS of each one separate
+    context = get_context("spawn")
+
+    try:
+        for name in scenarios:
+            if name not in args.scenario:
+                continue
+
+            with ProcessPoolExecutor(1, mp_context=context) as executor:
+                rows, elapsed, peak = executor.submit(
+                    run_scenario, name, str(workspace), args
+                ).result()
+
+            print(
+                f"{name:<10}{rows:>12}{elapsed:>10.2f}"
+                f"{rows / elapsed:>12.0f}{peak:>7.1f}MiB"
+            )
+    finally:
+        if args.keep:
+            print(f"Workspace: {workspace}")
+        elif not args.workspace:
+            shutil.rmtree(workspace)
+
+
+if __name__ == "__main__":
+    main()
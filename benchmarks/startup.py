@@ -0,0 +1,78 @@
+"""Time how long a fresh interpreter takes to import a module of `archive`.
+
+Every run imports the module in a new process from an empty scratch
+directory, so there is no `data/log` to write to and the import must not
+need one. The number of log files left behind by the imports is reported
+alongside the timings.
+
+Usage:
+    python -m benchmarks.startup --module archive.gl.process --runs 20
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+from argparse import ArgumentParser, Namespace
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+# Root of the repository, so `archive` can be imported from anywhere.
+__root__: Path = Path(__file__).parent.parent
+
+
+def time_import(module: str, cwd: str) -> float:
+    """Return the seconds taken to start Python and import a module."""
+    env = {**os.environ, "PYTHONPATH": str(__root__)}
+    command = [sys.executable, "-c", f"import {module}"]
+
+    start = time.perf_counter()
+    subprocess.run(command, cwd=cwd, env=env, check=True)
+
+    return time.perf_counter() - start
+
+
+def get_arguments() -> Namespace:
+    parser = ArgumentParser(
+        description="Time how long a fresh interpreter takes to import."
+    )
+
+    parser.add_argument(
+        "--module",
+        type=str,
+        default="archive.gl.process",
+        help="The module to import.",
+    )
+
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=20,
+        help="The number of imports to time.",
+    )
+
+    return parser.parse_args(sys.argv[1:])
+
+
+def main() -> None:
+    args = get_arguments()
+
+    with TemporaryDirectory(prefix="archive-startup-") as cwd:
+        # The interpreter on its own, to subtract from the import
+        baseline = [time_import("sys", cwd) for _ in range(args.runs)]
+        timings = [time_import(args.module, cwd) for _ in range(args.runs)]
+        log_files = list(Path(cwd).rglob("*.log"))
+
+    interpreter = statistics.median(baseline) * 1000
+    total = statistics.median(timings) * 1000
+
+    print(f"Module:       {args.module}")
+    print(f"Interpreter:  {interpreter:.1f} ms")
+    print(f"Import:       {total - interpreter:.1f} ms")
+    print(f"Total:        {total:.1f} ms (best {min(timings) * 1000:.1f} ms)")
+    print(f"Log files:    {len(log_files)}")
+
+
+if __name__ == "__main__":
+    main()
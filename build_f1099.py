@@ -2,6 +2,9 @@ import sys
 from argparse import ArgumentParser, Namespace
 
 from archive.f1099.process import process_f1099
+from archive.tools.io import parse_preview, set_preview, set_quiet
+from archive.tools.logger import configure_logging
+from archive.warehouse.store import set_warehouse
 
 
 def get_arguments() -> Namespace:
@@ -58,11 +61,45 @@ def get_arguments() -> Namespace:
         help="The end date for the range of transactions (YYYY-MM-DD).",
     )
 
+    parser.add_argument(
+        "--warehouse",
+        type=str,
+        nargs="?",
+        const="data/warehouse.db",
+        default=None,
+        metavar="PATH",
+        help="Hand off between stages through a SQLite warehouse (default: data/warehouse.db).",
+    )
+
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Do not print tables to the console.",
+    )
+
+    parser.add_argument(
+        "--preview",
+        type=parse_preview,
+        default=None,
+        metavar="N",
+        help="Only print the first and last N rows of each table.",
+    )
+
     return parser.parse_args(sys.argv[1:])
 
 
 def main():
     args = get_arguments()
+    configure_logging()
+
+    if args.quiet:
+        set_quiet()
+
+    if args.preview is not None:
+        set_preview(args.preview)
+
+    if args.warehouse:
+        set_warehouse(args.warehouse)
 
     process_f1099(
         form8949_filepath=args.form8949,
@@ -1,7 +1,11 @@
 import sys
 from argparse import ArgumentParser, Namespace
 
+from archive.gl.parser import methods
 from archive.gl.process import process_gl
+from archive.tools.io import parse_preview, set_preview, set_quiet
+from archive.tools.logger import configure_logging, set_tracing
+from archive.warehouse.store import set_warehouse
 
 
 def get_arguments() -> Namespace:
@@ -36,13 +40,77 @@ def get_arguments() -> Namespace:
         help="A label to be appended to the output file name.",
     )
 
+    parser.add_argument(
+        "--method",
+        type=str,
+        choices=methods,
+        default="average",
+        help="The cost basis method: the average cost, or lots sold first in, last in or highest cost first out.",
+    )
+
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Ignore the manifest and rebuild every output from scratch.",
+    )
+
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Dump sampled rows of every intermediate table to the debug logs.",
+    )
+
+    parser.add_argument(
+        "--warehouse",
+        type=str,
+        nargs="?",
+        const="data/warehouse.db",
+        default=None,
+        metavar="PATH",
+        help="Hand off between stages through a SQLite warehouse (default: data/warehouse.db).",
+    )
+
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Do not print tables to the console.",
+    )
+
+    parser.add_argument(
+        "--preview",
+        type=parse_preview,
+        default=None,
+        metavar="N",
+        help="Only print the first and last N rows of each table.",
+    )
+
     return parser.parse_args(sys.argv[1:])
 
 
 def main():
     args = get_arguments()
+    configure_logging()
+
+    if args.quiet:
+        set_quiet()
+
+    if args.preview is not None:
+        set_preview(args.preview)
 
-    process_gl(args.asset, args.label, args.directory, args.output_dir)
+    if args.warehouse:
+        set_warehouse(args.warehouse)
+
+    if args.trace:
+        set_tracing()
+
+    process_gl(
+        args.asset,
+        args.label,
+        args.directory,
+        args.output_dir,
+        args.rebuild,
+        args.method,
+    )
 
 
 if __name__ == "__main__":
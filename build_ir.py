@@ -1,7 +1,10 @@
 import sys
 from argparse import ArgumentParser, Namespace
 
+from archive.exchange.cache import set_cache_only
 from archive.ir.process import process_ir
+from archive.tools.io import parse_preview, set_preview, set_quiet
+from archive.tools.logger import configure_logging
 
 
 def get_arguments() -> Namespace:
@@ -36,15 +39,56 @@ def get_arguments() -> Namespace:
         help="A label to be appended to the output file name.",
     )
 
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Only use cached historical spot prices and never query an exchange.",
+    )
+
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Ignore the manifest and rebuild every output from scratch.",
+    )
+
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Do not print tables to the console.",
+    )
+
+    parser.add_argument(
+        "--preview",
+        type=parse_preview,
+        default=None,
+        metavar="N",
+        help="Only print the first and last N rows of each table.",
+    )
+
     return parser.parse_args(sys.argv[1:])
 
 
 def main():
     args = get_arguments()
+    configure_logging()
+
+    if args.quiet:
+        set_quiet()
+
+    if args.preview is not None:
+        set_preview(args.preview)
+
+    if args.offline:
+        set_cache_only()
 
     for exchange, file_path in args.exchange_file:
         process_ir(
-            args.asset, args.label, exchange, file_path, args.output_dir
+            args.asset,
+            args.label,
+            exchange,
+            file_path,
+            args.output_dir,
+            args.rebuild,
         )
 
 
@@ -2,6 +2,8 @@ import sys
 from argparse import ArgumentParser, Namespace
 
 from archive.link.process import process_form_link
+from archive.tools.io import parse_preview, set_preview, set_quiet
+from archive.tools.logger import configure_logging
 
 
 def get_arguments() -> Namespace:
@@ -44,11 +46,32 @@ def get_arguments() -> Namespace:
         help="A label to append to the output file name.",
     )
 
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Do not print tables to the console.",
+    )
+
+    parser.add_argument(
+        "--preview",
+        type=parse_preview,
+        default=None,
+        metavar="N",
+        help="Only print the first and last N rows of each table.",
+    )
+
     return parser.parse_args(sys.argv[1:])
 
 
 def main():
     args = get_arguments()
+    configure_logging()
+
+    if args.quiet:
+        set_quiet()
+
+    if args.preview is not None:
+        set_preview(args.preview)
 
     process_form_link(
         output_dir=args.output_dir,
@@ -1,10 +1,18 @@
 import sys
 from argparse import ArgumentParser, Namespace
+from pathlib import Path
+from typing import Optional, Union
 
+from archive.exchange.cache import set_cache_only
 from archive.f1099.process import process_f1099
 from archive.f8949.process import process_f8949
-from archive.gl.process import process_gl
-from archive.ir.process import process_ir
+from archive.gl.parser import methods
+from archive.gl.process import process_gl, process_gl_assets
+from archive.ir.process import process_ir, process_ir_assets
+from archive.tools.io import parse_preview, set_preview, set_quiet
+from archive.tools.jobs import describe_failure, run_jobs
+from archive.tools.logger import configure_logging, set_tracing
+from archive.warehouse.store import set_warehouse
 
 
 def get_arguments() -> Namespace:
@@ -40,6 +48,33 @@ def get_arguments() -> Namespace:
         help="A label to be appended to the output file name.",
     )
 
+    parser.add_argument(
+        "--assets",
+        type=str,
+        help="Comma separated base assets to process in a single pass, optionally labelled (e.g., BTC:bitcoin,ETH:ethereum).",
+    )
+
+    parser.add_argument(
+        "--all-assets",
+        action="store_true",
+        help="Process every asset found in the exchange files in a single pass.",
+    )
+
+    parser.add_argument(
+        "--method",
+        type=str,
+        choices=methods,
+        default="average",
+        help="The cost basis method: the average cost, or lots sold first in, last in or highest cost first out.",
+    )
+
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="The number of assets to generate GL and Form 8949 files for at once with --assets or --all-assets.",
+    )
+
     parser.add_argument(
         "--start-date",
         type=str,
@@ -80,11 +115,241 @@ def get_arguments() -> Namespace:
         help="The output directory path for Form-1099 files.",
     )
 
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Only use cached historical spot prices and never query an exchange.",
+    )
+
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Ignore the manifest and rebuild every output from scratch.",
+    )
+
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Dump sampled rows of every intermediate table to the debug logs.",
+    )
+
+    parser.add_argument(
+        "--warehouse",
+        type=str,
+        nargs="?",
+        const="data/warehouse.db",
+        default=None,
+        metavar="PATH",
+        help="Hand off between stages through a SQLite warehouse (default: data/warehouse.db).",
+    )
+
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Do not print tables to the console.",
+    )
+
+    parser.add_argument(
+        "--preview",
+        type=parse_preview,
+        default=None,
+        metavar="N",
+        help="Only print the first and last N rows of each table.",
+    )
+
     return parser.parse_args(sys.argv[1:])
 
 
+def get_assets(assets: str) -> dict[str, str]:
+    """Parse a comma separated list of assets into a mapping of asset labels.
+
+    Args:
+        assets: A string of assets, e.g. "BTC:bitcoin,ETH". Unlabelled assets
+            are labelled by their lowercase symbol.
+
+    Returns:
+        A mapping of base asset symbols to output labels.
+    """
+    labels = {}
+
+    for element in assets.split(","):
+        asset, _, label = element.strip().partition(":")
+
+        if asset:
+            labels[asset.upper()] = (label or asset).lower()
+
+    return labels
+
+
+def initialize_worker(
+    offline: bool,
+    trace: bool,
+    quiet: bool,
+    preview: Optional[int],
+    warehouse: Optional[str],
+) -> None:
+    """Restore the options a spawned worker process does not inherit."""
+    if warehouse:
+        set_warehouse(warehouse)
+
+    if quiet:
+        set_quiet()
+
+    if preview is not None:
+        set_preview(preview)
+
+    if trace:
+        set_tracing()
+
+    if offline:
+        set_cache_only()
+
+
+def process_forms(
+    args: Namespace,
+    asset: str,
+    label: str,
+    gl_file_path: Union[str, Path],
+) -> Union[str, Path]:
+    """Generate the Form 8949 of an asset and merge its Robinhood 1099.
+
+    Returns:
+        The path to the Form 8949 CSV file.
+    """
+    # Step 3: Process GL transactions and generate Form-8949 CSV
+    f8949_file_path = process_f8949(
+        gl_file_path,
+        label,
+        args.f8949_output_dir,
+        args.start_date,
+        args.end_date,
+    )
+
+    # Step 4: Process Form-1099 Transactions and generate Form-8949 CSV
+    if args.robinhood1099:
+        process_f1099(
+            f8949_file_path,
+            args.robinhood1099,
+            asset,
+            label,
+            args.f1099_output_dir,
+            args.start_date,
+            args.end_date,
+        )
+
+    return f8949_file_path
+
+
+def report_failures(
+    failures: dict[str, Exception],
+    labels: dict[str, str],
+) -> None:
+    """Print a summary of the assets that could not be processed."""
+    print(f"Failed to process {len(failures)} asset(s):", file=sys.stderr)
+
+    for asset, error in failures.items():
+        label = labels.get(asset, asset.lower())
+        print(
+            f"  {asset} ({label}): {describe_failure(error)}", file=sys.stderr
+        )
+
+
+def process_assets(
+    args: Namespace,
+    assets: Optional[dict[str, str]],
+) -> dict[str, Exception]:
+    """Process every asset with a single scan of each input file.
+
+    The exchange files are processed in this process. The GL and Form 8949
+    files of each asset are independent, so they are generated by `--jobs`
+    worker processes.
+
+    Args:
+        args: The parsed command-line arguments.
+        assets: A mapping of base asset symbols to output labels, or None to
+            process every asset found in the exchange files.
+
+    Returns:
+        The exception of every asset that failed, in the order of the assets.
+    """
+    labels = dict(assets) if assets is not None else {}
+
+    # Step 1: Process each exchange CSV file once for all assets
+    for exchange, file_path in args.exchange_file:
+        labels.update(
+            process_ir_assets(
+                assets,
+                exchange,
+                file_path,
+                args.ir_output_dir,
+                args.rebuild,
+            )
+        )
+
+    # Spawned workers do not inherit the options set from the command line
+    initargs = (
+        args.offline,
+        args.trace,
+        args.quiet,
+        args.preview,
+        args.warehouse,
+    )
+
+    # Step 2: Process IR transactions and generate GL transactions
+    failures: dict[str, Exception] = {}
+    gl_file_paths = process_gl_assets(
+        labels,
+        args.ir_output_dir,
+        args.gl_output_dir,
+        args.rebuild,
+        args.method,
+        args.jobs,
+        failures,
+        initialize_worker,
+        initargs,
+    )
+
+    # Steps 3 and 4: Generate the Form-8949 and Form-1099 CSV of each asset
+    tasks = {
+        asset: (args, asset, labels[asset], gl_file_path)
+        for asset, gl_file_path in gl_file_paths.items()
+    }
+    _, errors = run_jobs(
+        process_forms, tasks, args.jobs, initialize_worker, initargs
+    )
+    failures.update(errors)
+
+    return {asset: failures[asset] for asset in labels if asset in failures}
+
+
 def main() -> None:
     args = get_arguments()
+    configure_logging()
+
+    if args.quiet:
+        set_quiet()
+
+    if args.preview is not None:
+        set_preview(args.preview)
+
+    if args.warehouse:
+        set_warehouse(args.warehouse)
+
+    if args.trace:
+        set_tracing()
+
+    if args.offline:
+        set_cache_only()
+
+    if args.all_assets or args.assets is not None:
+        assets = None if args.all_assets else get_assets(args.assets)
+        failures = process_assets(args, assets)
+
+        if failures:
+            report_failures(failures, assets or {})
+            sys.exit(1)
+
+        return None
 
     # Step 1: Process exchange CSV files for each exchange
     for exchange, file_path in args.exchange_file:
@@ -94,11 +359,17 @@ def main() -> None:
             exchange,
             file_path,
             args.ir_output_dir,
+            args.rebuild,
         )
 
     # Step 2: Process IR transactions and generate GL transactions
     gl_file_path = process_gl(
-        args.asset, args.label, "data/ir/", args.gl_output_dir
+        args.asset,
+        args.label,
+        "data/ir/",
+        args.gl_output_dir,
+        args.rebuild,
+        args.method,
     )
 
     if not gl_file_path:
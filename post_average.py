@@ -1,9 +1,18 @@
+import signal
 import sys
 from argparse import ArgumentParser, Namespace
+from threading import Event
 
 from archive.average.cost import execute_cost_average
+from archive.average.daemon import create_schedule, load_schedules, run_daemon
 from archive.average.dynamic import execute_dynamic_cost_average
+from archive.average.portfolio import (
+    convert_portfolio_to_csv,
+    execute_portfolio,
+)
 from archive.average.value import execute_value_average
+from archive.tools.io import parse_preview, print_csv, set_preview, set_quiet
+from archive.tools.logger import configure_logging
 
 
 def get_arguments() -> Namespace:
@@ -45,13 +54,105 @@ def get_arguments() -> Namespace:
         help="Simulate or execute value averaging.",
     )
 
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Keep running and place orders on a schedule instead of once.",
+    )
+
+    parser.add_argument(
+        "--schedules",
+        type=str,
+        default=None,
+        help="JSON file of the schedules to run with --daemon (default: one schedule from the environment and options)",
+    )
+
+    parser.add_argument(
+        "--portfolio",
+        type=str,
+        default=None,
+        help="JSON file of the products to average into in one pass, in the format of --schedules",
+    )
+
+    parser.add_argument(
+        "--status",
+        type=str,
+        default="data/average/status.json",
+        help="File the daemon writes its status to (default: status.json)",
+    )
+
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Do not print tables to the console.",
+    )
+
+    parser.add_argument(
+        "--preview",
+        type=parse_preview,
+        default=None,
+        metavar="N",
+        help="Only print the first and last N rows of each table.",
+    )
+
     return parser.parse_args(sys.argv[1:])
 
 
+def portfolio(args: Namespace) -> None:
+    orders = execute_portfolio(load_schedules(args.portfolio), args.execute)
+
+    print_csv(convert_portfolio_to_csv(orders))
+
+    if any(order.result not in ("ok", "hold") for order in orders):
+        sys.exit(1)
+
+
+def daemon(args: Namespace) -> None:
+    if args.schedules:
+        schedules = load_schedules(args.schedules)
+    else:
+        if args.dynamic_average:
+            strategy = "dynamic"
+        elif args.value_average:
+            strategy = "value"
+        else:
+            strategy = "cost"
+
+        schedules = [
+            create_schedule(
+                {
+                    "name": strategy,
+                    "strategy": strategy,
+                    "file": args.file,
+                    "execute": args.execute,
+                }
+            )
+        ]
+
+    stop = Event()
+
+    # systemd stops the service with SIGTERM
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, lambda *_: stop.set())
+
+    run_daemon(schedules, args.status, stop)
+
+
 def main():
     args = get_arguments()
+    configure_logging()
+
+    if args.quiet:
+        set_quiet()
+
+    if args.preview is not None:
+        set_preview(args.preview)
 
-    if args.dynamic_average:
+    if args.daemon:
+        daemon(args)
+    elif args.portfolio:
+        portfolio(args)
+    elif args.dynamic_average:
         execute_dynamic_cost_average(args.file, args.execute)
     elif args.value_average:
         execute_value_average(args.file, args.execute)
@@ -2,6 +2,8 @@ import sys
 from argparse import ArgumentParser, Namespace
 
 from archive.average.cost import execute_cost_average
+from archive.tools.io import parse_preview, set_preview, set_quiet
+from archive.tools.logger import configure_logging
 
 
 def get_arguments() -> Namespace:
@@ -22,11 +24,32 @@ def get_arguments() -> Namespace:
         help="Execute order based on set environment variables",
     )
 
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Do not print tables to the console.",
+    )
+
+    parser.add_argument(
+        "--preview",
+        type=parse_preview,
+        default=None,
+        metavar="N",
+        help="Only print the first and last N rows of each table.",
+    )
+
     return parser.parse_args(sys.argv[1:])
 
 
 def main():
     args = get_arguments()
+    configure_logging()
+
+    if args.quiet:
+        set_quiet()
+
+    if args.preview is not None:
+        set_preview(args.preview)
 
     execute_cost_average(args.file, args.execute)
 
@@ -1,6 +1,7 @@
 #!/usr/bin/env bash
 
 declare STDERR="data/log/stderr.out"
+declare JOBS="${JOBS:-$(nproc)}"
 
 declare -A assets=(
     ["USDC"]="usdcoin"
@@ -55,6 +56,9 @@ declare -A assets=(
 
 mkdir -p data/{in,out,log,ir,gl,f1099,f8949}
 
+declare -a robinhood_assets=()
+declare -a default_assets=()
+
 for asset in "${!assets[@]}"; do
     label="${assets[$asset]}"
 
@@ -64,17 +68,8 @@ for asset in "${!assets[@]}"; do
         #    custom_command
         #    ;;
         "BTC"|"LTC"|"ETH")
-            python main.py \
-                --exchange-file coinbase_transaction data/in/coinbase-transaction.csv \
-                --exchange-file coinbase_pro_fill data/in/coinbase-pro-fill.csv \
-                --exchange-file kraken_trade data/in/kraken-trade.csv \
-                --robinhood1099 data/in/robinhood-crypto-1099.csv \
-                --asset "$asset" --label "$label"
-
-            if [ $? -ne 0 ]; then
-                echo "Error occurred while processing asset $asset ($label)" >> $STDERR
-            fi
-            ;;        
+            robinhood_assets+=("$asset:$label")
+            ;;
         "USDC")
             python main.py \
                 --exchange-file coinbase_transaction data/in/coinbase-transaction.csv \
@@ -100,20 +95,30 @@ for asset in "${!assets[@]}"; do
             fi
             ;;
         *)
-            python main.py \
-                --exchange-file coinbase_transaction data/in/coinbase-transaction.csv \
-                --exchange-file coinbase_pro_fill data/in/coinbase-pro-fill.csv \
-                --exchange-file kraken_trade data/in/kraken-trade.csv \
-                --asset "$asset" --label "$label"
-
-            if [ $? -ne 0 ]; then
-                echo "Error occurred while processing asset $asset ($label)" >> $STDERR
-            fi
+            default_assets+=("$asset:$label")
             ;;
     esac
 
 done
 
+# Assets sharing the same exchange files are processed in a single pass.
+# Their GL and Form 8949 files are generated in parallel, and main.py prints
+# a summary of the assets that failed.
+python main.py \
+    --exchange-file coinbase_transaction data/in/coinbase-transaction.csv \
+    --exchange-file coinbase_pro_fill data/in/coinbase-pro-fill.csv \
+    --exchange-file kraken_trade data/in/kraken-trade.csv \
+    --robinhood1099 data/in/robinhood-crypto-1099.csv \
+    --assets "$(IFS=,; echo "${robinhood_assets[*]}")" \
+    --jobs "$JOBS"
+
+python main.py \
+    --exchange-file coinbase_transaction data/in/coinbase-transaction.csv \
+    --exchange-file coinbase_pro_fill data/in/coinbase-pro-fill.csv \
+    --exchange-file kraken_trade data/in/kraken-trade.csv \
+    --assets "$(IFS=,; echo "${default_assets[*]}")" \
+    --jobs "$JOBS"
+
 # Will run the previous tax year by default.
 # e.g. If the current filing year is 2023, then it will output for 2022.
 python link_f8949.py --form8949 data/f8949 --form1099 data/f1099
@@ -5,9 +5,12 @@ set -e
 SERVICE_NAME="dca"
 SYSTEMD_PATH="/etc/systemd/system"
 SERVICE_FILE="${SYSTEMD_PATH}/${SERVICE_NAME}.service"
-POST_AVERAGING_PATH="/path/to/post_cost_average.py"
+POST_AVERAGING_PATH="/path/to/post_average.py"
 VENV_PATH="/path/to/your/venv"
 ENV_FILE="/path/to/your/env/file"
+# The daemon schedules its own orders, so no timer is needed. Add options
+# here, e.g. "--daemon --schedules /path/to/schedules.json".
+POST_AVERAGING_ARGS="--daemon"
 USERNAME=$(whoami)
 
 echo "Creating systemd service configuration..."
@@ -18,8 +21,9 @@ Description=Automated Averaging Service
 
 [Service]
 Type=simple
-ExecStart=${VENV_PATH}/bin/python ${POST_AVERAGING_PATH}
+ExecStart=${VENV_PATH}/bin/python ${POST_AVERAGING_PATH} ${POST_AVERAGING_ARGS}
 Restart=on-failure
+RestartSec=30
 User=${USERNAME}
 EnvironmentFile=${ENV_FILE}
 
@@ -0,0 +1,176 @@
+import sys
+from argparse import ArgumentParser, Namespace
+from os import getenv
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from archive.average.backtest import read_price_series, strategies
+from archive.average.sweep import (
+    build_sweep_tasks,
+    convert_sweep_to_csv,
+    rankings,
+    run_sweep,
+)
+from archive.tools.io import (
+    parse_preview,
+    print_csv,
+    set_preview,
+    set_quiet,
+    write_csv,
+)
+from archive.tools.jobs import describe_failure
+from archive.tools.logger import configure_logging
+
+load_dotenv()
+
+
+def parse_list(values: str, cast=str) -> list:
+    """Parse comma separated values, e.g. "5,10,20"."""
+    return [
+        cast(value.strip()) for value in values.split(",") if value.strip()
+    ]
+
+
+def get_arguments() -> Namespace:
+    parser = ArgumentParser(
+        description="Sweep the parameters of averaging strategies over historical prices."
+    )
+
+    parser.add_argument(
+        "-p",
+        "--prices",
+        type=str,
+        default="docs/samples/prices/btc-usd-2020.csv",
+        help="CSV file of dates and closing prices (default: btc-usd-2020.csv)",
+    )
+
+    parser.add_argument(
+        "-s",
+        "--strategy",
+        action="append",
+        choices=list(strategies),
+        help="The strategy to sweep. Repeat to sweep several. "
+        "(default: every strategy)",
+    )
+
+    parser.add_argument(
+        "--principal-amounts",
+        type=str,
+        default=getenv("PRINCIPAL_AMOUNT") or "10",
+        help="Comma separated principal amounts (default: PRINCIPAL_AMOUNT or 10)",
+    )
+
+    parser.add_argument(
+        "--max-multipliers",
+        type=str,
+        default="1,2,3,4,5",
+        help="Comma separated max multipliers of dynamic averaging (default: 1,2,3,4,5)",
+    )
+
+    parser.add_argument(
+        "--interest-rates",
+        type=str,
+        default="0.05",
+        help="Comma separated yearly interest rates of value averaging (default: 0.05)",
+    )
+
+    parser.add_argument(
+        "--frequencies",
+        type=str,
+        default=getenv("FREQUENCY") or "monthly",
+        help="Comma separated daily, weekly or monthly intervals of value averaging (default: FREQUENCY or monthly)",
+    )
+
+    parser.add_argument(
+        "--product-id",
+        type=str,
+        default=getenv("PRODUCT_ID") or "BTC-USD",
+        help="The product the prices belong to (default: PRODUCT_ID or BTC-USD)",
+    )
+
+    parser.add_argument(
+        "--min-order-size",
+        type=float,
+        default=0.0,
+        help="Hold when a trade amount is below this amount (default: 0)",
+    )
+
+    parser.add_argument(
+        "--rank-by",
+        choices=list(rankings),
+        default="gain_or_loss",
+        help="The summary field to rank by (default: gain_or_loss)",
+    )
+
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="The number of parameter sets to replay at once.",
+    )
+
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        default="data/average/sweep.csv",
+        help="File to write the ranked summary to (default: sweep.csv)",
+    )
+
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Do not print tables to the console.",
+    )
+
+    parser.add_argument(
+        "--preview",
+        type=parse_preview,
+        default=None,
+        metavar="N",
+        help="Only print the first and last N rows of each table.",
+    )
+
+    return parser.parse_args(sys.argv[1:])
+
+
+def main():
+    args = get_arguments()
+    configure_logging()
+
+    if args.quiet:
+        set_quiet()
+
+    if args.preview is not None:
+        set_preview(args.preview)
+
+    prices = read_price_series(args.prices)
+
+    tasks = build_sweep_tasks(
+        args.strategy or list(strategies),
+        parse_list(args.principal_amounts, float),
+        parse_list(args.max_multipliers, int),
+        parse_list(args.interest_rates, float),
+        parse_list(args.frequencies),
+    )
+
+    summaries, failures = run_sweep(
+        prices, tasks, args.jobs, args.product_id, args.min_order_size
+    )
+
+    csv_table = convert_sweep_to_csv(tasks, summaries, args.rank_by)
+
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    write_csv(args.output, csv_table)
+    print_csv(csv_table)
+
+    for name, error in failures.items():
+        print(f"{name}: {describe_failure(error)}", file=sys.stderr)
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()